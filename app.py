@@ -23,9 +23,8 @@ if "env_debug_done" not in st.session_state:
 # ==============================
 from backend import database   # ✅ THIS WAS MISSING
 from backend.ui import set_background
-from selections.student import run_student_mode
-from selections.admin import run_admin_mode
 from backend.db_helpers import ensure_super_admin_exists
+from backend.sweeper import start_sweeper
 
 
 # ==============================
@@ -45,6 +44,7 @@ if not st.session_state.db_initialized:
     try:
         database.startup()               # ✅ now works
         ensure_super_admin_exists()
+        start_sweeper()                  # ⏰ auto-submit expired attempts (once per process)
         st.session_state.db_initialized = True
 
     except Exception as e:
@@ -120,13 +120,16 @@ def main():
             st.sidebar.exception(e)
     # ==========================
     # ROUTING
+    # (mode modules load on first use; admin pulls in pandas & co.)
     # ==========================
     mode = st.session_state.menu_selection
 
     if mode == "Student Mode":
+        from selections.student import run_student_mode
         run_student_mode()
 
     elif mode == "Admin Panel":
+        from selections.admin import run_admin_mode
         run_admin_mode()
 
     elif mode == "Exit App":
@@ -140,4 +143,5 @@ def main():
 # RUN APP
 # ==============================
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with database.request_session():     # one DB connection for the whole rerun
+        main()
\ No newline at end of file
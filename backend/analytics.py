@@ -0,0 +1,272 @@
+# ==============================
+# backend/analytics.py
+# Pre-aggregated score rollups for admin analytics
+# ==============================
+"""
+AnalyticsRollup keeps, per (school, class, subject, test type, day), the
+count, sum, sum of squares, min, max and a 10-bucket histogram of score
+percentages. Submits fold into it with one upsert (record_rollups);
+rebuild_rollups() regenerates it with a single INSERT … SELECT over
+TestResult. Charts then read O(days) rows instead of every submission.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select
+
+from backend.database import get_session, dialect_insert
+from backend.models import AnalyticsRollup, StudentProgress, TestResult
+
+
+BUCKETS = 10
+BUCKET_COLUMNS = [f"bucket_{i}" for i in range(BUCKETS)]
+
+
+def bucket_index(percentage: float) -> int:
+    return min(max(int(percentage // (100 / BUCKETS)), 0), BUCKETS - 1)
+
+
+def _in_bucket(pct, i: int):
+    """SQL twin of bucket_index (outer buckets are open-ended)."""
+    width = 100 / BUCKETS
+    bounds = []
+    if i > 0:
+        bounds.append(pct >= i * width)
+    if i < BUCKETS - 1:
+        bounds.append(pct < (i + 1) * width)
+    return and_(*bounds)
+
+
+# ==============================
+# ➕ Incremental update
+# ==============================
+def record_rollups(db, results: list[dict], test_type: str, day: date | None = None):
+    """
+    Fold new results (TestResult-shaped dicts) into the rollups of the
+    day they were taken (caller commits). Results without taken_at go
+    to day, default today (UTC).
+    """
+    if not results:
+        return
+
+    default_day = day or datetime.utcnow().date()
+
+    # one row per key, so the upsert touches each rollup once
+    rows = {}
+    for r in results:
+        pct = float(r["percentage"])
+        # same day rebuild_rollups() derives with date(taken_at)
+        day = r["taken_at"].date() if r.get("taken_at") else default_day
+        key = (r["school_id"], r["class_id"], r["subject_id"], day)
+
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = {
+                "school_id": r["school_id"],
+                "class_id": r["class_id"],
+                "subject_id": r["subject_id"],
+                "test_type": test_type,
+                "day": day,
+                "count": 0,
+                "sum_percentage": 0.0,
+                "sum_sq_percentage": 0.0,
+                "min_percentage": pct,
+                "max_percentage": pct,
+                **{col: 0 for col in BUCKET_COLUMNS},
+            }
+
+        row["count"] += 1
+        row["sum_percentage"] += pct
+        row["sum_sq_percentage"] += pct * pct
+        row["min_percentage"] = min(row["min_percentage"], pct)
+        row["max_percentage"] = max(row["max_percentage"], pct)
+        row[BUCKET_COLUMNS[bucket_index(pct)]] += 1
+
+    rollup = AnalyticsRollup
+    stmt = dialect_insert(db.get_bind())(rollup).values(list(rows.values()))
+    new = stmt.excluded
+
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["school_id", "class_id", "subject_id", "test_type", "day"],
+        set_={
+            "count": rollup.count + new.count,
+            "sum_percentage": rollup.sum_percentage + new.sum_percentage,
+            "sum_sq_percentage": rollup.sum_sq_percentage + new.sum_sq_percentage,
+            "min_percentage": case(
+                (rollup.min_percentage.is_(None), new.min_percentage),
+                (new.min_percentage < rollup.min_percentage, new.min_percentage),
+                else_=rollup.min_percentage,
+            ),
+            "max_percentage": case(
+                (rollup.max_percentage.is_(None), new.max_percentage),
+                (new.max_percentage > rollup.max_percentage, new.max_percentage),
+                else_=rollup.max_percentage,
+            ),
+            **{
+                col: getattr(rollup, col) + getattr(new, col)
+                for col in BUCKET_COLUMNS
+            },
+        },
+    ))
+
+
+# ==============================
+# 🔁 Rebuild (one INSERT … SELECT)
+# ==============================
+def rebuild_rollups(school_id: int | None = None, db=None, keys=None) -> int:
+    """
+    Regenerate rollups from TestResult (all schools or one). The test
+    type comes from the result's attempt; legacy results recorded without
+    a progress_id can't be traced to one and are counted as objective,
+    subjective ones included. keys limits
+    it to those (class_id, subject_id, day) buckets; the rest are left
+    alone. With a caller's db the caller commits. Returns the number of
+    rollup rows.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        pct = TestResult.percentage
+        test_type = func.coalesce(StudentProgress.test_type, literal("objective"))
+        day = func.date(TestResult.taken_at)
+
+        buckets = [
+            func.sum(case((_in_bucket(pct, i), 1), else_=0))
+            for i in range(BUCKETS)
+        ]
+
+        source = (
+            select(
+                TestResult.school_id,
+                TestResult.class_id,
+                TestResult.subject_id,
+                test_type,
+                day,
+                func.count(TestResult.id),
+                func.sum(pct),
+                func.sum(pct * pct),
+                func.min(pct),
+                func.max(pct),
+                *buckets,
+            )
+            .select_from(TestResult)
+            .outerjoin(StudentProgress, StudentProgress.id == TestResult.progress_id)
+            .group_by(
+                TestResult.school_id,
+                TestResult.class_id,
+                TestResult.subject_id,
+                test_type,
+                day,
+            )
+        )
+
+        clear = delete(AnalyticsRollup)
+
+        if school_id is not None:
+            source = source.where(TestResult.school_id == school_id)
+            clear = clear.where(AnalyticsRollup.school_id == school_id)
+
+        if keys is not None:
+            keys = set(keys)
+            if not keys:
+                return 0
+
+            source = source.where(or_(*(
+                and_(TestResult.class_id == c, TestResult.subject_id == s, day == d)
+                for c, s, d in keys
+            )))
+            clear = clear.where(or_(*(
+                and_(
+                    AnalyticsRollup.class_id == c,
+                    AnalyticsRollup.subject_id == s,
+                    AnalyticsRollup.day == d,
+                )
+                for c, s, d in keys
+            )))
+
+        db.execute(clear)
+
+        written = db.execute(
+            insert(AnalyticsRollup).from_select(
+                [
+                    "school_id", "class_id", "subject_id", "test_type", "day",
+                    "count", "sum_percentage", "sum_sq_percentage",
+                    "min_percentage", "max_percentage",
+                    *BUCKET_COLUMNS,
+                ],
+                source,
+            )
+        ).rowcount
+
+        if close_db:
+            db.commit()
+
+        return written
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in rebuild_rollups: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+# ==============================
+# 🔍 Read
+# ==============================
+def load_rollups(
+    school_id: int,
+    class_id: int | None = None,
+    subject_id: int | None = None,
+    test_type: str | None = None,
+    since: date | None = None,
+    db=None
+) -> list:
+    """Rollup rows for a scope, oldest day first."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(AnalyticsRollup).filter(AnalyticsRollup.school_id == school_id)
+
+        if class_id is not None:
+            query = query.filter(AnalyticsRollup.class_id == class_id)
+        if subject_id is not None:
+            query = query.filter(AnalyticsRollup.subject_id == subject_id)
+        if test_type is not None:
+            query = query.filter(AnalyticsRollup.test_type == test_type)
+        if since is not None:
+            query = query.filter(AnalyticsRollup.day >= since)
+
+        return query.order_by(AnalyticsRollup.day).all()
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def summarize_rollups(rows) -> dict:
+    """Combine rollup rows → count, mean, sd, min, max, histogram."""
+    count = sum(r.count for r in rows)
+
+    if not count:
+        return {"count": 0, "mean": None, "sd": None, "min": None, "max": None, "histogram": [0] * BUCKETS}
+
+    total = sum(r.sum_percentage for r in rows)
+    total_sq = sum(r.sum_sq_percentage for r in rows)
+    mean = total / count
+
+    return {
+        "count": count,
+        "mean": mean,
+        "sd": max(total_sq / count - mean ** 2, 0.0) ** 0.5,
+        "min": min(r.min_percentage for r in rows if r.min_percentage is not None),
+        "max": max(r.max_percentage for r in rows if r.max_percentage is not None),
+        "histogram": [sum(getattr(r, col) for r in rows) for col in BUCKET_COLUMNS],
+    }
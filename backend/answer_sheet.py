@@ -0,0 +1,152 @@
+# ==============================
+# backend/answer_sheet.py
+# Compact answer sheets for objective attempts
+# ==============================
+"""
+An objective answer sheet is one byte per question of the attempt's
+exam paper: the index of the chosen option, or UNANSWERED. Together with
+StudentProgress.paper_id it replaces the per-question JSON rows in every
+autosave; readers decode it back into the usual dict shape on demand.
+"""
+import json
+
+from backend.exam_papers import get_exam_paper
+
+
+UNANSWERED = 255
+MAX_OPTIONS = UNANSWERED  # indices 0..254
+
+
+# ==============================
+# 🔤 Options (same cleaning as the test page)
+# ==============================
+def _clean_option(opt) -> str:
+    text = str(opt).strip()
+    text = text.strip('"').strip("'")
+    for bad in ["(", ")", "[", "]", "{", "}"]:
+        text = text.replace(bad, "")
+    text = text.replace("\n", " ").strip()
+    text = " ".join(text.split())
+    return text.strip().strip('"').strip("'")
+
+
+def parse_options(raw_options) -> list[str]:
+    """Options as a list of display strings (JSON, list or comma text)."""
+    if isinstance(raw_options, list):
+        opts = raw_options
+    elif isinstance(raw_options, str):
+        cleaned = raw_options.strip()
+        try:
+            parsed = json.loads(cleaned)
+            opts = parsed if isinstance(parsed, list) else [str(parsed)]
+        except Exception:
+            opts = [o.strip() for o in cleaned.replace(";", ",").split(",") if o.strip()]
+    else:
+        opts = []
+
+    return [_clean_option(o) for o in opts]
+
+
+def _is_correct(selected, correct) -> bool:
+    return bool(selected) and str(selected).strip().lower() == str(correct or "").strip().lower()
+
+
+# ==============================
+# 📦 Encode / decode
+# ==============================
+def encode_answer_sheet(selected: list, questions: list[dict]) -> bytes:
+    """Selected option strings (parallel to the paper's questions) → bytes."""
+    sheet = bytearray([UNANSWERED]) * len(questions)
+
+    for i, q in enumerate(questions):
+        answer = selected[i] if i < len(selected) else ""
+
+        if isinstance(answer, dict):
+            answer = answer.get("selected", "")
+
+        if not answer or answer == "—":
+            continue
+
+        try:
+            idx = parse_options(q.get("options")).index(str(answer).strip())
+        except ValueError:
+            continue
+
+        if idx < MAX_OPTIONS:
+            sheet[i] = idx
+
+    return bytes(sheet)
+
+
+def decode_selected(sheet: bytes, questions: list[dict]) -> list[str]:
+    """Bytes → selected option strings ("" when unanswered)."""
+    selected = []
+
+    for i, q in enumerate(questions):
+        idx = sheet[i] if i < len(sheet) else UNANSWERED
+
+        options = parse_options(q.get("options")) if idx != UNANSWERED else []
+        selected.append(options[idx] if idx < len(options) else "")
+
+    return selected
+
+
+def decode_answer_sheet(sheet: bytes, questions: list[dict]) -> list[dict]:
+    """Bytes → the answer detail rows used by results and reports."""
+    details = []
+
+    for q, answer in zip(questions, decode_selected(sheet, questions)):
+        correct = q.get("correct_answer", "")
+
+        details.append({
+            "question_id": q.get("id"),
+            "question_text": q.get("text", ""),
+            "selected": answer or "—",
+            "correct": correct or "—",
+            "is_correct": _is_correct(answer, correct),
+        })
+
+    return details
+
+
+def build_answer_payload(test_type: str, questions: list[dict], selected: list):
+    """
+    (answers, answer_sheet) for save_progress: objective attempts save
+    just the sheet; subjective ones keep the JSON detail rows.
+    """
+    if test_type == "objective":
+        return [], encode_answer_sheet(selected, questions)
+
+    details = []
+
+    for q, answer in zip(questions, selected):
+        correct = q.get("correct_answer", "")
+
+        details.append({
+            "question_id": q.get("id"),
+            "selected": answer or "—",
+            "correct": correct or "—",
+            "is_correct": _is_correct(answer, correct),
+        })
+
+    return json.dumps(details), None
+
+
+def progress_answer_details(progress) -> list:
+    """
+    Answer rows for a StudentProgress, whichever way they were stored
+    (answer sheet + paper, or legacy JSON).
+    """
+    paper = get_exam_paper(getattr(progress, "paper_id", None))
+
+    if progress.answer_sheet is not None and paper:
+        return decode_answer_sheet(progress.answer_sheet, paper["questions"])
+
+    raw = progress.answers
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raw = []
+
+    return raw or []
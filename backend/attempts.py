@@ -0,0 +1,372 @@
+# ==============================
+# backend/attempts.py
+# Finalizing (submitting) test attempts
+# ==============================
+"""
+One submit path for every way an attempt ends: the student's Submit
+button, the in-page timer, anti-cheat force-submits and the background
+sweeper (backend.sweeper). Objective attempts are graded against their
+exam paper with the batch grader; subjective ones are queued for review.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from backend.analytics import record_rollups
+from backend.answer_sheet import decode_selected, encode_answer_sheet
+from backend.batch_grader import grade_sheets
+from backend.database import get_session, dialect_insert
+from backend.exam_papers import get_exam_paper
+from backend.item_analysis import clear_item_stats
+from backend.performance import record_performance
+from backend.models import (
+    AttemptQuestion,
+    ObjectiveQuestion,
+    StudentAnswer,
+    StudentProgress,
+    TestResult,
+)
+
+
+# ==============================
+# 🧮 Grading
+# ==============================
+def _graded_result(questions: list[dict], sheet: bytes, correct_row) -> dict:
+    """Score + answer detail rows for one graded sheet."""
+    details = [
+        {
+            "question_id": q.get("id"),
+            "question_text": q.get("text", ""),
+            "selected": answer or "—",
+            "correct": q.get("correct_answer") or "—",
+            "is_correct": bool(is_correct),
+        }
+        for q, answer, is_correct in zip(questions, decode_selected(sheet, questions), correct_row)
+    ]
+
+    score = int(correct_row.sum())
+    total = len(questions)
+
+    return {
+        "score": score,
+        "total": total,
+        "percent": (score / total * 100) if total else 0,
+        "details": details,
+    }
+
+
+def _with_paper_keys(questions: list[dict], paper: dict) -> list[dict]:
+    """
+    The caller's questions (order + options, for encoding the answers)
+    graded with the paper's current key, so a key corrected while the
+    attempt was open counts at submit.
+    """
+    keys = {q.get("id"): q.get("correct_answer") for q in paper["questions"]}
+
+    return [
+        {**q, "correct_answer": keys.get(q.get("id"), q.get("correct_answer"))}
+        for q in questions
+    ]
+
+
+def _legacy_objective_state(db, progress) -> tuple[list[dict], list[str]]:
+    """Questions + answers of an attempt that predates exam papers."""
+    saved = dict(
+        db.query(StudentAnswer.question_id, StudentAnswer.answer)
+        .filter(StudentAnswer.progress_id == progress.id)
+        .all()
+    )
+
+    served_ids = [
+        qid for (qid,) in
+        db.query(AttemptQuestion.question_id)
+        .filter(AttemptQuestion.progress_id == progress.id)
+        .order_by(AttemptQuestion.id)
+    ] or sorted(saved)
+
+    rows = {
+        q.id: q for q in
+        db.query(ObjectiveQuestion).filter(ObjectiveQuestion.id.in_(served_ids))
+    }
+
+    questions = [
+        {
+            "id": qid,
+            "text": rows[qid].question_text,
+            "options": rows[qid].options,
+            "correct_answer": rows[qid].correct_answer,
+        }
+        for qid in served_ids if qid in rows
+    ]
+
+    return questions, [saved.get(q["id"]) or "" for q in questions]
+
+
+def _stored_subjective_answers(raw, questions: list[dict]) -> list[str]:
+    """Autosaved subjective answers (plain list or JSON detail rows) in paper order."""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            raw = []
+
+    if not isinstance(raw, list):
+        return [""] * len(questions)
+
+    if raw and isinstance(raw[0], dict):
+        by_id = {d.get("question_id"): d.get("selected") or d.get("answer") or "" for d in raw}
+        return ["" if by_id.get(q.get("id")) in (None, "—") else str(by_id[q.get("id")]) for q in questions]
+
+    return ["" if a is None else str(a) for a in raw]
+
+
+# ==============================
+# ✅ Finalize
+# ==============================
+def record_test_results(db, rows: list[dict]):
+    """Insert TestResult rows for graded attempts and fold them into the aggregates."""
+    if rows:
+        db.execute(insert(TestResult), rows)
+        record_performance(db, rows)
+        record_rollups(db, rows, "objective")
+
+
+def finalize_attempts(
+    progress_ids: list[int],
+    reason: str | None = None,
+    answers: dict | None = None,
+    questions: dict | None = None,
+    db=None
+) -> dict:
+    """
+    Submit unsubmitted attempts in one transaction.
+
+    answers / questions: optional {progress_id: [...]} in canonical paper
+    order (the live page passes what the student sees, unshuffled);
+    otherwise the last autosave is graded.
+    reason: recorded as auto_submit_reason (None for a normal submit).
+
+    Rows already submitted, or locked by a concurrent finalizer, are
+    skipped. Returns {progress_id: {"score", "total", "percent", "details"}}.
+    """
+    answers = answers or {}
+    questions = questions or {}
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        attempts = (
+            db.query(StudentProgress)
+            .filter(
+                StudentProgress.id.in_(progress_ids),
+                StudentProgress.submitted.is_(False),
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        now = datetime.utcnow()
+        results = {}
+        answer_rows = []
+        result_rows = []
+        to_grade = {}
+
+        for progress in attempts:
+
+            progress.submitted = True
+            progress.auto_submit_reason = reason[:50] if reason else None
+
+            paper = get_exam_paper(progress.paper_id)
+
+            # -------------------------
+            # Subjective → review queue
+            # -------------------------
+            if progress.test_type != "objective":
+                paper_questions = questions.get(progress.id) or (paper["questions"] if paper else [])
+
+                if progress.id in answers:
+                    written = ["" if a is None else str(a) for a in answers[progress.id]]
+                    progress.answers = written
+                else:
+                    written = _stored_subjective_answers(progress.answers, paper_questions)
+
+                progress.review_status = "pending"
+                progress.reviewed_at = None
+                progress.score = None
+
+                answer_rows.extend(
+                    {"progress_id": progress.id, "question_id": q["id"], "answer": a}
+                    for q, a in zip(paper_questions, written)
+                    if q.get("id") is not None
+                )
+
+                results[progress.id] = {"score": None, "total": len(paper_questions), "percent": None, "details": []}
+                continue
+
+            # -------------------------
+            # Objective → answer sheet, graded below in batches
+            # -------------------------
+            if progress.id in questions:
+                paper_questions = questions[progress.id]
+                if paper:
+                    paper_questions = _with_paper_keys(paper_questions, paper)
+            elif paper:
+                paper_questions = paper["questions"]
+            else:
+                paper_questions = None
+
+            if progress.id in answers and paper_questions is not None:
+                sheet = encode_answer_sheet(answers[progress.id], paper_questions)
+            elif paper_questions is not None and progress.answer_sheet is not None:
+                sheet = progress.answer_sheet
+            else:
+                paper, (paper_questions, selected) = None, _legacy_objective_state(db, progress)
+                sheet = encode_answer_sheet(selected, paper_questions)
+
+            # attempts on the same paper share one key vector
+            group = ("paper", progress.paper_id) if paper and progress.id not in questions else ("own", progress.id)
+            batch = to_grade.setdefault(group, {"questions": paper_questions, "rows": []})
+            batch["rows"].append((progress, sheet, bool(paper)))
+
+        for batch in to_grade.values():
+            paper_questions = batch["questions"]
+            graded = grade_sheets(paper_questions, [sheet for _, sheet, _ in batch["rows"]])
+
+            for (progress, sheet, on_paper), correct_row in zip(batch["rows"], graded["correct"]):
+                result = _graded_result(paper_questions, sheet, correct_row)
+
+                if on_paper:
+                    progress.answer_sheet = sheet
+                    progress.answers = []
+                else:
+                    progress.answers = json.dumps(result["details"])
+
+                progress.score = result["score"]
+                progress.locked = True
+                progress.review_status = "reviewed"
+                progress.reviewed_at = now
+
+                answer_rows.extend(
+                    {
+                        "progress_id": progress.id,
+                        "question_id": d["question_id"],
+                        "answer": "" if d["selected"] == "—" else d["selected"],
+                    }
+                    for d in result["details"]
+                    if d["question_id"] is not None
+                )
+
+                result_rows.append({
+                    "progress_id": progress.id,
+                    "student_id": progress.student_id,
+                    "class_id": progress.class_id,
+                    "subject_id": progress.subject_id,
+                    "school_id": progress.school_id,
+                    "score": result["score"],
+                    "total": result["total"],
+                    "percentage": result["percent"],
+                    "taken_at": now,
+                })
+
+                results[progress.id] = result
+
+        db.flush()
+
+        if answer_rows:
+            upsert = dialect_insert(db.get_bind())(StudentAnswer).values(answer_rows)
+            db.execute(upsert.on_conflict_do_update(
+                index_elements=["progress_id", "question_id"],
+                set_={"answer": upsert.excluded.answer},
+            ))
+
+        record_test_results(db, result_rows)
+
+        db.commit()
+
+        return results
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in finalize_attempts: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def finalize_attempt(
+    progress_id: int,
+    reason: str | None = None,
+    answers: list | None = None,
+    questions: list[dict] | None = None,
+    db=None
+) -> dict | None:
+    """Submit one attempt (see finalize_attempts). None if nothing to do."""
+    results = finalize_attempts(
+        [progress_id],
+        reason=reason,
+        answers={progress_id: answers} if answers is not None else None,
+        questions={progress_id: questions} if questions is not None else None,
+        db=db,
+    )
+    return results.get(progress_id)
+
+
+# ==============================
+# 🔁 New attempt
+# ==============================
+def reset_attempt(progress_id: int, db=None) -> bool:
+    """
+    Reopen a progress row for a new attempt (first start or retake):
+    clears the submitted/locked flags and the previous attempt's grading,
+    so finalize_attempts() picks the new attempt up again.
+    Returns False if the row doesn't exist.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        progress = db.get(StudentProgress, progress_id)
+
+        if progress is None:
+            return False
+
+        # the previous attempt is in its paper's item-analysis sums
+        counted_paper = progress.paper_id if progress.reviewed_at is not None else None
+
+        # ORM update, so AttemptQuestion.submitted follows (after_update hook)
+        progress.submitted = False
+        progress.locked = False
+        progress.review_status = "pending"
+        progress.score = None
+        progress.review_comment = None
+        progress.reviewed_at = None
+        progress.reviewed_by = None
+        progress.score_suggestions = None
+        progress.auto_submit_reason = None
+        progress.lease_owner = None
+        progress.lease_token = None
+        progress.lease_expires_at = None
+
+        db.commit()
+
+        if counted_paper:
+            clear_item_stats(counted_paper)
+
+        return True
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in reset_attempt: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
@@ -0,0 +1,127 @@
+# ==============================
+# backend/batch_grader.py
+# Vectorized grading of objective attempts
+# ==============================
+"""
+Objective attempts are graded a batch at a time: the answer sheets of
+one exam paper are stacked into an (attempts × questions) uint8 matrix
+of option indices (UNANSWERED = 255) and compared with the paper's key
+vector in a single NumPy operation. The same result feeds submission
+(backend.attempts), regrading (backend.regrade) and analytics.
+"""
+import numpy as np
+
+from backend.answer_sheet import UNANSWERED, parse_options
+from backend.database import get_session
+from backend.exam_papers import get_exam_paper
+from backend.models import StudentProgress
+
+
+NO_KEY = -1  # key not among the options → nobody scores it
+
+
+# ==============================
+# 🔢 Matrices
+# ==============================
+def key_vector(questions: list[dict]) -> np.ndarray:
+    """Option index of each question's correct answer (NO_KEY if missing)."""
+    keys = np.full(len(questions), NO_KEY, dtype=np.int16)
+
+    for i, q in enumerate(questions):
+        correct = str(q.get("correct_answer") or "").strip().lower()
+        if not correct:
+            continue
+
+        for j, opt in enumerate(parse_options(q.get("options"))):
+            if opt.strip().lower() == correct:
+                keys[i] = j
+                break
+
+    return keys
+
+
+def sheet_matrix(sheets: list[bytes], n_questions: int) -> np.ndarray:
+    """Answer sheets → (attempts × questions) uint8 matrix, padded with UNANSWERED."""
+    sheets = [s or b"" for s in sheets]
+
+    # every sheet full length (the normal case): one buffer, no copy
+    if all(len(s) == n_questions for s in sheets):
+        return np.frombuffer(b"".join(sheets), dtype=np.uint8).reshape(len(sheets), n_questions)
+
+    matrix = np.full((len(sheets), n_questions), UNANSWERED, dtype=np.uint8)
+
+    for row, sheet in enumerate(sheets):
+        values = np.frombuffer(sheet, dtype=np.uint8)[:n_questions]
+        matrix[row, :values.size] = values
+
+    return matrix
+
+
+# ==============================
+# ✅ Grading
+# ==============================
+def grade_matrix(matrix: np.ndarray, keys: np.ndarray) -> dict:
+    """
+    Grade an answers matrix against a key vector.
+
+    Returns:
+        correct:  bool (attempts × questions)
+        answered: bool (attempts × questions)
+        scores:   int per attempt
+        question_correct: int per question (attempts that got it right)
+        total:    number of questions
+    """
+    correct = matrix == keys
+    answered = matrix != UNANSWERED
+
+    return {
+        "correct": correct,
+        "answered": answered,
+        "scores": correct.sum(axis=1, dtype=np.int32),
+        "question_correct": correct.sum(axis=0, dtype=np.int32),
+        "total": matrix.shape[1],
+    }
+
+
+def grade_sheets(questions: list[dict], sheets: list[bytes]) -> dict:
+    """Grade answer sheets of one question set (see grade_matrix)."""
+    return grade_matrix(sheet_matrix(sheets, len(questions)), key_vector(questions))
+
+
+def grade_paper(paper_id: int, submitted_only: bool = True, db=None) -> dict | None:
+    """
+    Grade every attempt on an exam paper in one pass.
+
+    Returns grade_matrix's result plus "progress_ids" (row order) and
+    "question_ids" (column order); None if the paper does not exist.
+    """
+    paper = get_exam_paper(paper_id)
+    if paper is None:
+        return None
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(StudentProgress.id, StudentProgress.answer_sheet).filter(
+            StudentProgress.paper_id == paper_id,
+            StudentProgress.answer_sheet.isnot(None),
+        )
+
+        if submitted_only:
+            query = query.filter(StudentProgress.submitted.is_(True))
+
+        rows = query.order_by(StudentProgress.id).all()
+
+    finally:
+        if close_db:
+            db.close()
+
+    graded = grade_sheets(paper["questions"], [r.answer_sheet for r in rows])
+
+    graded["progress_ids"] = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+    graded["question_ids"] = [q["id"] for q in paper["questions"]]
+
+    return graded
@@ -0,0 +1,179 @@
+# ==============================
+# backend/build_assets.py
+# Build-time image pipeline for static serving
+# ==============================
+"""
+Resize and recompress the images in assets/ into static/, which
+Streamlit serves at app/static/<file> (server.enableStaticServing).
+
+Every image is downscaled to MAX_DIMENSION, converted to WebP, plus a
+JPEG fallback for opaque images, and written under a content-hashed
+name ("bac.3f9c2a1b7e.webp"), so a changed image gets a new URL and
+browsers can keep serving the old one from cache until then.
+static/manifest.json maps source names to the built files; pages look
+URLs up there via get_asset_url() instead of inlining image bytes.
+
+Run at deploy time (start.sh / Procfile):
+
+    python -m backend.build_assets
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+
+# URL prefix Streamlit serves STATIC_DIR under
+STATIC_URL = "app/static"
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+# backgrounds never need more than a full-HD width
+MAX_DIMENSION = 1920
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+HASH_LENGTH = 10
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+# ==============================
+# 🖼️ Image conversion
+# ==============================
+def _hashed_name(stem: str, data: bytes, ext: str) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}.{ext}"
+
+
+def build_image(path: str) -> tuple[dict, dict]:
+    """
+    Convert one source image.
+    Returns (manifest entry, {built filename: bytes}).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.LANCZOS)
+
+        has_alpha = img.mode in ("RGBA", "LA") or (
+            img.mode == "P" and "transparency" in img.info
+        )
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        files = {}
+
+        out = io.BytesIO()
+        img.save(out, format="WEBP", quality=WEBP_QUALITY, method=6)
+        webp_name = _hashed_name(stem, out.getvalue(), "webp")
+        files[webp_name] = out.getvalue()
+
+        entry = {
+            "webp": webp_name,
+            "width": img.width,
+            "height": img.height,
+        }
+
+        # JPEG fallback (no alpha channel in JPEG)
+        if not has_alpha:
+            out = io.BytesIO()
+            img.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            jpeg_name = _hashed_name(stem, out.getvalue(), "jpg")
+            files[jpeg_name] = out.getvalue()
+            entry["jpeg"] = jpeg_name
+
+    return entry, files
+
+
+def build_assets(source_dir: str = ASSETS_DIR, static_dir: str = STATIC_DIR) -> dict:
+    """
+    Rebuild static_dir from source_dir and write the manifest.
+    Files left over from previous builds are removed.
+    Returns the manifest.
+    """
+    os.makedirs(static_dir, exist_ok=True)
+
+    manifest = {}
+    built = set()
+
+    for name in sorted(os.listdir(source_dir)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+
+        try:
+            entry, files = build_image(os.path.join(source_dir, name))
+        except OSError as e:
+            print(f"⚠️ Skipping asset {name}: {e}")
+            continue
+
+        for filename, data in files.items():
+            target = os.path.join(static_dir, filename)
+            if not os.path.exists(target):
+                with open(target, "wb") as f:
+                    f.write(data)
+            built.add(filename)
+
+        manifest[name] = entry
+
+    for filename in os.listdir(static_dir):
+        if filename not in built and filename != os.path.basename(MANIFEST_PATH):
+            os.remove(os.path.join(static_dir, filename))
+
+    with open(os.path.join(static_dir, os.path.basename(MANIFEST_PATH)), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    clear_manifest_cache()
+
+    return manifest
+
+
+# ==============================
+# 🔗 Runtime lookup
+# ==============================
+def load_manifest() -> dict:
+    """Manifest from the last build (read once per process); {} if not built."""
+    global _manifest
+
+    with _manifest_lock:
+        if _manifest is None:
+            try:
+                with open(MANIFEST_PATH) as f:
+                    _manifest = json.load(f)
+            except (OSError, ValueError):
+                _manifest = {}
+
+        return _manifest
+
+
+def clear_manifest_cache():
+    global _manifest
+
+    with _manifest_lock:
+        _manifest = None
+
+
+def get_asset_url(name: str, fmt: str = "webp") -> str | None:
+    """
+    URL of a built asset by source file name (e.g. "bac.jpg"), or None
+    when it hasn't been built. fmt: "webp" or "jpeg".
+    """
+    entry = load_manifest().get(os.path.basename(name or ""))
+
+    if not entry:
+        return None
+
+    filename = entry.get(fmt) or entry.get("webp")
+    return f"{STATIC_URL}/{filename}"
+
+
+if __name__ == "__main__":
+    result = build_assets()
+    print(f"✅ Built {len(result)} assets into {STATIC_DIR}")
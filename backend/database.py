@@ -3,8 +3,10 @@
 # ==============================
 
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import OperationalError
 
 from backend import models
@@ -102,10 +104,88 @@ SessionLocal = sessionmaker(
 )
 
 
+# {"connection", "session"} of the current request_session() block;
+# "session" is the one session running on the connection right now
+_request_slot = ContextVar("request_slot", default=None)
+
+
+class _RequestSession(Session):
+    """Session on the rerun's connection; closing it frees the connection for the next one."""
+
+    def close(self):
+        super().close()
+
+        slot = self.info.pop("request_slot", None)
+        if slot is not None and slot["session"] is self:
+            slot["session"] = None
+
+
+_RequestSessionLocal = sessionmaker(class_=_RequestSession, autoflush=False)
+
+
 def get_session():
+    """
+    A new session. Inside request_session() it runs on the rerun's
+    connection when no other session holds it; a session opened while
+    one does (a helper called from inside another helper) gets its own
+    pooled connection, as outside the block.
+    """
+    slot = _request_slot.get()
+
+    if slot is not None and slot["session"] is None:
+        session = _RequestSessionLocal(bind=slot["connection"])
+        session.info["request_slot"] = slot
+        slot["session"] = session
+        return session
+
     return SessionLocal(bind=get_engine())
 
 
+@contextmanager
+def request_session():
+    """
+    One pooled connection for one script run: helpers opened one after
+    another (db_helpers, helpers, pages) run on it, so a rerun checks out
+    and pings one connection instead of one per helper.
+
+    Every get_session() is still its own Session, with its own identity
+    map, commit and rollback: a helper's rollback or bulk UPDATE only
+    touches the objects that helper loaded. Whatever is left uncommitted
+    when the block ends is rolled back. Nested use reuses the outer
+    connection.
+    """
+    slot = _request_slot.get()
+
+    if slot is not None:
+        yield slot["connection"]
+        return
+
+    connection = get_engine().connect()
+    token = _request_slot.set({"connection": connection, "session": None})
+
+    try:
+        yield connection
+    finally:
+        _request_slot.reset(token)
+        connection.close()
+
+
+# ==============================
+# DIALECT-AWARE UPSERT
+# ==============================
+def dialect_insert(bind):
+    """
+    Return the dialect-specific insert() construct so callers can use
+    ON CONFLICT DO UPDATE / DO NOTHING on both Postgres and SQLite.
+    """
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    return insert
+
+
 # ==============================
 # SAFE DB EXECUTOR
 # ==============================
@@ -174,12 +254,303 @@ def run_migrations():
                     "ALTER TABLE student_progress ADD COLUMN status TEXT DEFAULT 'pending'"
                 ))
 
+            if "review_status" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN review_status TEXT DEFAULT 'pending'"
+                ))
+
+            if "score_suggestions" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN score_suggestions JSON"
+                ))
+
+            if "lease_owner" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN lease_owner VARCHAR(100)"
+                ))
+
+            if "lease_token" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN lease_token VARCHAR(36)"
+                ))
+
+            if "lease_expires_at" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN lease_expires_at TIMESTAMP WITH TIME ZONE"
+                ))
+
+            if "answer_sheet" not in columns:
+                blob_type = "BYTEA" if engine.dialect.name == "postgresql" else "BLOB"
+                conn.execute(text(
+                    f"ALTER TABLE student_progress ADD COLUMN answer_sheet {blob_type}"
+                ))
+
+            if "shuffle_seed" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN shuffle_seed INTEGER"
+                ))
+
+            if "auto_submit_reason" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN auto_submit_reason VARCHAR(50)"
+                ))
+
+            if "paper_id" not in columns:
+                conn.execute(text(
+                    "ALTER TABLE student_progress ADD COLUMN paper_id INTEGER REFERENCES exam_papers(id)"
+                ))
+
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_student_progress_paper_id "
+                "ON student_progress (paper_id)"
+            ))
+
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_student_progress_lease_token "
+                "ON student_progress (lease_token)"
+            ))
+
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_progress_review_queue "
+                "ON student_progress (school_id, test_type, submitted, review_status, id)"
+            ))
+
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_progress_expiry "
+                "ON student_progress (submitted, (start_time + duration))"
+            ))
+
+        if "subjective_questions" in inspector.get_table_names():
+            question_columns = {c["name"] for c in inspector.get_columns("subjective_questions")}
+
+            with engine.begin() as conn:
+
+                if "model_answer" not in question_columns:
+                    conn.execute(text(
+                        "ALTER TABLE subjective_questions ADD COLUMN model_answer TEXT"
+                    ))
+
+                if "keywords" not in question_columns:
+                    conn.execute(text(
+                        "ALTER TABLE subjective_questions ADD COLUMN keywords JSON"
+                    ))
+
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_subjective_bank "
+                    "ON subjective_questions (school_id, class_id, subject_id, id)"
+                ))
+
+        if "objective_questions" in inspector.get_table_names():
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_objective_bank "
+                    "ON objective_questions (school_id, class_id, subject_id, id)"
+                ))
+
+        if "test_duration" in inspector.get_table_names():
+            duration_columns = {c["name"] for c in inspector.get_columns("test_duration")}
+
+            if "draw_count" not in duration_columns:
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        "ALTER TABLE test_duration ADD COLUMN draw_count INTEGER"
+                    ))
+
+        if "test_results" in inspector.get_table_names():
+            result_columns = {c["name"] for c in inspector.get_columns("test_results")}
+
+            with engine.begin() as conn:
+
+                if "progress_id" not in result_columns:
+                    conn.execute(text(
+                        "ALTER TABLE test_results ADD COLUMN progress_id INTEGER "
+                        "REFERENCES student_progress(id) ON DELETE SET NULL"
+                    ))
+
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_test_results_progress_id "
+                    "ON test_results (progress_id)"
+                ))
+
+        if "archived_progress" in inspector.get_table_names():
+            archive_columns = {c["name"] for c in inspector.get_columns("archived_progress")}
+
+            with engine.begin() as conn:
+
+                if "paper_id" not in archive_columns:
+                    conn.execute(text(
+                        "ALTER TABLE archived_progress ADD COLUMN paper_id INTEGER REFERENCES exam_papers(id)"
+                    ))
+
+                # snapshots now live in exam_papers (SQLite cannot drop NOT NULL in place)
+                if engine.dialect.name == "postgresql":
+                    conn.execute(text(
+                        "ALTER TABLE archived_progress ALTER COLUMN questions_snapshot DROP NOT NULL"
+                    ))
+
+        _migrate_subjective_grades(engine, inspector)
+
+        _migrate_student_search(engine, inspector)
+
+        _migrate_attempt_questions(engine, inspector)
+
+        _migrate_performance_aggregates(engine, inspector)
+
+        _migrate_analytics_rollups(engine, inspector)
+
         print("✅ migrations applied")
 
     except Exception as e:
         print("⚠️ migrations skipped:", e)
 
 
+def _migrate_subjective_grades(engine, inspector):
+    """
+    Ensure the unique (student_id, subject_id, question_id) index used by
+    the grade upsert. Older databases may hold duplicate grades, so keep
+    the newest row per key before creating it.
+    """
+    if "subjective_grades" not in inspector.get_table_names():
+        return
+
+    indexes = {i["name"] for i in inspector.get_indexes("subjective_grades")}
+
+    if "uq_subjective_grade_question" in indexes:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            DELETE FROM subjective_grades
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM subjective_grades
+                GROUP BY student_id, subject_id, question_id
+            )
+        """))
+
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_subjective_grade_question "
+            "ON subjective_grades (student_id, subject_id, question_id)"
+        ))
+
+
+def _migrate_attempt_questions(engine, inspector):
+    """
+    Seed the attempt_questions usage index for attempts that were already
+    running before it existed (from the answers they have saved).
+    """
+    if "attempt_questions" not in inspector.get_table_names():
+        return
+
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM attempt_questions LIMIT 1")).first():
+            return
+
+        conn.execute(text("""
+            INSERT INTO attempt_questions (progress_id, question_id, test_type, school_id, submitted)
+            SELECT DISTINCT sa.progress_id, sa.question_id, sp.test_type, sp.school_id, sp.submitted
+            FROM student_answers sa
+            JOIN student_progress sp ON sp.id = sa.progress_id
+            WHERE sp.submitted = :submitted
+        """), {"submitted": False})
+
+
+def _migrate_performance_aggregates(engine, inspector):
+    """Backfill the performance aggregates once from existing test results."""
+    if "performance_aggregates" not in inspector.get_table_names():
+        return
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM performance_aggregates LIMIT 1")).first():
+            return
+        if not conn.execute(text("SELECT 1 FROM test_results LIMIT 1")).first():
+            return
+
+    from backend.performance import rebuild_performance  # imports this module
+
+    rebuild_performance()
+
+
+def _migrate_analytics_rollups(engine, inspector):
+    """Backfill the analytics rollups once from existing test results."""
+    if "analytics_rollups" not in inspector.get_table_names():
+        return
+
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM analytics_rollups LIMIT 1")).first():
+            return
+        if not conn.execute(text("SELECT 1 FROM test_results LIMIT 1")).first():
+            return
+
+    from backend.analytics import rebuild_rollups  # imports this module
+
+    rebuild_rollups()
+
+
+def _migrate_student_search(engine, inspector):
+    """
+    Indexes behind db_helpers.search_students:
+    - Postgres: pg_trgm GIN indexes on lower(name) / lower(access_code)
+    - SQLite:   FTS5 trigram table kept in sync with triggers
+    Missing extension / FTS5 support only disables the fast path.
+    """
+    if "students" not in inspector.get_table_names():
+        return
+
+    try:
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_students_name_trgm "
+                    "ON students USING gin (lower(name) gin_trgm_ops)"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS idx_students_code_trgm "
+                    "ON students USING gin (lower(access_code) gin_trgm_ops)"
+                ))
+
+        elif engine.dialect.name == "sqlite":
+            is_new = "students_fts" not in inspector.get_table_names()
+
+            with engine.begin() as conn:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5("
+                    "name, access_code, content='students', content_rowid='id', "
+                    "tokenize='trigram')"
+                ))
+
+                conn.execute(text("""
+                    CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+                        INSERT INTO students_fts(rowid, name, access_code)
+                        VALUES (new.id, new.name, new.access_code);
+                    END
+                """))
+
+                conn.execute(text("""
+                    CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+                        INSERT INTO students_fts(students_fts, rowid, name, access_code)
+                        VALUES ('delete', old.id, old.name, old.access_code);
+                    END
+                """))
+
+                conn.execute(text("""
+                    CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE ON students BEGIN
+                        INSERT INTO students_fts(students_fts, rowid, name, access_code)
+                        VALUES ('delete', old.id, old.name, old.access_code);
+                        INSERT INTO students_fts(rowid, name, access_code)
+                        VALUES (new.id, new.name, new.access_code);
+                    END
+                """))
+
+                if is_new:
+                    conn.execute(text(
+                        "INSERT INTO students_fts(students_fts) VALUES ('rebuild')"
+                    ))
+
+    except Exception as e:
+        print("⚠️ student search index skipped:", e)
+
+
 # ==============================
 # DEFAULT SYSTEM DATA (SAFE SEED ONLY)
 # ==============================
@@ -6,18 +6,25 @@ from sqlalchemy.orm import Session
 import json
 import random
 import string
+import threading
 import uuid
+from datetime import datetime
 # db_helpers.py
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional, Dict, List, Any
-from sqlalchemy import func
+from sqlalchemy import Integer, and_, delete, func, insert, literal, or_, select, text, update
 from backend.security import hash_password, verify_password
 
 
 # ==============================
 # Local Imports
 # ==============================
-from backend.database import get_session
+from backend.database import get_session, dialect_insert
+from backend.exam_papers import get_exam_paper
+from backend.answer_sheet import decode_selected
+from backend.item_analysis import clear_item_stats
+from backend.performance import rebuild_performance
+from backend.analytics import rebuild_rollups
 from backend.models import (
     Admin,
 
@@ -28,7 +35,8 @@ from backend.models import (
     StudentProgress,
     School,Subject,
     ObjectiveQuestion,
-    StudentAnswer
+    StudentAnswer,
+    AttemptQuestion
 
 
 )
@@ -614,6 +622,8 @@ def add_student_db(name, class_id, school_id, db=None):
                 db.commit()
                 db.refresh(student)
 
+                count_students.clear()
+
                 return {
                     "id": student.id,
                     "unique_id": student.unique_id,
@@ -748,6 +758,8 @@ def bulk_add_students_db(students_list, school_id, db=None):
 
         db.commit()
 
+        count_students.clear()
+
         return {
             "students": added_students,
             "summary": summary
@@ -1168,6 +1180,8 @@ def delete_student_db(student_identifier, school_id=None):
         db.delete(student)
         db.commit()
 
+        count_students.clear()
+
         print(f"✅ Deleted student and all related records: {student.name} ({student.access_code})")
         return True
 
@@ -1518,6 +1532,76 @@ def get_test_duration(class_id: int, subject_id: int, school_id: int):
         db.close()
 
 
+def set_test_draw_count(
+    school_id: int,
+    class_id: int,
+    subject_id: int,
+    draw_count: int | None
+):
+    """
+    Number of questions drawn at random per attempt (None / 0 = whole bank).
+    Stored on the same TestDuration row as the duration.
+    """
+    if not all([school_id, class_id, subject_id]):
+        print("⚠️ Missing required IDs in set_test_draw_count().")
+        return
+
+    db = get_session()
+
+    try:
+        record = db.query(TestDuration).filter_by(
+            school_id=school_id,
+            class_id=class_id,
+            subject_id=subject_id
+        ).first()
+
+        draw_count = int(draw_count) if draw_count else None
+
+        if record:
+            record.draw_count = draw_count
+        else:
+            db.add(TestDuration(
+                school_id=school_id,
+                class_id=class_id,
+                subject_id=subject_id,
+                duration=30 * 60,  # same default the test page falls back to
+                draw_count=draw_count
+            ))
+
+        db.commit()
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ set_test_draw_count() error: {e}")
+        raise
+
+    finally:
+        db.close()
+
+
+def get_test_draw_count(class_id: int, subject_id: int, school_id: int) -> int | None:
+    """Questions drawn per attempt, or None for the whole bank."""
+    if not (class_id and subject_id and school_id):
+        return None
+
+    db = get_session()
+    try:
+        draw_count = (
+            db.query(TestDuration.draw_count)
+            .filter(
+                TestDuration.class_id == class_id,
+                TestDuration.subject_id == subject_id,
+                TestDuration.school_id == school_id,
+            )
+            .scalar()
+        )
+
+        return draw_count or None
+
+    finally:
+        db.close()
+
+
 
 # ==============================
 # 📋 Question Helpers
@@ -1859,6 +1943,7 @@ def clear_students_db(school_id=None):
             query = query.filter_by(school_id=school_id)
         deleted_count = query.delete(synchronize_session=False)
         db.commit()
+        count_students.clear()
         return deleted_count
     finally:
         db.close()
@@ -1897,6 +1982,8 @@ def update_student_db(
 
         db.commit()
 
+        count_students.clear()
+
     except Exception as e:
         db.rollback()
         raise RuntimeError(f"Error updating student: {e}")
@@ -1924,20 +2011,27 @@ def clear_submissions_db(school_id=None):
         progress_query = db.query(StudentProgress)
         answer_query = db.query(StudentAnswer).join(StudentProgress)
         result_query = db.query(TestResult)
+        usage_query = db.query(AttemptQuestion)
 
         if school_id is not None:
             progress_query = progress_query.filter(StudentProgress.school_id == school_id)
             answer_query = answer_query.filter(StudentProgress.school_id == school_id)
             result_query = result_query.filter(TestResult.school_id == school_id)
+            usage_query = usage_query.filter(AttemptQuestion.school_id == school_id)
 
         # -------------------------
         # Delete in correct order
         # -------------------------
         deleted_answers = answer_query.delete(synchronize_session=False)
+        usage_query.delete(synchronize_session=False)
         deleted_progress = progress_query.delete(synchronize_session=False)
         deleted_results = result_query.delete(synchronize_session=False)
 
+        rebuild_performance(school_id, db=db)
+        rebuild_rollups(school_id, db=db)
+
         db.commit()
+        clear_item_stats()
 
         return {
             "answers_deleted": deleted_answers,
@@ -1960,70 +2054,318 @@ def normalize_code(code: str) -> str:
 
 
 
-def archive_question(session: Session, question_id: int) -> bool:
+# ==============================
+# 🗂️ Question usage + Archive / Restore (set-based)
+# ==============================
+ARCHIVE_ID_CHUNK = 10000  # keeps IN (...) lists under driver bind limits
+
+
+def _chunks(ids: list, size: int = ARCHIVE_ID_CHUNK):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def active_question_ids(school_id: int, test_type: str = "objective"):
     """
-    PURE ID-BASED.
-    Move an objective question from ObjectiveQuestion → ArchivedQuestion.
+    Subquery of question ids served in an unfinished (unsubmitted)
+    attempt in this school — an index scan on attempt_questions.
     """
+    return (
+        select(AttemptQuestion.question_id)
+        .where(
+            AttemptQuestion.submitted.is_(False),
+            AttemptQuestion.test_type == test_type,
+            AttemptQuestion.school_id == school_id,
+        )
+    )
+
+
+def get_questions_in_active_use(
+    school_id: int,
+    question_ids: list[int],
+    test_type: str = "objective",
+    db=None
+) -> set[int]:
+    """Bulk is_question_in_active_use: the subset of question_ids in use."""
+    if not question_ids:
+        return set()
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
     try:
-        # Lookup the objective question
-        q = session.get(ObjectiveQuestion, int(question_id))
-        if not q:
-            return False
+        in_use = set()
+
+        for chunk in _chunks([int(i) for i in question_ids]):
+            in_use.update(db.execute(
+                active_question_ids(school_id, test_type)
+                .where(AttemptQuestion.question_id.in_(chunk))
+                .distinct()
+            ).scalars())
+
+        return in_use
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def record_attempt_questions(
+    progress_id: int,
+    question_ids: list[int],
+    test_type: str,
+    school_id: int,
+    db=None
+) -> int:
+    """
+    Register the questions served in an attempt (called when it starts).
+    Replaces whatever an earlier attempt on the same progress row held.
+    Rows take the progress row's current submitted flag, since the
+    StudentProgress after_update hook only syncs them when it changes.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        submitted = bool(
+            db.query(StudentProgress.submitted)
+            .filter(StudentProgress.id == progress_id)
+            .scalar()
+        )
 
-        # Create an archived record
-        archived = ArchivedQuestion(
-            question_id=q.id,          # optional reference if you keep it
-            class_id=q.class_id,
-            subject_id=q.subject_id,
-            question_text=q.question_text,
-            options=q.options,
-            correct_answer=q.correct_answer,
-            created_by=getattr(q, "created_by", None),
-            created_at=getattr(q, "created_at", None),
-            archived_at=datetime.utcnow(),
-            school_id=q.school_id,
+        db.execute(
+            delete(AttemptQuestion)
+            .where(AttemptQuestion.progress_id == progress_id)
+            .execution_options(synchronize_session=False)
         )
 
-        session.add(archived)
-        session.delete(q)
-        session.commit()
-        return True
+        rows = [
+            {
+                "progress_id": progress_id,
+                "question_id": qid,
+                "test_type": test_type,
+                "school_id": school_id,
+                "submitted": submitted,
+            }
+            for qid in dict.fromkeys(int(q) for q in question_ids)
+        ]
+
+        if rows:
+            db.execute(insert(AttemptQuestion), rows)
+
+        db.commit()
+        return len(rows)
 
     except Exception as e:
-        session.rollback()
-        print(f"❌ Archive error: {e}")
-        return False
+        db.rollback()
+        print(f"❌ Error in record_attempt_questions: {e}")
+        raise
 
-from datetime import datetime
+    finally:
+        if close_db:
+            db.close()
+
+
+def bulk_archive_questions(
+    school_id: int,
+    question_ids: list[int] | None = None,
+    class_id: int | None = None,
+    subject_id: int | None = None,
+    db=None
+) -> dict:
+    """
+    Move objective questions into ArchivedQuestion in one transaction:
+    INSERT ... SELECT + DELETE, never row by row.
+
+    Pass question_ids to archive a selection, or class_id / subject_id
+    (no ids) to archive a whole bank. Questions still used by an
+    unfinished attempt are left in place.
+
+    Returns {"archived": int, "in_use": [question_id, ...]}
+    """
+    if question_ids is None and class_id is None and subject_id is None:
+        raise ValueError("Select questions or a class/subject bank to archive")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
 
-def restore_question(session: Session, archived_id: int) -> bool:
     try:
-        aq = session.get(ArchivedQuestion, archived_id)
-        if not aq:
-            return False
+        criteria = [ObjectiveQuestion.school_id == school_id]
+        if class_id is not None:
+            criteria.append(ObjectiveQuestion.class_id == class_id)
+        if subject_id is not None:
+            criteria.append(ObjectiveQuestion.subject_id == subject_id)
+        if question_ids is not None:
+            criteria.append(ObjectiveQuestion.id.in_([int(i) for i in question_ids]))
 
-        restored = ObjectiveQuestion()
+        in_use_ids = active_question_ids(school_id)
 
-        restored.class_id = aq.class_id
-        restored.subject_id = aq.subject_id
-        restored.school_id = aq.school_id
-        restored.question_text = aq.question_text
-        restored.options = aq.options
-        restored.correct_answer = aq.correct_answer
-        restored.created_at = getattr(aq, "created_at", datetime.utcnow())
+        # lock the selection once; insert + delete then work on the same ids
+        rows = db.execute(
+            select(
+                ObjectiveQuestion.id,
+                ObjectiveQuestion.id.in_(in_use_ids).label("in_use"),
+            )
+            .where(*criteria)
+            .with_for_update(of=ObjectiveQuestion)
+        ).all()
+
+        movable = [r.id for r in rows if not r.in_use]
+        in_use = [r.id for r in rows if r.in_use]
+
+        for chunk in _chunks(movable):
+            db.execute(
+                insert(ArchivedQuestion).from_select(
+                    [
+                        "school_id", "class_id", "subject_id",
+                        "question_text", "options", "answer",
+                        "test_type", "created_at",
+                    ],
+                    select(
+                        ObjectiveQuestion.school_id,
+                        ObjectiveQuestion.class_id,
+                        ObjectiveQuestion.subject_id,
+                        ObjectiveQuestion.question_text,
+                        ObjectiveQuestion.options,
+                        ObjectiveQuestion.correct_answer,
+                        literal("objective"),
+                        ObjectiveQuestion.created_at,
+                    ).where(ObjectiveQuestion.id.in_(chunk))
+                )
+            )
+            db.execute(
+                delete(ObjectiveQuestion)
+                .where(ObjectiveQuestion.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
 
-        # optional fields
-        if hasattr(aq, "created_by"):
-            restored.created_by = aq.created_by
+        db.commit()
+
+        return {"archived": len(movable), "in_use": in_use}
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in bulk_archive_questions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def bulk_restore_questions(
+    school_id: int,
+    archived_ids: list[int] | None = None,
+    class_id: int | None = None,
+    subject_id: int | None = None,
+    db=None
+) -> int:
+    """
+    Move archived objective questions back into ObjectiveQuestion
+    (INSERT ... SELECT + DELETE in one transaction).
+
+    Pass archived_ids for a selection, or class_id / subject_id for a
+    whole bank. Returns the number of questions restored.
+    """
+    if archived_ids is None and class_id is None and subject_id is None:
+        raise ValueError("Select archived questions or a class/subject bank to restore")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        criteria = [
+            ArchivedQuestion.school_id == school_id,
+            ArchivedQuestion.test_type == "objective",
+        ]
+        if class_id is not None:
+            criteria.append(ArchivedQuestion.class_id == class_id)
+        if subject_id is not None:
+            criteria.append(ArchivedQuestion.subject_id == subject_id)
+        if archived_ids is not None:
+            criteria.append(ArchivedQuestion.id.in_([int(i) for i in archived_ids]))
+
+        ids = db.execute(
+            select(ArchivedQuestion.id)
+            .where(*criteria)
+            .with_for_update(of=ArchivedQuestion)
+        ).scalars().all()
+
+        for chunk in _chunks(ids):
+            db.execute(
+                insert(ObjectiveQuestion).from_select(
+                    [
+                        "school_id", "class_id", "subject_id",
+                        "question_text", "options", "correct_answer",
+                        "created_at",
+                    ],
+                    select(
+                        ArchivedQuestion.school_id,
+                        ArchivedQuestion.class_id,
+                        ArchivedQuestion.subject_id,
+                        ArchivedQuestion.question_text,
+                        ArchivedQuestion.options,
+                        func.coalesce(ArchivedQuestion.answer, ""),
+                        func.coalesce(ArchivedQuestion.created_at, func.now()),
+                    )
+                    .where(ArchivedQuestion.id.in_(chunk))
+                    .order_by(ArchivedQuestion.id)
+                )
+            )
+            db.execute(
+                delete(ArchivedQuestion)
+                .where(ArchivedQuestion.id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+
+        db.commit()
+
+        return len(ids)
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in bulk_restore_questions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def archive_question(session: Session, question_id: int) -> bool:
+    """
+    PURE ID-BASED.
+    Move one objective question from ObjectiveQuestion → ArchivedQuestion.
+    """
+    q = session.get(ObjectiveQuestion, int(question_id))
+    if not q:
+        return False
+
+    try:
+        result = bulk_archive_questions(q.school_id, question_ids=[q.id], db=session)
+    except Exception as e:
+        print(f"❌ Archive error: {e}")
+        return False
+
+    return result["archived"] == 1
 
-        session.add(restored)
-        session.delete(aq)
-        session.commit()
-        return True
 
+def restore_question(session: Session, archived_id: int) -> bool:
+    aq = session.get(ArchivedQuestion, int(archived_id))
+    if not aq:
+        return False
+
+    try:
+        return bulk_restore_questions(aq.school_id, archived_ids=[aq.id], db=session) == 1
     except Exception as e:
-        session.rollback()
         print(f"❌ Restore error: {e}")
         return False
 
@@ -2096,6 +2438,143 @@ def reset_test(student_id: int):
         db.close()
 
 
+def bulk_reset_tests(
+    school_id: int,
+    class_id: int | None = None,
+    subject_id: int | None = None,
+    student_ids: list[int] | None = None,
+    test_type: str | None = None,
+    db=None
+) -> dict:
+    """
+    Set-based reset of test attempts for a whole school, a class,
+    a subject or an explicit list of student IDs.
+
+    Runs one UPDATE per table (students, student_progress, retakes)
+    inside a single transaction and returns the affected row counts.
+    """
+    if not school_id:
+        raise ValueError("school_id is required")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        # -----------------------------
+        # Target students (subquery, never loaded)
+        # -----------------------------
+        student_q = select(Student.id).where(Student.school_id == school_id)
+
+        if class_id is not None:
+            student_q = student_q.where(Student.class_id == class_id)
+
+        if student_ids is not None:
+            if not student_ids:
+                return {"students": 0, "progress": 0, "retakes": 0}
+            student_q = student_q.where(Student.id.in_([int(i) for i in student_ids]))
+
+        # -----------------------------
+        # 1️⃣ Student flags (not subject-specific → full resets only)
+        # -----------------------------
+        students_updated = 0
+
+        if subject_id is None and test_type is None:
+            students_updated = db.execute(
+                update(Student)
+                .where(Student.id.in_(student_q))
+                .values(submitted=False, can_retake=True)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        # -----------------------------
+        # 2️⃣ Attempts → fresh, unlocked
+        # -----------------------------
+        progress_stmt = (
+            update(StudentProgress)
+            .where(
+                StudentProgress.school_id == school_id,
+                StudentProgress.student_id.in_(student_q),
+            )
+            .values(
+                submitted=False,
+                locked=False,
+                current_q=0,
+                start_time=None,
+                duration=None,
+                # previous attempt's answers and grading (as reset_attempt)
+                answers=[],
+                answer_sheet=None,
+                score=None,
+                review_status="pending",
+                review_comment=None,
+                reviewed_at=None,
+                reviewed_by=None,
+                score_suggestions=None,
+                auto_submit_reason=None,
+                lease_owner=None,
+                lease_token=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # -----------------------------
+        # 3️⃣ Retake permissions
+        # -----------------------------
+        retake_stmt = (
+            update(Retake)
+            .where(
+                Retake.school_id == school_id,
+                Retake.student_id.in_(student_q),
+            )
+            .values(can_retake=True)
+            .execution_options(synchronize_session=False)
+        )
+
+        if subject_id is not None:
+            progress_stmt = progress_stmt.where(StudentProgress.subject_id == subject_id)
+            retake_stmt = retake_stmt.where(Retake.subject_id == subject_id)
+
+        if test_type is not None:
+            progress_stmt = progress_stmt.where(StudentProgress.test_type == test_type)
+            retake_stmt = retake_stmt.where(Retake.test_type == test_type)
+
+        reset_ids = select(StudentProgress.id).where(progress_stmt.whereclause)
+
+        # reset attempts no longer hold their questions or saved answers
+        for table in (AttemptQuestion, StudentAnswer):
+            db.execute(
+                delete(table)
+                .where(table.progress_id.in_(reset_ids))
+                .execution_options(synchronize_session=False)
+            )
+
+        progress_updated = db.execute(progress_stmt).rowcount
+        retakes_updated = db.execute(retake_stmt).rowcount
+
+        db.commit()
+        clear_item_stats()
+
+        invalidate_retake_cache(school_id=school_id, student_ids=student_ids)
+
+        return {
+            "students": students_updated,
+            "progress": progress_updated,
+            "retakes": retakes_updated,
+        }
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ bulk_reset_tests error: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
 
 
 def has_submitted_test(
@@ -2133,24 +2612,22 @@ def save_progress(
         current_q,
         start_time,
         duration,
-        questions,
         school_id,
         test_type,
         student_id=None,
-        submitted=False
+        submitted=False,
+        paper_id=None,
+        answer_sheet=None,
+        shuffle_seed=None
 ):
-
+    """
+    Upsert the attempt's progress row. The question set itself lives in
+    an ExamPaper (paper_id); only answers and timing are saved here.
+    Objective attempts pass answer_sheet (see backend.answer_sheet).
+    """
     db = get_session()
 
     try:
-        # Normalize question IDs
-        def normalize_question(q):
-            if isinstance(q, (int, str)):
-                return q
-            return getattr(q, "id", q)
-
-        question_list = [normalize_question(q) for q in questions]
-
         # Safe start_time handling
         if isinstance(start_time, datetime):
             safe_start_time = start_time.timestamp()
@@ -2181,7 +2658,15 @@ def save_progress(
             existing.current_q = current_q
             existing.start_time = safe_start_time
             existing.duration = safe_duration
-            existing.questions = question_list
+
+            if paper_id is not None:
+                existing.paper_id = paper_id
+
+            if answer_sheet is not None:
+                existing.answer_sheet = answer_sheet
+
+            if shuffle_seed is not None:
+                existing.shuffle_seed = shuffle_seed
 
             # 🔥 Only upgrade submission, never downgrade
             if submitted:
@@ -2208,7 +2693,9 @@ def save_progress(
                 current_q=current_q,
                 start_time=safe_start_time,
                 duration=safe_duration,
-                questions=question_list,
+                paper_id=paper_id,
+                answer_sheet=answer_sheet,
+                shuffle_seed=shuffle_seed,
                 submitted=bool(submitted),
             )
 
@@ -2268,14 +2755,18 @@ def load_progress(
         except:
             answers = []
 
-        try:
-            questions = json.loads(record.questions) if record.questions else []
-        except:
-            questions = []
+        paper = get_exam_paper(record.paper_id)
+
+        # objective answer sheet → selected option per question
+        if record.answer_sheet is not None and paper:
+            answers = decode_selected(record.answer_sheet, paper["questions"])
 
         return {
             "answers": answers,
-            "questions": questions,
+            "progress_id": record.id,
+            "paper_id": record.paper_id,
+            "shuffle_seed": record.shuffle_seed,
+            "questions": paper["question_ids"] if paper else [],
             "current_q": record.current_q or 0,
             "start_time": record.start_time,  # ✅ NO DEFAULT
             "duration": record.duration,  # ✅ NO DEFAULT
@@ -2313,8 +2804,13 @@ def clear_progress(
         if test_type is not None:
             query = query.filter(StudentProgress.test_type == test_type)
 
+        db.query(AttemptQuestion).filter(
+            AttemptQuestion.progress_id.in_(query.with_entities(StudentProgress.id).scalar_subquery())
+        ).delete(synchronize_session=False)
+
         query.delete()
         db.commit()
+        clear_item_stats()
 
     finally:
         db.close()
@@ -2463,6 +2959,160 @@ def get_all_schools(db=None):
 
 
 from backend.models import Student, Class
+# ==============================
+# 🔎 Student search (indexed)
+# ==============================
+STUDENT_SEARCH_PAGE_SIZE = 50
+
+# Trigram matching needs at least 3 characters; shorter queries use prefixes
+_TRIGRAM_MIN_LEN = 3
+
+_student_fts_ready = None
+
+
+def _has_student_fts(db) -> bool:
+    """True when the SQLite FTS5 trigram table from run_migrations exists."""
+    global _student_fts_ready
+
+    if _student_fts_ready is None:
+        _student_fts_ready = db.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'"
+        )).first() is not None
+
+    return _student_fts_ready
+
+
+def _student_match_clause(db, q: str):
+    """
+    Indexed filter for a normalized (lowercase) query on name or access code.
+
+    - Postgres: lower(name/access_code) LIKE '%q%' → pg_trgm GIN indexes
+    - SQLite:   students_fts MATCH '"q"'           → FTS5 trigram index
+    - < 3 chars (or no index available): prefix match only
+    """
+    dialect = db.get_bind().dialect.name
+    code_prefix = Student.access_code.like(f"{q.upper()}%")
+
+    if len(q) < _TRIGRAM_MIN_LEN:
+        return or_(func.lower(Student.name).like(f"{q}%"), code_prefix)
+
+    if dialect == "postgresql":
+        return or_(
+            func.lower(Student.name).like(f"%{q}%"),
+            func.lower(Student.access_code).like(f"%{q}%"),
+        )
+
+    if dialect == "sqlite" and _has_student_fts(db):
+        phrase = '"' + q.replace('"', '""') + '"'
+        return Student.id.in_(
+            text("SELECT rowid FROM students_fts WHERE students_fts MATCH :phrase")
+            .bindparams(phrase=phrase)
+            .columns(rowid=Integer)
+        )
+
+    return or_(
+        func.lower(Student.name).like(f"%{q}%"),
+        code_prefix,
+    )
+
+
+def search_students(
+    school_id: int,
+    query: str = "",
+    class_id: int | None = None,
+    after: tuple | None = None,
+    limit: int = STUDENT_SEARCH_PAGE_SIZE,
+    db=None
+) -> dict:
+    """
+    One page of a school's students matching `query` (name or access code),
+    ordered by name.
+
+    - after: keyset cursor (name, id) of the last row of the previous page
+
+    Returns {"rows": [...], "next_after": (name, id) | None}
+    """
+    if not school_id:
+        raise ValueError("school_id is required")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        stmt = db.query(
+            Student.id,
+            Student.name,
+            Student.access_code,
+            Student.class_id,
+            Student.can_retake,
+            Student.submitted,
+        ).filter(Student.school_id == school_id)
+
+        if class_id is not None:
+            stmt = stmt.filter(Student.class_id == class_id)
+
+        q = (query or "").strip().lower()
+
+        if q:
+            stmt = stmt.filter(_student_match_clause(db, q))
+
+        if after is not None:
+            after_name, after_id = after
+            stmt = stmt.filter(
+                or_(
+                    Student.name > after_name,
+                    and_(Student.name == after_name, Student.id > after_id),
+                )
+            )
+
+        rows = stmt.order_by(Student.name.asc(), Student.id.asc()).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "rows": [
+                {
+                    "id": r.id,
+                    "name": r.name,
+                    "access_code": r.access_code,
+                    "class_id": r.class_id,
+                    "can_retake": r.can_retake,
+                    "submitted": r.submitted,
+                }
+                for r in rows
+            ],
+            "next_after": (rows[-1].name, rows[-1].id) if has_more and rows else None,
+        }
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def _count_students_db(school_id: int, class_id: int | None = None) -> int:
+    db = get_session()
+
+    try:
+        query = db.query(func.count(Student.id)).filter(Student.school_id == school_id)
+
+        if class_id is not None:
+            query = query.filter(Student.class_id == class_id)
+
+        return query.scalar() or 0
+
+    finally:
+        db.close()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def count_students(school_id: int, class_id: int | None = None) -> int:
+    """Cached roster size (cleared by the student add/update/delete helpers)."""
+    return _count_students_db(school_id, class_id)
+
+
 def get_students_by_school(
     school_id: int,
     class_id: int | None = None,
@@ -2731,30 +3381,87 @@ def load_student_results(
         if close_db:
             db.close()
 
-def can_take_test(student_id, subject_id, school_id, test_type):
+# ==============================
+# 🔁 Retake permission cache (per process)
+# ==============================
+_RETAKE_CACHE: dict[tuple[int, int], dict[tuple[int, str], bool]] = {}
+_RETAKE_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_retake_cache(school_id=None, student_ids=None):
     """
-    Return True if the student has a retake allowed.
+    Drop cached retake permissions after any write to `retakes`.
+    - student_ids → only those students
+    - school_id → every student of that school
+    - neither → everything
+    """
+    with _RETAKE_CACHE_LOCK:
+        if school_id is None and student_ids is None:
+            _RETAKE_CACHE.clear()
+            return
+
+        wanted = {int(i) for i in student_ids} if student_ids is not None else None
+
+        for key in list(_RETAKE_CACHE):
+            key_school, key_student = key
+
+            if school_id is not None and key_school != school_id:
+                continue
+
+            if wanted is not None and key_student not in wanted:
+                continue
+
+            _RETAKE_CACHE.pop(key, None)
+
+
+def get_retake_permissions(student_id, school_id):
+    """
+    Return {(subject_id, test_type): can_retake} for one student.
+    Loaded with a single query on first use, then served from memory
+    until invalidate_retake_cache() is called for that student/school.
     """
-    from backend.models import Retake
+    key = (int(school_id), int(student_id))
+
+    with _RETAKE_CACHE_LOCK:
+        cached = _RETAKE_CACHE.get(key)
+
+    if cached is not None:
+        return cached
+
     db = get_session()
 
     try:
-        retake = (
-            db.query(Retake)
-            .filter_by(
-                student_id=student_id,
-                subject_id=subject_id,
-                school_id=school_id,
-                test_type=test_type,
-                can_retake=True
-            )
-            .first()
-        )
-        return retake is not None
+        rows = db.query(
+            Retake.subject_id,
+            Retake.test_type,
+            Retake.can_retake,
+        ).filter(
+            Retake.student_id == student_id,
+            Retake.school_id == school_id,
+        ).all()
+
+        permissions = {
+            (r.subject_id, r.test_type): bool(r.can_retake)
+            for r in rows
+        }
 
     finally:
         db.close()
 
+    with _RETAKE_CACHE_LOCK:
+        _RETAKE_CACHE[key] = permissions
+
+    return permissions
+
+
+def can_take_test(student_id, subject_id, school_id, test_type):
+    """
+    Return True if the student has a retake allowed.
+    """
+    permissions = get_retake_permissions(student_id, school_id)
+
+    return permissions.get((int(subject_id), test_type), False)
+
 def get_retake_db(access_code: str, subject_id: int, school_id: int = None) -> bool:
     """
     Check if a student has retake permission for a subject (multi-tenant aware).
@@ -2819,6 +3526,8 @@ def decrement_retake(
 
         db.commit()
 
+        invalidate_retake_cache(school_id=school_id, student_ids=[student_id])
+
     except Exception as e:
         db.rollback()
         print("❌ decrement_retake error:", e)
@@ -2831,6 +3540,7 @@ def set_retake_db(
     subject_id: int,
     can_retake: bool = True,
     school_id: int | None = None,
+    test_type: str = "objective",
     db=None
 ):
 
@@ -2845,11 +3555,11 @@ def set_retake_db(
         close_db = True
 
     try:
-        access_code = access_code.strip().upper()
+        access_code = normalize_code(access_code)
 
-        # ✅ Robust student lookup
+        # ✅ Codes are stored normalized → exact (indexed) match
         query = db.query(Student).filter(
-            func.upper(func.trim(Student.access_code)) == access_code
+            Student.access_code == access_code
         )
 
         if school_id is not None:
@@ -2863,17 +3573,12 @@ def set_retake_db(
             )
 
         # ✅ Safe retake lookup
-        retake_query = db.query(Retake).filter(
+        retake = db.query(Retake).filter(
             Retake.student_id == student.id,
             Retake.subject_id == subject_id,
-        )
-
-        if school_id is not None:
-            retake_query = retake_query.filter(
-                Retake.school_id == school_id
-            )
-
-        retake = retake_query.one_or_none()
+            Retake.school_id == student.school_id,
+            Retake.test_type == test_type,
+        ).one_or_none()
 
         # ✅ Update / Insert
         if retake:
@@ -2884,12 +3589,16 @@ def set_retake_db(
                     student_id=student.id,
                     subject_id=subject_id,
                     can_retake=can_retake,
-                    school_id=school_id,
+                    school_id=student.school_id,
+                    class_id=student.class_id,
+                    test_type=test_type,
                 )
             )
 
         db.commit()
 
+        invalidate_retake_cache(school_id=student.school_id, student_ids=[student.id])
+
         print(
             f"🟢 Retake {'ENABLED' if can_retake else 'DISABLED'} "
             f"| access_code={access_code} | subject_id={subject_id}"
@@ -2905,6 +3614,100 @@ def set_retake_db(
             db.close()
 
 
+def bulk_set_retakes(
+    school_id: int,
+    class_id: int,
+    subject_id: int | None = None,
+    test_type: str | None = "objective",
+    can_retake: bool = True,
+    student_ids: list[int] | None = None,
+    db=None
+) -> int:
+    """
+    Grant or revoke retakes for a whole class (optionally one subject,
+    one test type or a subset of students) with a single
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE per test type.
+
+    test_type=None applies to both objective and subjective.
+    Returns the number of retake rows written.
+    """
+    if not school_id or not class_id:
+        raise ValueError("school_id and class_id are required")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    test_types = [test_type] if test_type else ["objective", "subjective"]
+
+    try:
+        insert = dialect_insert(db.get_bind())
+        written = 0
+
+        for tt in test_types:
+            source = (
+                select(
+                    Student.id,
+                    Subject.id,
+                    literal(school_id),
+                    literal(class_id),
+                    literal(tt),
+                    literal(bool(can_retake)),
+                )
+                .join(
+                    Subject,
+                    (Subject.class_id == Student.class_id)
+                    & (Subject.school_id == Student.school_id),
+                )
+                .where(
+                    Student.school_id == school_id,
+                    Student.class_id == class_id,
+                )
+            )
+
+            if subject_id is not None:
+                source = source.where(Subject.id == subject_id)
+
+            if student_ids is not None:
+                source = source.where(Student.id.in_([int(i) for i in student_ids]))
+
+            stmt = insert(Retake).from_select(
+                ["student_id", "subject_id", "school_id", "class_id", "test_type", "can_retake"],
+                source,
+            )
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["student_id", "subject_id", "school_id", "class_id", "test_type"],
+                set_={
+                    "can_retake": stmt.excluded.can_retake,
+                    "updated_at": func.now(),
+                },
+            )
+
+            written += db.execute(stmt).rowcount
+
+        db.commit()
+
+        invalidate_retake_cache(school_id=school_id, student_ids=student_ids)
+
+        print(
+            f"🟢 Bulk retake {'ENABLED' if can_retake else 'DISABLED'} "
+            f"| class_id={class_id} | subject_id={subject_id} | rows={written}"
+        )
+
+        return written
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in bulk_set_retakes: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
 def get_classes_by_school(school_id: int, db=None):
     if not school_id:
         return []
@@ -2948,25 +3751,17 @@ def is_question_in_active_use(
     session: Session,
     question_id: int,
     school_id: int,
+    test_type: str = "objective",
 ) -> bool:
     """
     Returns True if the question is referenced by any
     unfinished student attempt.
     """
-
-    from sqlalchemy import cast
-    from sqlalchemy.types import JSON
-
-    # ✅ Check if any StudentProgress row has this question ID and is not submitted
-    in_progress = (
-        session.query(StudentProgress.id)
-        .filter(
-            StudentProgress.school_id == school_id,
-            StudentProgress.submitted.is_(False),
-            cast(StudentProgress.questions, JSON).contains([question_id])
-        )
-        .first()
-    )
+    in_progress = session.execute(
+        active_question_ids(school_id, test_type)
+        .where(AttemptQuestion.question_id == question_id)
+        .limit(1)
+    ).first()
 
     return in_progress is not None
 
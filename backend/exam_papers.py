@@ -0,0 +1,221 @@
+# ==============================
+# backend/exam_papers.py
+# Immutable, content-addressed exam papers
+# ==============================
+"""
+An exam paper is the ordered question set an attempt was served, plus a
+hash of its answer key. Papers are keyed by a SHA-256 of their content,
+stored once however many students sit them, and never modified (apart
+from answer-key corrections, see correct_paper_keys), so attempts only
+carry a paper_id and papers can be cached.
+"""
+import hashlib
+import json
+import threading
+from functools import lru_cache
+
+from backend.database import get_session, dialect_insert
+from backend.models import ExamPaper
+
+
+# question fields frozen into a paper
+PAPER_FIELDS = ("id", "text", "options", "correct_answer")
+
+# content_hash → paper id (papers never change, so never invalidated)
+_PAPER_IDS = {}
+_PAPER_IDS_LOCK = threading.Lock()
+
+
+# ==============================
+# 🔐 Hashing
+# ==============================
+def _digest(value) -> str:
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def snapshot_questions(questions) -> list[dict]:
+    """Normalized question dicts (or ORM rows) → paper snapshot."""
+    snapshot = []
+
+    for q in questions:
+        if not isinstance(q, dict):
+            q = {
+                "id": q.id,
+                "text": q.question_text,
+                "options": getattr(q, "options", None),
+                "correct_answer": getattr(q, "correct_answer", None),
+            }
+
+        snapshot.append({field: q.get(field) for field in PAPER_FIELDS})
+
+    return snapshot
+
+
+def answer_key_hash(snapshot: list[dict]) -> str:
+    return _digest([q["correct_answer"] for q in snapshot])
+
+
+def paper_hash(school_id: int, class_id: int, subject_id: int, test_type: str, snapshot: list[dict]) -> str:
+    return _digest({
+        "school_id": school_id,
+        "class_id": class_id,
+        "subject_id": subject_id,
+        "test_type": test_type,
+        "questions": snapshot,
+    })
+
+
+# ==============================
+# 📝 Create / fetch
+# ==============================
+def get_or_create_exam_paper(
+    questions,
+    school_id: int,
+    class_id: int,
+    subject_id: int,
+    test_type: str,
+    db=None
+) -> int:
+    """
+    Return the id of the paper holding exactly these questions (in this
+    order), inserting it on first use. Safe under concurrent starts.
+    """
+    snapshot = snapshot_questions(questions)
+    content_hash = paper_hash(school_id, class_id, subject_id, test_type, snapshot)
+
+    with _PAPER_IDS_LOCK:
+        cached = _PAPER_IDS.get(content_hash)
+    if cached is not None:
+        return cached
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        insert = dialect_insert(db.get_bind())
+
+        db.execute(
+            insert(ExamPaper)
+            .values(
+                school_id=school_id,
+                class_id=class_id,
+                subject_id=subject_id,
+                test_type=test_type,
+                content_hash=content_hash,
+                question_ids=[q["id"] for q in snapshot],
+                questions=snapshot,
+                answer_key_hash=answer_key_hash(snapshot),
+            )
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+        )
+
+        paper_id = db.query(ExamPaper.id).filter(ExamPaper.content_hash == content_hash).scalar()
+        db.commit()
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in get_or_create_exam_paper: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+    with _PAPER_IDS_LOCK:
+        _PAPER_IDS[content_hash] = paper_id
+
+    return paper_id
+
+
+@lru_cache(maxsize=1024)
+def _load_paper(paper_id: int):
+    db = get_session()
+    try:
+        paper = db.get(ExamPaper, paper_id)
+        if paper is None:
+            return None
+
+        return {
+            "id": paper.id,
+            "test_type": paper.test_type,
+            "question_ids": tuple(paper.question_ids or ()),
+            "questions": tuple(paper.questions or ()),
+            "answer_key_hash": paper.answer_key_hash,
+        }
+    finally:
+        db.close()
+
+
+def get_exam_paper(paper_id: int | None) -> dict | None:
+    """
+    Paper by id (cached per process). Returns fresh lists/dicts, so
+    callers may modify the result without touching the cache.
+    """
+    if not paper_id:
+        return None
+
+    paper = _load_paper(int(paper_id))
+    if paper is None:
+        return None
+
+    return {
+        **paper,
+        "question_ids": list(paper["question_ids"]),
+        "questions": [dict(q) for q in paper["questions"]],
+    }
+
+
+def correct_paper_keys(db, paper_ids, new_keys: dict) -> int:
+    """
+    Apply answer-key corrections {question_id: correct_answer} to the
+    papers' snapshots (caller commits). content_hash is left as it was:
+    papers drawn from the corrected bank hash differently anyway.
+    Call invalidate_paper_cache() once the change is committed.
+    Returns the number of papers changed.
+    """
+    changed = 0
+
+    for paper in db.query(ExamPaper).filter(ExamPaper.id.in_(list(paper_ids))):
+        snapshot = [dict(q) for q in paper.questions or ()]
+
+        touched = False
+        for q in snapshot:
+            if q.get("id") in new_keys and q.get("correct_answer") != new_keys[q["id"]]:
+                q["correct_answer"] = new_keys[q["id"]]
+                touched = True
+
+        if touched:
+            paper.questions = snapshot
+            paper.answer_key_hash = answer_key_hash(snapshot)
+            changed += 1
+
+    return changed
+
+
+def invalidate_paper_cache():
+    _load_paper.cache_clear()
+
+
+def hydrate_answer_details(details: list, paper: dict | None) -> list:
+    """Fill question text / correct answer into saved answer rows from the paper."""
+    if not paper or not details:
+        return details
+
+    by_id = {q["id"]: q for q in paper["questions"]}
+
+    for d in details:
+        if not isinstance(d, dict):
+            continue
+
+        q = by_id.get(d.get("question_id"))
+        if q is None:
+            continue
+
+        d.setdefault("question_text", q["text"])
+        if q["correct_answer"] is not None:
+            d.setdefault("correct", q["correct_answer"])
+
+    return details
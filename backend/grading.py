@@ -0,0 +1,758 @@
+# ==============================
+# backend/grading.py
+# Subjective grading queue + grade persistence
+# ==============================
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, or_, select, update, insert as sql_insert
+
+from backend.database import get_session, dialect_insert
+from backend.models import (
+    StudentProgress,
+    Student,
+    Subject,
+    StudentAnswer,
+    SubjectiveQuestion,
+    SubjectiveGrade,
+    TestResult,
+)
+from backend.analytics import record_rollups
+from backend.performance import record_performance
+
+
+QUEUE_PAGE_SIZE = 20
+
+LEASE_SECONDS = 15 * 60
+CLAIM_BATCH = 5
+
+
+# ==============================
+# 🔧 Helpers
+# ==============================
+def parse_json_field(data):
+    """Return a JSON list column as a Python list (tolerates legacy strings)."""
+    if not data:
+        return []
+
+    if isinstance(data, list):
+        return data
+
+    if isinstance(data, str):
+        try:
+            parsed = json.loads(data)
+            return parsed if isinstance(parsed, list) else []
+        except (TypeError, ValueError):
+            return []
+
+    return []
+
+
+def _naive(value):
+    """SQLite hands back naive datetimes, Postgres aware ones → compare as naive UTC."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _lease_active(now):
+    return and_(
+        StudentProgress.lease_token.isnot(None),
+        StudentProgress.lease_expires_at > now,
+    )
+
+
+def _queue_filters(query, school_id, status, subject_id=None, student_search=None):
+    query = query.filter(
+        StudentProgress.school_id == school_id,
+        StudentProgress.test_type == "subjective",
+        StudentProgress.submitted == True,
+    )
+
+    if status == "pending":
+        query = query.filter(
+            or_(
+                StudentProgress.review_status.is_(None),
+                StudentProgress.review_status == "pending",
+            )
+        )
+    elif status == "reviewed":
+        query = query.filter(StudentProgress.review_status == "reviewed")
+
+    if subject_id is not None:
+        query = query.filter(StudentProgress.subject_id == subject_id)
+
+    if student_search:
+        query = query.filter(Student.name.ilike(f"%{student_search.strip()}%"))
+
+    return query
+
+
+# ==============================
+# 📋 Grading queue
+# ==============================
+def get_grading_queue(
+    school_id: int,
+    status: str = "pending",
+    subject_id: int | None = None,
+    student_search: str | None = None,
+    after_id: int | None = None,
+    limit: int = QUEUE_PAGE_SIZE,
+    leased_to: str | None = None,
+    db=None
+) -> dict:
+    """
+    One page of submitted subjective attempts, newest first.
+
+    - status: "pending" | "reviewed" | "all"
+    - after_id: keyset cursor (id of the last row on the previous page)
+    - leased_to: only submissions currently leased to this grader
+
+    Only light columns plus student/subject names are selected here;
+    answer bodies are loaded per submission by load_submission().
+
+    Returns {"rows": [...], "next_after_id": int | None}
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(
+            StudentProgress.id,
+            StudentProgress.student_id,
+            StudentProgress.subject_id,
+            StudentProgress.class_id,
+            StudentProgress.review_status,
+            StudentProgress.score,
+            StudentProgress.reviewed_at,
+            StudentProgress.created_at,
+            StudentProgress.lease_owner,
+            StudentProgress.lease_token,
+            StudentProgress.lease_expires_at,
+            Student.name.label("student_name"),
+            Subject.name.label("subject_name"),
+        ).join(
+            Student, Student.id == StudentProgress.student_id
+        ).outerjoin(
+            Subject, Subject.id == StudentProgress.subject_id
+        )
+
+        query = _queue_filters(query, school_id, status, subject_id, student_search)
+
+        if leased_to is not None:
+            query = query.filter(
+                StudentProgress.lease_owner == leased_to,
+                _lease_active(datetime.utcnow()),
+            )
+
+        if after_id is not None:
+            query = query.filter(StudentProgress.id < after_id)
+
+        # fetch one extra row to know whether another page exists
+        rows = query.order_by(StudentProgress.id.desc()).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "rows": [
+                {
+                    "id": r.id,
+                    "student_id": r.student_id,
+                    "subject_id": r.subject_id,
+                    "class_id": r.class_id,
+                    "student_name": r.student_name or f"Student {r.student_id}",
+                    "subject_name": r.subject_name or "Unknown",
+                    "review_status": r.review_status or "pending",
+                    "score": r.score,
+                    "reviewed_at": r.reviewed_at,
+                    "created_at": r.created_at,
+                    "lease_owner": (
+                        r.lease_owner
+                        if r.lease_token and r.lease_expires_at and _naive(r.lease_expires_at) > datetime.utcnow()
+                        else None
+                    ),
+                    "lease_token": r.lease_token,
+                }
+                for r in rows
+            ],
+            "next_after_id": rows[-1].id if has_more and rows else None,
+        }
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def get_grading_subjects(school_id: int, db=None) -> list[dict]:
+    """Subjects that have at least one submitted subjective attempt."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        rows = (
+            db.query(Subject.id, Subject.name)
+            .join(StudentProgress, StudentProgress.subject_id == Subject.id)
+            .filter(
+                StudentProgress.school_id == school_id,
+                StudentProgress.test_type == "subjective",
+                StudentProgress.submitted == True,
+            )
+            .distinct()
+            .order_by(Subject.name.asc())
+            .all()
+        )
+
+        return [{"id": r.id, "name": r.name} for r in rows]
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def load_submission(progress_id: int, school_id: int, db=None) -> dict | None:
+    """
+    Load the answer body of one submission (only when it is opened).
+
+    items: [{"question_id", "question", "marks", "answer", "suggestion"}]
+    Per-question rows come from student_answers; older attempts without
+    them fall back to the answers JSON on the progress row.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        row = (
+            db.query(
+                StudentProgress.answers,
+                StudentProgress.attachments,
+                StudentProgress.score_suggestions,
+            )
+            .filter(
+                StudentProgress.id == progress_id,
+                StudentProgress.school_id == school_id,
+            )
+            .first()
+        )
+
+        if not row:
+            return None
+
+        answer_rows = (
+            db.query(
+                StudentAnswer.question_id,
+                StudentAnswer.answer,
+                SubjectiveQuestion.question_text,
+                SubjectiveQuestion.marks,
+            )
+            .join(SubjectiveQuestion, SubjectiveQuestion.id == StudentAnswer.question_id)
+            .filter(StudentAnswer.progress_id == progress_id)
+            .order_by(StudentAnswer.id.asc())
+            .all()
+        )
+
+        if answer_rows:
+            items = [
+                {
+                    "question_id": r.question_id,
+                    "question": r.question_text,
+                    "marks": r.marks,
+                    "answer": r.answer or "",
+                }
+                for r in answer_rows
+            ]
+        else:
+            items = []
+
+            for idx, item in enumerate(parse_json_field(row.answers), start=1):
+                if isinstance(item, dict):
+                    items.append({
+                        "question_id": item.get("question_id"),
+                        "question": item.get("question", f"Question {idx}"),
+                        "marks": item.get("marks"),
+                        "answer": item.get("answer", ""),
+                    })
+                else:
+                    items.append({
+                        "question_id": None,
+                        "question": f"Question {idx}",
+                        "marks": None,
+                        "answer": str(item),
+                    })
+
+        suggestions = row.score_suggestions or {}
+
+        for item in items:
+            item["suggestion"] = suggestions.get(str(item["question_id"]))
+
+        return {
+            "items": items,
+            "attachments": parse_json_field(row.attachments),
+        }
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def load_question_grades(student_id: int, subject_id: int, db=None) -> dict:
+    """Existing per-question grades of a student for a subject: {question_id: score}."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        rows = (
+            db.query(SubjectiveGrade.question_id, SubjectiveGrade.score)
+            .filter(
+                SubjectiveGrade.student_id == student_id,
+                SubjectiveGrade.subject_id == subject_id,
+            )
+            .all()
+        )
+
+        return {r.question_id: r.score for r in rows}
+
+    finally:
+        if close_db:
+            db.close()
+
+
+# ==============================
+# 🔒 Grading leases (multi-grader)
+# ==============================
+def claim_submissions(
+    school_id: int,
+    grader: str,
+    limit: int = CLAIM_BATCH,
+    subject_id: int | None = None,
+    lease_seconds: int = LEASE_SECONDS,
+    db=None
+) -> list[int]:
+    """
+    Lease up to `limit` pending submissions to `grader`, oldest first.
+
+    One UPDATE ... WHERE id IN (SELECT ... LIMIT n FOR UPDATE SKIP LOCKED):
+    on Postgres concurrent graders skip each other's rows instead of
+    waiting; on SQLite the single statement runs under the database write
+    lock and the repeated "lease free" condition keeps the claim atomic.
+
+    Submissions the grader already holds count toward `limit` and have
+    their lease renewed. Returns the ids now leased to the grader.
+    """
+    if not grader:
+        raise ValueError("grader is required")
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        now = datetime.utcnow()
+        expires = now + timedelta(seconds=lease_seconds)
+
+        # same rows the candidate query claims
+        pending = or_(
+            StudentProgress.review_status.is_(None),
+            StudentProgress.review_status == "pending",
+        )
+
+        # renew what this grader already holds
+        held = db.execute(
+            update(StudentProgress)
+            .where(
+                StudentProgress.school_id == school_id,
+                StudentProgress.lease_owner == grader,
+                pending,
+                _lease_active(now),
+            )
+            .values(lease_expires_at=expires)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        wanted = max(limit - held, 0)
+        token = str(uuid.uuid4())
+
+        if wanted:
+            lease_free = or_(
+                StudentProgress.lease_token.is_(None),
+                StudentProgress.lease_expires_at.is_(None),
+                StudentProgress.lease_expires_at <= now,
+            )
+
+            candidates = (
+                select(StudentProgress.id)
+                .where(
+                    StudentProgress.school_id == school_id,
+                    StudentProgress.test_type == "subjective",
+                    StudentProgress.submitted == True,
+                    pending,
+                    lease_free,
+                )
+                .order_by(StudentProgress.id.asc())
+                .limit(wanted)
+                .with_for_update(skip_locked=True)
+            )
+
+            if subject_id is not None:
+                candidates = candidates.where(StudentProgress.subject_id == subject_id)
+
+            db.execute(
+                update(StudentProgress)
+                .where(
+                    StudentProgress.id.in_(candidates.scalar_subquery()),
+                    lease_free,
+                )
+                .values(
+                    lease_owner=grader,
+                    lease_token=token,
+                    lease_expires_at=expires,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        db.commit()
+
+        return [
+            r.id
+            for r in db.query(StudentProgress.id).filter(
+                StudentProgress.school_id == school_id,
+                StudentProgress.lease_owner == grader,
+                _lease_active(now),
+            ).order_by(StudentProgress.id.asc())
+        ]
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in claim_submissions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def release_submissions(grader: str, progress_ids: list[int] | None = None, db=None) -> int:
+    """Give leases back to the queue (all of the grader's, or just some)."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        stmt = update(StudentProgress).where(StudentProgress.lease_owner == grader)
+
+        if progress_ids is not None:
+            stmt = stmt.where(StudentProgress.id.in_(progress_ids))
+
+        released = db.execute(
+            stmt.values(
+                lease_owner=None,
+                lease_token=None,
+                lease_expires_at=None,
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+
+        db.commit()
+
+        return released
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in release_submissions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def get_grading_stats(school_id: int, hours: int = 24, db=None) -> dict:
+    """
+    Queue depth and per-grader throughput for the grading dashboard.
+
+    Returns {
+        "unclaimed": int, "leased": int, "reviewed": int,
+        "graders": [{"grader", "leased", "reviewed", "per_hour"}]
+    }
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        now = datetime.utcnow()
+        since = now - timedelta(hours=hours)
+
+        base = db.query(StudentProgress).filter(
+            StudentProgress.school_id == school_id,
+            StudentProgress.test_type == "subjective",
+            StudentProgress.submitted == True,
+        )
+
+        pending = or_(
+            StudentProgress.review_status.is_(None),
+            StudentProgress.review_status == "pending",
+        )
+
+        depth = base.with_entities(
+            func.count().filter(pending & ~_lease_active(now)),
+            func.count().filter(pending & _lease_active(now)),
+            func.count().filter(
+                (StudentProgress.review_status == "reviewed")
+                & (StudentProgress.reviewed_at >= since)
+            ),
+        ).one()
+
+        graders = {}
+
+        for owner, leased in base.with_entities(
+            StudentProgress.lease_owner, func.count()
+        ).filter(
+            pending, _lease_active(now)
+        ).group_by(StudentProgress.lease_owner):
+            graders.setdefault(owner, {"grader": owner, "leased": 0, "reviewed": 0})
+            graders[owner]["leased"] = leased
+
+        for reviewer, reviewed in base.with_entities(
+            StudentProgress.reviewed_by, func.count()
+        ).filter(
+            StudentProgress.review_status == "reviewed",
+            StudentProgress.reviewed_at >= since,
+            StudentProgress.reviewed_by.isnot(None),
+        ).group_by(StudentProgress.reviewed_by):
+            graders.setdefault(reviewer, {"grader": reviewer, "leased": 0, "reviewed": 0})
+            graders[reviewer]["reviewed"] = reviewed
+
+        for g in graders.values():
+            g["per_hour"] = round(g["reviewed"] / hours, 2)
+
+        return {
+            "unclaimed": depth[0],
+            "leased": depth[1],
+            "reviewed": depth[2],
+            "graders": sorted(graders.values(), key=lambda g: -g["reviewed"]),
+        }
+
+    finally:
+        if close_db:
+            db.close()
+
+
+# ==============================
+# 💾 Grade persistence
+# ==============================
+def upsert_grade_rows(db, grade_rows: list[dict]):
+    """
+    Insert or update SubjectiveGrade rows with one multi-row
+    INSERT ... ON CONFLICT (student_id, subject_id, question_id) DO UPDATE.
+    Caller owns the transaction.
+    """
+    if not grade_rows:
+        return
+
+    # Postgres rejects a key appearing twice in one upsert → last one wins
+    grade_rows = list({
+        (r["student_id"], r["subject_id"], r["question_id"]): r
+        for r in grade_rows
+    }.values())
+
+    insert = dialect_insert(db.get_bind())
+    stmt = insert(SubjectiveGrade).values(grade_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id", "subject_id", "question_id"],
+        set_={
+            "score": stmt.excluded.score,
+            "feedback": stmt.excluded.feedback,
+        },
+    )
+    db.execute(stmt)
+
+
+def save_grade_sheets(sheets: list[dict], reviewed_by: str | None = None, db=None) -> dict:
+    """
+    Persist a batch of grade sheets in one transaction.
+
+    sheet = {
+        "progress_id": int,
+        "grades": [{"question_id": int | None, "score": int, "feedback": str | None}],
+        "max_score": int,
+        "lease_token": str | None,   # required while another grader holds a lease
+    }
+
+    - SubjectiveGrade rows: one multi-row upsert on
+      (student_id, subject_id, question_id)
+    - StudentProgress score / review_status: one bulk UPDATE by id
+    - TestResult: inserted for attempts that have none yet
+
+    Already reviewed or locked submissions are skipped, and so are
+    submissions leased to someone else (token mismatch or no token while
+    another grader's lease is active). Rows are read FOR UPDATE so the
+    check and the write happen under the same lock on Postgres.
+    Returns {"graded": [progress_id, ...], "skipped": [progress_id, ...]}
+    """
+    if not sheets:
+        return {"graded": [], "skipped": []}
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        sheet_by_id = {int(s["progress_id"]): s for s in sheets}
+
+        progress_rows = (
+            db.query(
+                StudentProgress.id,
+                StudentProgress.student_id,
+                StudentProgress.subject_id,
+                StudentProgress.class_id,
+                StudentProgress.school_id,
+                StudentProgress.review_status,
+                StudentProgress.locked,
+                StudentProgress.lease_token,
+                StudentProgress.lease_expires_at,
+            )
+            .filter(StudentProgress.id.in_(sheet_by_id.keys()))
+            .with_for_update()
+            .all()
+        )
+
+        graded, skipped = [], []
+        grade_rows, progress_updates, results = [], [], []
+        now = datetime.utcnow()
+
+        for p in progress_rows:
+
+            # 🔒 finalized submissions are never re-graded here
+            if p.locked or p.review_status == "reviewed":
+                skipped.append(p.id)
+                continue
+
+            sheet = sheet_by_id[p.id]
+
+            # 🔒 lease guard
+            lease_held = (
+                p.lease_token is not None
+                and p.lease_expires_at is not None
+                and _naive(p.lease_expires_at) > now
+            )
+
+            if lease_held and sheet.get("lease_token") != p.lease_token:
+                skipped.append(p.id)
+                continue
+            grades = sheet.get("grades") or []
+
+            total_score = sum(int(g["score"]) for g in grades)
+            max_score = int(sheet.get("max_score") or 0)
+            percent = (total_score / max_score) * 100 if max_score else 0.0
+
+            for g in grades:
+                if g.get("question_id") is None:
+                    continue
+
+                grade_rows.append({
+                    "student_id": p.student_id,
+                    "subject_id": p.subject_id,
+                    "school_id": p.school_id,
+                    "question_id": int(g["question_id"]),
+                    "score": int(g["score"]),
+                    "feedback": g.get("feedback"),
+                })
+
+            progress_updates.append({
+                "id": p.id,
+                "score": total_score,
+                "review_status": "reviewed",
+                "reviewed_at": now,
+                "reviewed_by": reviewed_by,
+                "locked": True,
+                "lease_owner": None,
+                "lease_token": None,
+                "lease_expires_at": None,
+            })
+
+            results.append({
+                "progress_id": p.id,
+                "student_id": p.student_id,
+                "class_id": p.class_id,
+                "subject_id": p.subject_id,
+                "school_id": p.school_id,
+                "score": total_score,
+                "total": max_score,
+                "percentage": percent,
+                "taken_at": now,
+            })
+
+            graded.append(p.id)
+
+        skipped.extend(pid for pid in sheet_by_id if pid not in graded and pid not in skipped)
+
+        upsert_grade_rows(db, grade_rows)
+
+        if progress_updates:
+            db.execute(update(StudentProgress), progress_updates)
+
+        if results:
+            # one result per attempt (same key as finalize_attempts / regrade)
+            existing = set(
+                db.execute(
+                    select(TestResult.progress_id).where(
+                        TestResult.progress_id.in_([r["progress_id"] for r in results])
+                    )
+                ).scalars()
+            )
+
+            new_results = [r for r in results if r["progress_id"] not in existing]
+
+            if new_results:
+                db.execute(sql_insert(TestResult), new_results)
+                record_performance(db, new_results)
+                record_rollups(db, new_results, "subjective")
+
+        db.commit()
+
+        return {"graded": graded, "skipped": skipped}
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in save_grade_sheets: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def save_grade_sheet(
+    progress_id: int,
+    grades: list[dict],
+    max_score: int,
+    reviewed_by: str | None = None,
+    lease_token: str | None = None,
+    db=None
+) -> bool:
+    """Grade a single submission. Returns False if it was finalized or leased elsewhere."""
+    result = save_grade_sheets(
+        [{
+            "progress_id": progress_id,
+            "grades": grades,
+            "max_score": max_score,
+            "lease_token": lease_token,
+        }],
+        reviewed_by=reviewed_by,
+        db=db,
+    )
+
+    return progress_id in result["graded"]
@@ -1,5 +1,6 @@
 import streamlit as st
 from backend.database import get_session
+from backend.exam_papers import get_or_create_exam_paper
 
 # -----------------------------------------------------
 # Add a new subjective question
@@ -140,27 +141,37 @@ def submit_subjective_answer(
 
 def grade_subjective_answer(school_id, answer_id, teacher_id, score, comment=""):
     """Teacher grades a student's subjective answer."""
-    from models import SubjectiveGrade
+    from backend.models import StudentAnswer, StudentProgress
+    from backend.grading import upsert_grade_rows
 
     db = get_session()
     try:
-        grade = SubjectiveGrade(
-            school_id=school_id,
-            answer_id=answer_id,
-            teacher_id=teacher_id,
-            score=score,
-            comment=comment,
-            graded_on=datetime.utcnow(),
+        row = (
+            db.query(
+                StudentAnswer.question_id,
+                StudentProgress.student_id,
+                StudentProgress.subject_id,
+            )
+            .join(StudentProgress, StudentProgress.id == StudentAnswer.progress_id)
+            .filter(
+                StudentAnswer.id == answer_id,
+                StudentProgress.school_id == school_id,
+            )
+            .first()
         )
-        db.add(grade)
-        db.commit()
 
-        # Optional: update answer status
-        from models import SubjectiveAnswer
-        ans = db.query(SubjectiveAnswer).filter_by(id=answer_id).first()
-        if ans:
-            ans.status = "Graded"
-            db.commit()
+        if not row:
+            return False, "❌ Answer not found."
+
+        upsert_grade_rows(db, [{
+            "student_id": row.student_id,
+            "subject_id": row.subject_id,
+            "school_id": school_id,
+            "question_id": row.question_id,
+            "score": int(score),
+            "feedback": comment or None,
+        }])
+        db.commit()
 
         return True, "✅ Answer graded successfully."
     except Exception as e:
@@ -424,42 +435,24 @@ def handle_subjective_submission(
             return "already_submitted"
 
         # ---------------------------------
-        # Normalize question IDs
+        # Question set → exam paper (attempts started before papers existed)
         # ---------------------------------
-        question_ids = []
-
-        for q in questions:
-
-            # SQLAlchemy object
-            if hasattr(q, "id"):
-                question_ids.append(q.id)
-
-            # dictionary question
-            elif isinstance(q, dict):
-                qid = q.get("id")
-
-                if qid is not None:
-                    question_ids.append(qid)
+        if progress.paper_id is None and questions:
+            progress.paper_id = get_or_create_exam_paper(
+                questions,
+                school_id=school_id,
+                class_id=progress.class_id,
+                subject_id=subject_id,
+                test_type="subjective",
+                db=db
+            )
 
-            # raw numeric/string id
-            else:
-                try:
-                    question_ids.append(int(q))
-                except:
-                    pass
         # ---------------------------------
-        # Save answers
+        # Submit (same path as every other submit)
         # ---------------------------------
-        progress.answers = list(answers)
-        progress.questions = question_ids
-        progress.submitted = True
-        progress.review_status = "pending"
-        progress.reviewed_at = None
-        progress.score = None
-
-        db.commit()
+        result = finalize_attempt(progress.id, answers=list(answers), questions=questions or None, db=db)
 
-        return "submitted"
+        return "submitted" if result is not None else "already_submitted"
 
     except Exception:
         db.rollback()
@@ -817,8 +810,45 @@ def assert_db_alive():
 
 
 
-from backend.db_helpers import save_progress
-from backend.db_helpers import calculate_score_db
+from backend.answer_sheet import build_answer_payload
+from backend.attempts import finalize_attempt
+from backend.shuffle import unshuffle_attempt
+
+
+def current_answer_payload():
+    """
+    (answers, answer_sheet) for the running attempt, mapped back from the
+    shuffled view to canonical paper order.
+    """
+    questions, answers = unshuffle_attempt(
+        st.session_state.questions,
+        st.session_state.answers,
+        st.session_state.get("shuffle_seed"),
+        st.session_state.get("attempt_id"),
+    )
+    return build_answer_payload(st.session_state.test_type, questions, answers)
+
+
+def finalize_current_attempt(reason=None):
+    """
+    Grade and submit the running attempt (backend.attempts) with what is
+    on screen, mapped back to canonical paper order.
+    Returns the graded result, or None if it was already submitted.
+    """
+    progress_id = st.session_state.get("attempt_id")
+    if progress_id is None:
+        return None
+
+    questions, answers = unshuffle_attempt(
+        st.session_state.questions,
+        st.session_state.answers,
+        st.session_state.get("shuffle_seed"),
+        progress_id,
+    )
+
+    return finalize_attempt(progress_id, reason=reason, answers=answers, questions=questions)
+
+
 def force_submit_test(reason="Violation detected"):
     """
     Force-submit the current test session.
@@ -831,29 +861,8 @@ def force_submit_test(reason="Violation detected"):
     st.session_state.auto_submitted = True
     st.session_state.auto_submit_reason = reason
 
-    # 🔹 Calculate score
-    correct, wrong, details = calculate_score_db(
-        st.session_state.student_name,
-        st.session_state.selected_subject,
-        st.session_state.questions,
-        st.session_state.answers
-    )
-
-    # 🔹 Save progress to DB
-    save_progress(
-        access_code=st.session_state.access_code,
-        subject_id=st.session_state.selected_subject_id,
-        class_id=st.session_state.class_id,
-        answers=st.session_state.answers,
-        current_q=st.session_state.current_q if "current_q" in st.session_state else 0,
-        start_time=st.session_state.start_time if "start_time" in st.session_state else None,
-        duration=st.session_state.duration if "duration" in st.session_state else 0,
-        questions=st.session_state.questions,
-        school_id=st.session_state.school_id,
-        test_type=st.session_state.test_type,
-        student_id=st.session_state.student_id,
-        submitted=True
-    )
+    # 🔹 Grade + finalize in one transaction
+    finalize_current_attempt(reason=reason)
 
     st.error(f"🚫 Test auto-submitted: {reason}")
     st.stop()
@@ -0,0 +1,263 @@
+# ==============================
+# backend/item_analysis.py
+# Item analysis for objective exam papers
+# ==============================
+"""
+Per-question quality statistics for an exam paper:
+
+- p-value (difficulty): share of attempts answering correctly
+- point-biserial: correlation between the item and the total score
+- distractors: how often each option (and no answer) was chosen
+- KR-20: internal-consistency reliability of the whole paper
+
+Everything is derived from a few running sums per paper, so the stats
+are cached per paper and only newly submitted attempts are read on the
+next call. Attempts are streamed from the database in chunks and each
+chunk is graded with the batch grader.
+"""
+import threading
+from datetime import timedelta
+
+import numpy as np
+from sqlalchemy import select
+
+from backend.answer_sheet import UNANSWERED, encode_answer_sheet, parse_options
+from backend.batch_grader import grade_matrix, key_vector, sheet_matrix
+from backend.database import get_session
+from backend.exam_papers import get_exam_paper
+from backend.models import StudentAnswer, StudentProgress
+
+
+CHUNK_SIZE = 2000
+
+# reviewed_at is stamped in Python before commit, so a submit can become
+# visible after later-stamped ones; rows this far behind the watermark
+# are re-read and counted unless already seen
+SAFETY_WINDOW = timedelta(minutes=5)
+
+# paper_id → running sums (see _empty_stats)
+_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+# ==============================
+# ➕ Running sums
+# ==============================
+def _option_columns(paper: dict) -> int:
+    """Distractor table width: the paper's largest option count."""
+    return max(
+        (len(parse_options(q.get("options"))) for q in paper["questions"]),
+        default=0,
+    )
+
+
+def _empty_stats(paper: dict) -> dict:
+    k = len(paper["questions"])
+    width = _option_columns(paper)
+    return {
+        "answer_key_hash": paper["answer_key_hash"],
+        "watermark": None,                      # latest reviewed_at read
+        "recent": {},                           # id → reviewed_at of attempts read inside the window
+        "n": 0,
+        "sum_total": 0,
+        "sum_total_sq": 0,
+        "correct": np.zeros(k, dtype=np.int64),         # Σ x_i
+        "correct_total": np.zeros(k, dtype=np.int64),   # Σ x_i · total
+        "options": np.zeros((k, width + 1), dtype=np.int64),  # last column = unanswered
+    }
+
+
+def _accumulate(stats: dict, matrix: np.ndarray, keys: np.ndarray):
+    graded = grade_matrix(matrix, keys)
+
+    correct = graded["correct"]
+    totals = graded["scores"].astype(np.int64)
+
+    stats["n"] += matrix.shape[0]
+    stats["sum_total"] += int(totals.sum())
+    stats["sum_total_sq"] += int((totals ** 2).sum())
+    stats["correct"] += correct.sum(axis=0)
+    stats["correct_total"] += totals @ correct
+
+    # distractor counts: option index per cell, unanswered → last column
+    width = stats["options"].shape[1] - 1
+    answered = matrix != UNANSWERED
+
+    if (matrix[answered] >= width).any():
+        raise ValueError(f"Answer sheet option index out of range (paper has {width} options)")
+
+    chosen = np.where(answered, matrix, width).astype(np.int64)
+    k = matrix.shape[1]
+    flat = chosen + np.arange(k, dtype=np.int64) * (width + 1)
+    stats["options"] += np.bincount(
+        flat.ravel(), minlength=k * (width + 1)
+    ).reshape(k, width + 1)
+
+
+def _legacy_sheets(db, progress_ids: list[int], questions: list[dict]) -> dict:
+    """Sheets rebuilt from StudentAnswer for attempts saved without one."""
+    answers = {}
+
+    for pid, qid, answer in db.execute(
+        select(StudentAnswer.progress_id, StudentAnswer.question_id, StudentAnswer.answer)
+        .where(StudentAnswer.progress_id.in_(progress_ids))
+    ):
+        answers.setdefault(pid, {})[qid] = answer
+
+    return {
+        pid: encode_answer_sheet([by_q.get(q["id"]) or "" for q in questions], questions)
+        for pid, by_q in answers.items()
+    }
+
+
+def _read_new_attempts(db, paper: dict, stats: dict):
+    """Stream attempts submitted after the watermark into the running sums."""
+    questions = paper["questions"]
+    keys = key_vector(questions)
+
+    stmt = (
+        select(StudentProgress.id, StudentProgress.answer_sheet, StudentProgress.reviewed_at)
+        .where(
+            StudentProgress.paper_id == paper["id"],
+            StudentProgress.submitted.is_(True),
+            StudentProgress.reviewed_at.isnot(None),
+        )
+        .order_by(StudentProgress.reviewed_at, StudentProgress.id)
+        .execution_options(yield_per=CHUNK_SIZE)
+    )
+
+    if stats["watermark"] is not None:
+        stmt = stmt.where(StudentProgress.reviewed_at >= stats["watermark"] - SAFETY_WINDOW)
+
+    recent = stats["recent"]
+
+    for rows in db.execute(stmt).partitions():
+        rows = [r for r in rows if r.id not in recent]
+        if not rows:
+            continue
+
+        missing = [r.id for r in rows if r.answer_sheet is None]
+        rebuilt = _legacy_sheets(db, missing, questions) if missing else {}
+
+        sheets = [
+            r.answer_sheet if r.answer_sheet is not None else rebuilt.get(r.id)
+            for r in rows
+        ]
+        sheets = [s for s in sheets if s is not None]
+
+        if sheets:
+            _accumulate(stats, sheet_matrix(sheets, len(questions)), keys)
+
+        recent.update((r.id, r.reviewed_at) for r in rows)
+        stats["watermark"] = max(stats["watermark"] or rows[-1].reviewed_at, rows[-1].reviewed_at)
+
+    if stats["watermark"] is not None:
+        horizon = stats["watermark"] - SAFETY_WINDOW
+        stats["recent"] = {pid: at for pid, at in recent.items() if at >= horizon}
+
+
+# ==============================
+# 📈 Statistics
+# ==============================
+def _summarize(paper: dict, stats: dict) -> dict:
+    questions = paper["questions"]
+    n = stats["n"]
+    k = len(questions)
+
+    result = {
+        "paper_id": paper["id"],
+        "attempts": n,
+        "questions": k,
+        "mean": None,
+        "sd": None,
+        "kr20": None,
+        "items": [],
+    }
+
+    if n == 0:
+        return result
+
+    mean = stats["sum_total"] / n
+    var = max(stats["sum_total_sq"] / n - mean ** 2, 0.0)
+    sd = var ** 0.5
+
+    p = stats["correct"] / n
+    q = 1.0 - p
+
+    # point-biserial = (M1 - M0) / sd · sqrt(p·q), from the running sums
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_right = stats["correct_total"] / stats["correct"]
+        mean_wrong = (stats["sum_total"] - stats["correct_total"]) / (n - stats["correct"])
+        r_pb = (mean_right - mean_wrong) / sd * np.sqrt(p * q)
+
+    r_pb = np.where((p > 0) & (p < 1) & (sd > 0), r_pb, np.nan)
+
+    if k > 1 and var > 0:
+        result["kr20"] = float(k / (k - 1) * (1 - (p * q).sum() / var))
+
+    result["mean"] = mean
+    result["sd"] = sd
+
+    keys = key_vector(questions)
+    freq = stats["options"] / n
+
+    for i, question in enumerate(questions):
+        options = parse_options(question.get("options"))
+
+        result["items"].append({
+            "question_id": question.get("id"),
+            "text": question.get("text", ""),
+            "correct_answer": question.get("correct_answer"),
+            "p_value": float(p[i]),
+            "point_biserial": None if np.isnan(r_pb[i]) else float(r_pb[i]),
+            "options": {
+                opt: float(freq[i, j]) for j, opt in enumerate(options)
+            },
+            "key_index": int(keys[i]),
+            "omitted": float(freq[i, -1]),
+        })
+
+    return result
+
+
+def analyze_paper(paper_id: int, db=None) -> dict | None:
+    """
+    Item analysis of an objective paper (None if the paper does not exist).
+
+    Running sums are cached per paper; each call only reads attempts
+    submitted since the last one. An answer-key change resets the cache.
+    """
+    paper = get_exam_paper(paper_id)
+    if paper is None or paper["test_type"] != "objective":
+        return None
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        with _STATS_LOCK:
+            stats = _STATS.get(paper_id)
+
+            if stats is None or stats["answer_key_hash"] != paper["answer_key_hash"]:
+                stats = _empty_stats(paper)
+
+            _read_new_attempts(db, paper, stats)
+
+            _STATS[paper_id] = stats
+
+        return _summarize(paper, stats)
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def clear_item_stats(paper_id: int | None = None):
+    """Drop cached running sums (one paper or all)."""
+    with _STATS_LOCK:
+        if paper_id is None:
+            _STATS.clear()
+        else:
+            _STATS.pop(paper_id, None)
@@ -4,9 +4,10 @@
 # ================================================
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Boolean, Float, DateTime, Text, JSON,
-    ForeignKey, UniqueConstraint, func
+    Column, Integer, String, Boolean, Float, Date, DateTime, Text, JSON,
+    ForeignKey, LargeBinary, UniqueConstraint, func
 )
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -330,6 +331,9 @@ class TestResult(Base):
     subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
     school_id = Column(Integer, ForeignKey("schools.id"), nullable=False, index=True)
 
+    # attempt this result was graded from (None for results recorded before it existed)
+    progress_id = Column(Integer, ForeignKey("student_progress.id", ondelete="SET NULL"), nullable=True, index=True)
+
     score = Column(Integer, nullable=False)
     total = Column(Integer, nullable=False)
     percentage = Column(Float, nullable=False)
@@ -346,6 +350,80 @@ class TestResult(Base):
 
 
 
+class PerformanceAggregate(Base):
+    """
+    Rolling per-student, per-subject results, updated on every recorded
+    TestResult (backend.performance). Percentages throughout.
+    """
+    __tablename__ = "performance_aggregates"
+
+    __table_args__ = (
+        UniqueConstraint("school_id", "student_id", "subject_id", name="uq_performance_student_subject"),
+        Index("idx_performance_cohort", "school_id", "class_id", "subject_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    school_id = Column(Integer, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    class_id = Column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    best_percentage = Column(Float, nullable=False, default=0)
+    latest_percentage = Column(Float, nullable=False, default=0)
+    moving_average = Column(Float, nullable=False, default=0)   # exponential
+
+    # running sums for the mean and least-squares trend (x = attempt number)
+    sum_percentage = Column(Float, nullable=False, default=0)
+    sum_weighted_percentage = Column(Float, nullable=False, default=0)
+
+    last_taken_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class AnalyticsRollup(Base):
+    """
+    Daily score rollup per (school, class, subject, test type), kept by
+    backend.analytics. Percentages; bucket_N counts scores in
+    [10·N, 10·N + 10), with 100% in bucket_9.
+    """
+    __tablename__ = "analytics_rollups"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "school_id", "class_id", "subject_id", "test_type", "day",
+            name="uq_analytics_rollup"
+        ),
+        Index("idx_analytics_school_day", "school_id", "day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+
+    school_id = Column(Integer, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    class_id = Column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
+    test_type = Column(String(20), nullable=False)
+    day = Column(Date, nullable=False)
+
+    count = Column(Integer, nullable=False, default=0)
+    sum_percentage = Column(Float, nullable=False, default=0)
+    sum_sq_percentage = Column(Float, nullable=False, default=0)
+    min_percentage = Column(Float, nullable=True)
+    max_percentage = Column(Float, nullable=True)
+
+    bucket_0 = Column(Integer, nullable=False, default=0)
+    bucket_1 = Column(Integer, nullable=False, default=0)
+    bucket_2 = Column(Integer, nullable=False, default=0)
+    bucket_3 = Column(Integer, nullable=False, default=0)
+    bucket_4 = Column(Integer, nullable=False, default=0)
+    bucket_5 = Column(Integer, nullable=False, default=0)
+    bucket_6 = Column(Integer, nullable=False, default=0)
+    bucket_7 = Column(Integer, nullable=False, default=0)
+    bucket_8 = Column(Integer, nullable=False, default=0)
+    bucket_9 = Column(Integer, nullable=False, default=0)
+
+
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from datetime import datetime
 
@@ -401,6 +479,15 @@ class StudentProgress(Base):
             "class_id",
             "test_type"
         ),
+        # 📋 Grading queue (keyset pagination by id)
+        Index(
+            "idx_progress_review_queue",
+            "school_id",
+            "test_type",
+            "submitted",
+            "review_status",
+            "id"
+        ),
     )
 
     # -------------------------
@@ -426,6 +513,9 @@ class StudentProgress(Base):
     answers = Column(JSON, nullable=False, default=lambda: [])
     attachments = Column(JSON, nullable=True)
 
+    # objective: one byte per paper question (option index, 255 = unanswered)
+    answer_sheet = Column(LargeBinary, nullable=True)
+
     current_q = Column(Integer, default=0)
 
     # ✅ FIXED (CRITICAL)
@@ -451,6 +541,23 @@ class StudentProgress(Base):
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     reviewed_by = Column(String(100), nullable=True)
 
+    # {question_id: {"score", "marks", "ratio", ...}} from scoring_assist
+    score_suggestions = Column(JSON, nullable=True)
+
+    # Question set served (ExamPaper)
+    paper_id = Column(Integer, ForeignKey("exam_papers.id"), nullable=True, index=True)
+
+    # served order = f(shuffle_seed, id) (backend.shuffle); None = paper order
+    shuffle_seed = Column(Integer, nullable=True)
+
+    # why the attempt was closed without the Submit button (e.g. "time_expired")
+    auto_submit_reason = Column(String(50), nullable=True)
+
+    # Grading lease (one grader at a time per submission)
+    lease_owner = Column(String(100), nullable=True)
+    lease_token = Column(String(36), nullable=True, index=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
     # -------------------------
     # Relationships
     # -------------------------
@@ -459,6 +566,14 @@ class StudentProgress(Base):
     subject = relationship("Subject")
     class_ = relationship("Class")
 
+
+# ⏰ Expired-attempt sweep: submitted = false AND start_time + duration < now
+Index(
+    "idx_progress_expiry",
+    StudentProgress.submitted,
+    StudentProgress.start_time + StudentProgress.duration,
+)
+
  # ================================================
 # CONFIG
 # ================================================
@@ -491,6 +606,9 @@ class TestDuration(Base):
     duration = Column(Integer, nullable=False)  # duration in seconds
     school_id = Column(Integer, ForeignKey("schools.id"), nullable=False)
 
+    # questions drawn per attempt (None = whole bank)
+    draw_count = Column(Integer, nullable=True)
+
     # Relationships
     school = relationship("School", back_populates="durations")  # ✅ ensure School has .durations
     class_ = relationship("Class", back_populates="durations")   # optional but recommended
@@ -542,7 +660,8 @@ class ArchivedProgress(Base):
     test_type = Column(String(20), nullable=False)
 
     answers_snapshot = Column(JSON, nullable=False)
-    questions_snapshot = Column(JSON, nullable=False)
+    questions_snapshot = Column(JSON, nullable=True)  # legacy; new rows use paper_id
+    paper_id = Column(Integer, ForeignKey("exam_papers.id"), nullable=True)
 
     score = Column(Float, nullable=True)
 
@@ -559,6 +678,27 @@ class ArchivedProgress(Base):
     )
 
 
+class ExamPaper(Base):
+    """Immutable, content-addressed question set served to attempts."""
+    __tablename__ = "exam_papers"
+
+    id = Column(Integer, primary_key=True)
+
+    school_id = Column(Integer, ForeignKey("schools.id"), nullable=False)
+    class_id = Column(Integer, ForeignKey("classes.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+    test_type = Column(String(20), nullable=False)
+
+    # sha256 of scope + ordered question snapshot
+    content_hash = Column(String(64), nullable=False, unique=True)
+
+    question_ids = Column(JSON, nullable=False)
+    questions = Column(JSON, nullable=False)  # [{id, text, options, correct_answer}]
+    answer_key_hash = Column(String(64), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 # -----------------------------------------------------
 # 📝 1. Subjective Questions
 # -----------------------------------------------------
@@ -572,11 +712,21 @@ class SubjectiveQuestion(Base, TenantMixin):
 
     question_text = Column(Text, nullable=False)
     marks = Column(Integer, default=10)
+
+    # Optional scoring-assist references
+    model_answer = Column(Text, nullable=True)
+    keywords = Column(JSON, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     subject = relationship("Subject")
 
+    __table_args__ = (
+        # bank scans + id-range sampling
+        Index("idx_subjective_bank", "school_id", "class_id", "subject_id", "id"),
+    )
+
 class SubjectiveGrade(Base, TenantMixin):
     __tablename__ = "subjective_grades"
 
@@ -594,6 +744,17 @@ class SubjectiveGrade(Base, TenantMixin):
     created_at = Column(DateTime(timezone=True),
                         server_default=func.now())
 
+    # 🚀 One grade per student/question → enables bulk upsert
+    __table_args__ = (
+        Index(
+            "uq_subjective_grade_question",
+            "student_id",
+            "subject_id",
+            "question_id",
+            unique=True
+        ),
+    )
+
 
 
 class ObjectiveQuestion(Base, TenantMixin):
@@ -612,6 +773,11 @@ class ObjectiveQuestion(Base, TenantMixin):
     # Relationships
     subject = relationship("Subject")
 
+    __table_args__ = (
+        # bank scans + id-range sampling
+        Index("idx_objective_bank", "school_id", "class_id", "subject_id", "id"),
+    )
+
 
 
 
@@ -639,6 +805,45 @@ class StudentAnswer(Base):
 
 
 
+class AttemptQuestion(Base):
+    """Questions served in an attempt (question-usage index)."""
+    __tablename__ = "attempt_questions"
+
+    id = Column(Integer, primary_key=True)
+
+    progress_id = Column(
+        Integer,
+        ForeignKey("student_progress.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    question_id = Column(Integer, nullable=False)
+    test_type = Column(String(20), nullable=False)
+    school_id = Column(Integer, ForeignKey("schools.id"), nullable=False)
+
+    # mirrors StudentProgress.submitted
+    submitted = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("progress_id", "question_id", name="uq_attempt_question"),
+        # "is this question in use?" → index lookup
+        Index("idx_attempt_question_usage", "question_id", "submitted", "test_type"),
+    )
+
+
+@event.listens_for(StudentProgress, "after_update")
+def _sync_attempt_questions_submitted(mapper, connection, target):
+    """Keep AttemptQuestion.submitted in step with its attempt."""
+    if not inspect(target).attrs.submitted.history.has_changes():
+        return
+
+    connection.execute(
+        AttemptQuestion.__table__.update()
+        .where(AttemptQuestion.progress_id == target.id)
+        .values(submitted=bool(target.submitted))
+    )
+
+
+
 class StudentResult(Base):
     __tablename__ = "student_results"
 
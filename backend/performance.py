@@ -0,0 +1,269 @@
+# ==============================
+# backend/performance.py
+# Rolling per-student performance aggregates
+# ==============================
+"""
+One PerformanceAggregate row per (school, student, subject) holds the
+attempt count, best / latest percentage, an exponential moving average
+and the running sums behind the mean and the least-squares trend.
+
+record_performance() folds new results in with a single upsert whose
+SET clause updates each row from its previous values, so nothing is
+recomputed from TestResult on submit. rebuild_performance() replays
+TestResult from scratch (backfill, regrades, repairs).
+"""
+from datetime import datetime
+
+from sqlalchemy import case, delete, insert
+
+from backend.database import get_session, dialect_insert
+from backend.models import PerformanceAggregate, TestResult
+
+
+# weight of the newest attempt in the moving average
+EMA_ALPHA = 0.3
+
+REBUILD_CHUNK = 5000
+
+
+# ==============================
+# 📐 Derived values
+# ==============================
+def average_percentage(row) -> float | None:
+    return row.sum_percentage / row.attempts if row.attempts else None
+
+
+def trend_slope(row) -> float | None:
+    """
+    Least-squares slope of percentage vs attempt number (points per
+    attempt), from the running sums; None with fewer than two attempts.
+    """
+    n = row.attempts
+    if not n or n < 2:
+        return None
+
+    sum_x = n * (n + 1) / 2
+    sum_xx = n * (n + 1) * (2 * n + 1) / 6
+
+    return (n * row.sum_weighted_percentage - sum_x * row.sum_percentage) / (n * sum_xx - sum_x ** 2)
+
+
+# ==============================
+# ➕ Incremental update
+# ==============================
+def record_performance(db, results: list[dict]):
+    """
+    Fold new results into the aggregates (caller commits).
+
+    results: dicts with student_id, class_id, subject_id, school_id and
+    percentage, as inserted into TestResult.
+    """
+    if not results:
+        return
+
+    now = datetime.utcnow()
+    agg = PerformanceAggregate
+
+    rows = [
+        {
+            "school_id": r["school_id"],
+            "class_id": r["class_id"],
+            "student_id": r["student_id"],
+            "subject_id": r["subject_id"],
+            "attempts": 1,
+            "best_percentage": float(r["percentage"]),
+            "latest_percentage": float(r["percentage"]),
+            "moving_average": float(r["percentage"]),
+            "sum_percentage": float(r["percentage"]),
+            "sum_weighted_percentage": float(r["percentage"]),
+            "last_taken_at": now,
+        }
+        for r in results
+    ]
+
+    # an upsert may touch each row once: split repeats into later passes
+    passes = []
+    for row in rows:
+        key = (row["school_id"], row["student_id"], row["subject_id"])
+        for batch in passes:
+            if key not in batch:
+                batch[key] = row
+                break
+        else:
+            passes.append({key: row})
+
+    for batch in passes:
+        stmt = dialect_insert(db.get_bind())(agg).values(list(batch.values()))
+        new = stmt.excluded.latest_percentage
+
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["school_id", "student_id", "subject_id"],
+            set_={
+                "class_id": stmt.excluded.class_id,
+                "attempts": agg.attempts + 1,
+                "best_percentage": case((new > agg.best_percentage, new), else_=agg.best_percentage),
+                "latest_percentage": new,
+                "moving_average": agg.moving_average + EMA_ALPHA * (new - agg.moving_average),
+                "sum_percentage": agg.sum_percentage + new,
+                "sum_weighted_percentage": agg.sum_weighted_percentage + (agg.attempts + 1) * new,
+                "last_taken_at": stmt.excluded.last_taken_at,
+                "updated_at": now,
+            },
+        ))
+
+
+# ==============================
+# 🔁 Rebuild
+# ==============================
+def rebuild_performance(school_id: int | None = None, student_ids=None, db=None) -> int:
+    """
+    Recompute aggregates from TestResult (all, one school, or some
+    students). With a caller's db the caller commits, so a rebuild can
+    share its transaction. Returns the number of aggregate rows written.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        clear = delete(PerformanceAggregate)
+        query = db.query(
+            TestResult.school_id,
+            TestResult.class_id,
+            TestResult.student_id,
+            TestResult.subject_id,
+            TestResult.percentage,
+            TestResult.taken_at,
+        )
+
+        if school_id is not None:
+            clear = clear.where(PerformanceAggregate.school_id == school_id)
+            query = query.filter(TestResult.school_id == school_id)
+
+        if student_ids is not None:
+            student_ids = list(student_ids)
+            clear = clear.where(PerformanceAggregate.student_id.in_(student_ids))
+            query = query.filter(TestResult.student_id.in_(student_ids))
+
+        db.execute(clear)
+
+        query = query.order_by(
+            TestResult.school_id,
+            TestResult.student_id,
+            TestResult.subject_id,
+            TestResult.taken_at,
+            TestResult.id,
+        ).yield_per(REBUILD_CHUNK)
+
+        written = 0
+        pending = []
+        current = None
+
+        for r in query:
+            key = (r.school_id, r.student_id, r.subject_id)
+            pct = float(r.percentage or 0)
+
+            if current is None or current["key"] != key:
+                if current is not None:
+                    current.pop("key")
+                    pending.append(current)
+
+                current = {
+                    "key": key,
+                    "school_id": r.school_id,
+                    "student_id": r.student_id,
+                    "subject_id": r.subject_id,
+                    "attempts": 0,
+                    "best_percentage": pct,
+                    "moving_average": pct,
+                    "sum_percentage": 0.0,
+                    "sum_weighted_percentage": 0.0,
+                }
+
+            current["attempts"] += 1
+            n = current["attempts"]
+
+            current["class_id"] = r.class_id
+            current["best_percentage"] = max(current["best_percentage"], pct)
+            current["latest_percentage"] = pct
+            if n > 1:
+                current["moving_average"] += EMA_ALPHA * (pct - current["moving_average"])
+            current["sum_percentage"] += pct
+            current["sum_weighted_percentage"] += n * pct
+            current["last_taken_at"] = r.taken_at
+
+            if len(pending) >= REBUILD_CHUNK:
+                db.execute(insert(PerformanceAggregate), pending)
+                written += len(pending)
+                pending = []
+
+        if current is not None:
+            current.pop("key")
+            pending.append(current)
+
+        if pending:
+            db.execute(insert(PerformanceAggregate), pending)
+            written += len(pending)
+
+        if close_db:
+            db.commit()
+
+        return written
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in rebuild_performance: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
+
+
+# ==============================
+# 🔍 Read
+# ==============================
+def get_student_performance(student_id: int, school_id: int, db=None) -> list:
+    """Aggregate rows of one student (one per subject)."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        return (
+            db.query(PerformanceAggregate)
+            .filter(
+                PerformanceAggregate.student_id == student_id,
+                PerformanceAggregate.school_id == school_id,
+            )
+            .all()
+        )
+
+    finally:
+        if close_db:
+            db.close()
+
+
+def get_cohort_performance(school_id: int, class_id: int | None = None, subject_id: int | None = None, db=None) -> list:
+    """Aggregate rows of a class / subject cohort."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(PerformanceAggregate).filter(PerformanceAggregate.school_id == school_id)
+
+        if class_id is not None:
+            query = query.filter(PerformanceAggregate.class_id == class_id)
+
+        if subject_id is not None:
+            query = query.filter(PerformanceAggregate.subject_id == subject_id)
+
+        return query.all()
+
+    finally:
+        if close_db:
+            db.close()
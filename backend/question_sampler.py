@@ -0,0 +1,167 @@
+# ==============================
+# backend/question_sampler.py
+# Draw N questions from a bank without loading the bank
+# ==============================
+"""
+Question sampling done in the database.
+
+Small banks use ORDER BY random() LIMIT n. Large banks use id-range
+sampling: random points in [min(id), max(id)] are resolved to the next
+existing id of the bank with one indexed seek each (all in a single
+statement), repeated until n distinct ids are found. Either way only the
+chosen rows are fetched, so a session's memory does not grow with the
+bank.
+
+A point resolves to the next id at most SEEK_WINDOW_FACTOR mean id gaps
+past it; points that land further are dropped and redrawn. Without that,
+a question right after a large gap (e.g. a bulk delete) would be drawn
+in proportion to the gap; with it, its weight is capped at a few times
+the average.
+"""
+import math
+
+import numpy as np
+from sqlalchemy import func, select
+
+from backend.database import get_session
+from backend.models import ObjectiveQuestion, SubjectiveQuestion
+
+
+# banks up to this size are sampled with ORDER BY random()
+RANDOM_ORDER_MAX_ROWS = 5000
+
+# seeks per round (SQLite allows 2000 result columns)
+SEEK_BATCH = 500
+MAX_ROUNDS = 8
+
+# longest accepted seek, in mean id gaps of the bank
+SEEK_WINDOW_FACTOR = 4
+
+
+def question_model(test_type: str):
+    return ObjectiveQuestion if test_type == "objective" else SubjectiveQuestion
+
+
+def _bank_filter(model, class_id, subject_id, school_id):
+    return (
+        model.school_id == school_id,
+        model.class_id == class_id,
+        model.subject_id == subject_id,
+    )
+
+
+def sample_question_ids(
+    test_type: str,
+    class_id: int,
+    subject_id: int,
+    school_id: int,
+    n: int,
+    db,
+    rng: np.random.Generator | None = None
+) -> list[int]:
+    """Up to n distinct random question ids from the bank (sorted)."""
+    model = question_model(test_type)
+    bank = _bank_filter(model, class_id, subject_id, school_id)
+
+    # bank size, counted only up to the threshold (never a full scan)
+    total = db.execute(
+        select(func.count()).select_from(
+            select(model.id).where(*bank).limit(RANDOM_ORDER_MAX_ROWS + 1).subquery()
+        )
+    ).scalar()
+
+    if not total:
+        return []
+
+    if total <= n and total <= RANDOM_ORDER_MAX_ROWS:
+        return list(db.execute(select(model.id).where(*bank).order_by(model.id)).scalars())
+
+    if total <= RANDOM_ORDER_MAX_ROWS:
+        ids = db.execute(
+            select(model.id).where(*bank).order_by(func.random()).limit(n)
+        ).scalars()
+        return sorted(ids)
+
+    # -------------------------
+    # Id-range sampling (one statement per round)
+    # -------------------------
+    total, lo, hi = db.execute(
+        select(func.count(model.id), func.min(model.id), func.max(model.id)).where(*bank)
+    ).one()
+
+    if total <= n:
+        return list(db.execute(select(model.id).where(*bank).order_by(model.id)).scalars())
+
+    window = math.ceil(SEEK_WINDOW_FACTOR * (hi - lo + 1) / total)
+
+    rng = rng or np.random.default_rng()
+    chosen = set()
+
+    for _ in range(MAX_ROUNDS):
+        missing = n - len(chosen)
+        if missing <= 0:
+            break
+
+        # oversample: some points land on already-chosen ids
+        points = rng.integers(lo, hi + 1, size=min(SEEK_BATCH, 2 * missing + 8))
+
+        seeks = [
+            select(model.id)
+            .where(*bank, model.id >= int(p), model.id <= int(p) + window)
+            .order_by(model.id)
+            .limit(1)
+            .scalar_subquery()
+            for p in points
+        ]
+
+        row = db.execute(select(*seeks)).one()
+        chosen.update(i for i in row if i is not None)
+
+    if len(chosen) < n:
+        # pathological id layout: top up from the remaining rows
+        extra = db.execute(
+            select(model.id)
+            .where(*bank, model.id.not_in(chosen))
+            .order_by(func.random())
+            .limit(n - len(chosen))
+        ).scalars()
+        chosen.update(extra)
+
+    return sorted(rng.choice(sorted(chosen), size=n, replace=False).tolist())
+
+
+def draw_questions(
+    test_type: str,
+    class_id: int,
+    subject_id: int,
+    school_id: int,
+    n: int | None = None,
+    db=None
+) -> list:
+    """
+    The questions for a new attempt: n random ones, or the whole bank
+    when n is None / 0.
+    """
+    model = question_model(test_type)
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(model)
+
+        if n:
+            ids = sample_question_ids(test_type, class_id, subject_id, school_id, n, db)
+            if not ids:
+                return []
+            query = query.filter(model.id.in_(ids))
+        else:
+            query = query.filter(*_bank_filter(model, class_id, subject_id, school_id))
+
+        return query.order_by(model.id).all()
+
+    finally:
+        if close_db:
+            db.close()
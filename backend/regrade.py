@@ -0,0 +1,358 @@
+# ==============================
+# backend/regrade.py
+# Regrading after answer-key corrections
+# ==============================
+"""
+When a question's correct_answer is fixed, every submitted objective
+attempt that was served it is rescored in bulk:
+
+- attempts with an answer sheet are grouped by exam paper and scored
+  with the batch grader (backend.batch_grader);
+- legacy attempts (no sheet) are scored in SQL over StudentAnswer.
+
+StudentProgress.score, TestResult, Leaderboard, the performance and
+analytics aggregates and the papers' answer keys are updated in one transaction, and a before/after diff is
+returned for the admin report.
+"""
+from sqlalchemy import and_, bindparam, case, func, or_, select, update
+
+from backend.analytics import rebuild_rollups
+from backend.batch_grader import grade_sheets
+from backend.database import get_session
+from backend.exam_papers import correct_paper_keys, get_exam_paper, invalidate_paper_cache
+from backend.performance import rebuild_performance
+from backend.models import (
+    AttemptQuestion,
+    Leaderboard,
+    ObjectiveQuestion,
+    Student,
+    StudentAnswer,
+    StudentProgress,
+    TestResult,
+)
+
+
+# ==============================
+# 🧮 Scoring
+# ==============================
+def _score_legacy(db, progress_ids: list[int]) -> dict:
+    """{progress_id: (score, total)} from StudentAnswer vs the current bank key."""
+    if not progress_ids:
+        return {}
+
+    is_correct = case(
+        (
+            func.lower(func.trim(StudentAnswer.answer))
+            == func.lower(func.trim(ObjectiveQuestion.correct_answer)),
+            1,
+        ),
+        else_=0,
+    )
+
+    rows = (
+        db.query(
+            StudentAnswer.progress_id,
+            func.sum(is_correct),
+            func.count(StudentAnswer.id),
+        )
+        .join(ObjectiveQuestion, ObjectiveQuestion.id == StudentAnswer.question_id)
+        .filter(
+            StudentAnswer.progress_id.in_(progress_ids),
+            func.trim(StudentAnswer.answer) != "",
+        )
+        .group_by(StudentAnswer.progress_id)
+        .all()
+    )
+
+    answered = {pid: (int(score or 0), int(n)) for pid, score, n in rows}
+
+    totals = dict(
+        db.query(StudentAnswer.progress_id, func.count(StudentAnswer.id))
+        .filter(StudentAnswer.progress_id.in_(progress_ids))
+        .group_by(StudentAnswer.progress_id)
+        .all()
+    )
+
+    return {
+        pid: (answered.get(pid, (0, 0))[0], int(totals.get(pid, 0)))
+        for pid in progress_ids
+    }
+
+
+# ==============================
+# 📉 Affected rollups
+# ==============================
+def _rollup_keys(db, school_id: int, diff: list[dict]) -> set:
+    """
+    (class_id, subject_id, day) rollup buckets holding the diffed results.
+    Legacy results (no progress id) are matched by student and subject,
+    which may pull in a few extra buckets; rebuilding those is harmless.
+    """
+    progress_ids = [d["progress_id"] for d in diff]
+
+    rows = (
+        db.query(TestResult.class_id, TestResult.subject_id, TestResult.taken_at)
+        .filter(
+            TestResult.school_id == school_id,
+            or_(
+                TestResult.progress_id.in_(progress_ids),
+                and_(
+                    TestResult.progress_id.is_(None),
+                    TestResult.student_id.in_({d["student_id"] for d in diff}),
+                    TestResult.subject_id.in_({d["subject_id"] for d in diff}),
+                ),
+            ),
+        )
+        .distinct()
+        .all()
+    )
+
+    return {(c, s, taken_at.date()) for c, s, taken_at in rows if taken_at}
+
+
+# ==============================
+# 🔁 Regrade
+# ==============================
+def regrade_questions(
+    question_ids: list[int],
+    school_id: int,
+    new_keys: dict | None = None,
+    dry_run: bool = False,
+    db=None
+) -> dict:
+    """
+    Rescore every submitted objective attempt that contains one of
+    question_ids.
+
+    new_keys: optional {question_id: correct_answer} written to the bank
+    in the same transaction (otherwise the bank is assumed already fixed).
+    dry_run: compute the report without writing anything.
+
+    Returns {"attempts", "changed", "papers", "diff": [
+        {"progress_id", "student_id", "student_name", "subject_id",
+         "before", "after", "total", "percentage"}, ...]}
+    """
+    question_ids = sorted({int(q) for q in question_ids})
+    new_keys = {int(k): v for k, v in (new_keys or {}).items()}
+
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        # -------------------------
+        # Current (corrected) keys
+        # -------------------------
+        bank = (
+            db.query(ObjectiveQuestion)
+            .filter(
+                ObjectiveQuestion.id.in_(question_ids),
+                ObjectiveQuestion.school_id == school_id,
+            )
+            .with_for_update()
+            .all()
+        )
+
+        for q in bank:
+            if q.id in new_keys:
+                q.correct_answer = new_keys[q.id]
+
+        keys = {q.id: q.correct_answer for q in bank}
+        question_ids = list(keys)
+
+        db.flush()
+
+        # -------------------------
+        # Attempts served these questions
+        # -------------------------
+        served = (
+            select(AttemptQuestion.progress_id)
+            .where(
+                AttemptQuestion.question_id.in_(question_ids),
+                AttemptQuestion.test_type == "objective",
+            )
+        )
+        answered = (
+            select(StudentAnswer.progress_id)
+            .where(StudentAnswer.question_id.in_(question_ids))
+        )
+
+        touched = (
+            db.query(StudentProgress)
+            .filter(
+                StudentProgress.school_id == school_id,
+                StudentProgress.test_type == "objective",
+                or_(
+                    StudentProgress.id.in_(served),
+                    StudentProgress.id.in_(answered),
+                ),
+            )
+            .with_for_update(of=StudentProgress)
+            .all()
+        )
+
+        # papers of every touched attempt, finished or not
+        paper_ids = {p.paper_id for p in touched if p.paper_id}
+        attempts = [p for p in touched if p.submitted]
+
+        # -------------------------
+        # Rescore
+        # -------------------------
+        new_scores = {}  # progress_id → (score, total)
+
+        by_paper = {}
+        legacy = []
+        for p in attempts:
+            if p.paper_id and p.answer_sheet is not None:
+                by_paper.setdefault(p.paper_id, []).append(p)
+            else:
+                legacy.append(p.id)
+
+        for paper_id, group in by_paper.items():
+            paper = get_exam_paper(paper_id)
+            if paper is None:
+                legacy.extend(p.id for p in group)
+                continue
+
+            questions = paper["questions"]
+            for q in questions:
+                if q.get("id") in keys:
+                    q["correct_answer"] = keys[q["id"]]
+
+            graded = grade_sheets(questions, [p.answer_sheet for p in group])
+
+            for p, score in zip(group, graded["scores"]):
+                new_scores[p.id] = (int(score), len(questions))
+
+        new_scores.update(_score_legacy(db, legacy))
+
+        # -------------------------
+        # Diff
+        # -------------------------
+        names = dict(
+            db.query(Student.id, Student.name)
+            .filter(Student.id.in_({p.student_id for p in attempts}))
+            .all()
+        )
+
+        diff = []
+        for p in attempts:
+            after, total = new_scores[p.id]
+            before = int(p.score or 0)
+
+            if after == before:
+                continue
+
+            diff.append({
+                "progress_id": p.id,
+                "student_id": p.student_id,
+                "student_name": names.get(p.student_id, ""),
+                "subject_id": p.subject_id,
+                "class_id": p.class_id,
+                "before": before,
+                "after": after,
+                "total": total,
+                "percentage": (after / total * 100) if total else 0,
+            })
+
+        report = {
+            "attempts": len(attempts),
+            "changed": len(diff),
+            "papers": len(paper_ids),
+            "diff": diff,
+        }
+
+        if dry_run:
+            db.rollback()
+            return report
+
+        # -------------------------
+        # Write (one transaction)
+        # -------------------------
+        report["papers"] = correct_paper_keys(db, paper_ids, keys)
+
+        if diff:
+            db.execute(
+                update(StudentProgress),
+                [{"id": d["progress_id"], "score": d["after"]} for d in diff],
+            )
+
+            results = TestResult.__table__
+
+            # results recorded by finalize_attempts carry the progress id
+            db.connection().execute(
+                update(results)
+                .where(results.c.progress_id == bindparam("b_progress_id"))
+                .values(score=bindparam("b_after"), percentage=bindparam("b_percentage")),
+                [
+                    {"b_progress_id": d["progress_id"], "b_after": d["after"], "b_percentage": d["percentage"]}
+                    for d in diff
+                ],
+            )
+
+            # older results: same student/subject with the old score
+            db.connection().execute(
+                update(results)
+                .where(
+                    results.c.progress_id.is_(None),
+                    results.c.student_id == bindparam("b_student_id"),
+                    results.c.subject_id == bindparam("b_subject_id"),
+                    results.c.school_id == school_id,
+                    results.c.score == bindparam("b_before"),
+                )
+                .values(score=bindparam("b_after"), percentage=bindparam("b_percentage")),
+                [
+                    {
+                        "b_student_id": d["student_id"],
+                        "b_subject_id": d["subject_id"],
+                        "b_before": d["before"],
+                        "b_after": d["after"],
+                        "b_percentage": d["percentage"],
+                    }
+                    for d in diff
+                ],
+            )
+
+            # leaderboard holds accumulated points per student
+            deltas = {}
+            for d in diff:
+                key = (d["student_id"], d["class_id"])
+                deltas[key] = deltas.get(key, 0) + d["after"] - d["before"]
+
+            deltas = {k: v for k, v in deltas.items() if v}
+
+        if diff and deltas:
+            board = Leaderboard.__table__
+            db.connection().execute(
+                update(board)
+                .where(
+                    board.c.student_id == bindparam("b_student_id"),
+                    board.c.class_id == bindparam("b_class_id"),
+                    board.c.school_id == school_id,
+                )
+                .values(score=board.c.score + bindparam("b_delta")),
+                [
+                    {"b_student_id": sid, "b_class_id": cid, "b_delta": delta}
+                    for (sid, cid), delta in deltas.items()
+                ],
+            )
+
+        if diff:
+            rebuild_performance(school_id, student_ids={d["student_id"] for d in diff}, db=db)
+            rebuild_rollups(school_id, db=db, keys=_rollup_keys(db, school_id, diff))
+
+        db.commit()
+
+        invalidate_paper_cache()
+
+        return report
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in regrade_questions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
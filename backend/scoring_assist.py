@@ -0,0 +1,308 @@
+# ==============================
+# backend/scoring_assist.py
+# Suggested scores for subjective answers
+# ==============================
+"""
+Offline scoring assist.
+
+Each answer is compared with its question's optional model answer
+(TF-IDF cosine similarity) and keyword list (fraction of keywords
+present). The result is a suggested score out of the question's marks,
+stored on StudentProgress.score_suggestions for the grading UI.
+
+Everything runs in-process with dense NumPy arrays, a chunk of answers
+at a time, so memory stays bounded on large batches.
+"""
+import math
+import re
+
+import numpy as np
+from sqlalchemy import or_, update
+
+from backend.database import get_session
+from backend.models import StudentProgress, StudentAnswer, SubjectiveQuestion
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+SIMILARITY_WEIGHT = 0.6
+KEYWORD_WEIGHT = 0.4
+
+CHUNK_SIZE = 512
+
+
+# ==============================
+# 🔧 Text helpers
+# ==============================
+def tokenize(text) -> list[str]:
+    if not text:
+        return []
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def normalize_keywords(keywords) -> list[tuple[str, ...]]:
+    """
+    Accept a list or a comma-separated string.
+    Multi-word keywords match when all of their words are present.
+    """
+    if not keywords:
+        return []
+
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+
+    normalized = []
+    for kw in keywords:
+        tokens = tuple(tokenize(kw))
+        if tokens and tokens not in normalized:
+            normalized.append(tokens)
+
+    return normalized
+
+
+# ==============================
+# ⚙️ Scoring engine
+# ==============================
+def suggest_scores(answers, model_answers, keywords, marks) -> dict:
+    """
+    Score a batch of answers.
+
+    answers, model_answers, keywords, marks: parallel sequences
+    (model answer / keywords may be None per item).
+
+    Returns NumPy arrays: similarity, coverage, ratio, score
+    (ratio is NaN where the question has neither model answer nor keywords).
+    """
+    n = len(answers)
+
+    similarity = np.full(n, np.nan, dtype=np.float32)
+    coverage = np.full(n, np.nan, dtype=np.float32)
+
+    if n == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return {"similarity": empty, "coverage": empty, "ratio": empty, "score": empty}
+
+    answer_tokens = [tokenize(a) for a in answers]
+
+    # -------------------------
+    # Vocabulary + document frequency
+    # (answers + each distinct model answer once)
+    # -------------------------
+    model_index = {}
+    model_tokens = []
+    row_model = np.full(n, -1, dtype=np.int64)
+
+    for i, model in enumerate(model_answers):
+        if not model:
+            continue
+        if model not in model_index:
+            model_index[model] = len(model_tokens)
+            model_tokens.append(tokenize(model))
+        row_model[i] = model_index[model]
+
+    vocab = {}
+    doc_freq = []
+
+    for tokens in answer_tokens + model_tokens:
+        for tok in set(tokens):
+            idx = vocab.get(tok)
+            if idx is None:
+                vocab[tok] = len(doc_freq)
+                doc_freq.append(1)
+            else:
+                doc_freq[idx] += 1
+
+    n_docs = len(answer_tokens) + len(model_tokens)
+    idf = (
+        np.log((1.0 + n_docs) / (1.0 + np.asarray(doc_freq, dtype=np.float32))) + 1.0
+    ).astype(np.float32)
+
+    answer_ids = [np.fromiter((vocab[t] for t in toks), dtype=np.int64, count=len(toks)) for toks in answer_tokens]
+    model_ids = [np.fromiter((vocab[t] for t in toks), dtype=np.int64, count=len(toks)) for toks in model_tokens]
+
+    # -------------------------
+    # Cosine similarity, chunk by chunk
+    # -------------------------
+    with_model = np.flatnonzero(row_model >= 0)
+
+    for start in range(0, len(with_model), CHUNK_SIZE):
+        rows = with_model[start:start + CHUNK_SIZE]
+
+        a_ids = [answer_ids[r] for r in rows]
+        m_ids = [model_ids[row_model[r]] for r in rows]
+
+        # only the columns this chunk uses → small dense matrices
+        cols = np.unique(np.concatenate(a_ids + m_ids + [np.zeros(0, dtype=np.int64)]))
+
+        if cols.size == 0:
+            similarity[rows] = 0.0
+            continue
+
+        A = np.zeros((len(rows), cols.size), dtype=np.float32)
+        M = np.zeros((len(rows), cols.size), dtype=np.float32)
+
+        a_rows = np.repeat(np.arange(len(rows)), [len(x) for x in a_ids])
+        m_rows = np.repeat(np.arange(len(rows)), [len(x) for x in m_ids])
+
+        if a_rows.size:
+            np.add.at(A, (a_rows, np.searchsorted(cols, np.concatenate(a_ids))), 1.0)
+        if m_rows.size:
+            np.add.at(M, (m_rows, np.searchsorted(cols, np.concatenate(m_ids))), 1.0)
+
+        # sublinear tf * idf
+        col_idf = idf[cols]
+        np.log1p(A, out=A)
+        np.log1p(M, out=M)
+        A *= col_idf
+        M *= col_idf
+
+        dot = np.einsum("ij,ij->i", A, M)
+        norms = np.linalg.norm(A, axis=1) * np.linalg.norm(M, axis=1)
+
+        similarity[rows] = np.divide(
+            dot, norms, out=np.zeros_like(dot), where=norms > 0
+        )
+
+    # -------------------------
+    # Keyword coverage
+    # -------------------------
+    for i, kws in enumerate(keywords):
+        kws = normalize_keywords(kws)
+        if not kws:
+            continue
+
+        present = set(answer_tokens[i])
+        hits = sum(1 for kw in kws if present.issuperset(kw))
+        coverage[i] = hits / len(kws)
+
+    # -------------------------
+    # Combine → ratio of marks
+    # -------------------------
+    has_sim = ~np.isnan(similarity)
+    has_cov = ~np.isnan(coverage)
+
+    ratio = np.full(n, np.nan, dtype=np.float32)
+
+    both = has_sim & has_cov
+    ratio[both] = SIMILARITY_WEIGHT * similarity[both] + KEYWORD_WEIGHT * coverage[both]
+    ratio[has_sim & ~has_cov] = similarity[has_sim & ~has_cov]
+    ratio[~has_sim & has_cov] = coverage[~has_sim & has_cov]
+
+    np.clip(ratio, 0.0, 1.0, out=ratio)
+
+    marks_arr = np.asarray([m or 0 for m in marks], dtype=np.float32)
+    score = np.round(ratio * marks_arr * 2) / 2  # nearest half mark
+
+    return {
+        "similarity": similarity,
+        "coverage": coverage,
+        "ratio": ratio,
+        "score": score,
+    }
+
+
+def _as_float(value):
+    return None if value is None or math.isnan(value) else round(float(value), 3)
+
+
+# ==============================
+# 💾 Batch precompute
+# ==============================
+def precompute_suggestions(
+    school_id: int,
+    progress_ids: list[int] | None = None,
+    only_missing: bool = True,
+    batch_size: int = 500,
+    db=None
+) -> int:
+    """
+    Compute and store suggestions for submitted, pending subjective attempts.
+
+    Stored as StudentProgress.score_suggestions:
+        {"<question_id>": {"score", "marks", "ratio", "similarity", "coverage"}}
+
+    Returns the number of submissions updated.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        query = db.query(StudentProgress.id).filter(
+            StudentProgress.school_id == school_id,
+            StudentProgress.test_type == "subjective",
+            StudentProgress.submitted == True,
+            or_(
+                StudentProgress.review_status.is_(None),
+                StudentProgress.review_status == "pending",
+            ),
+        )
+
+        if progress_ids is not None:
+            query = query.filter(StudentProgress.id.in_(progress_ids))
+
+        if only_missing:
+            query = query.filter(StudentProgress.score_suggestions.is_(None))
+
+        ids = [r.id for r in query.order_by(StudentProgress.id).all()]
+
+        updated = 0
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+
+            rows = (
+                db.query(
+                    StudentAnswer.progress_id,
+                    StudentAnswer.question_id,
+                    StudentAnswer.answer,
+                    SubjectiveQuestion.model_answer,
+                    SubjectiveQuestion.keywords,
+                    SubjectiveQuestion.marks,
+                )
+                .join(SubjectiveQuestion, SubjectiveQuestion.id == StudentAnswer.question_id)
+                .filter(StudentAnswer.progress_id.in_(batch))
+                .all()
+            )
+
+            result = suggest_scores(
+                [r.answer for r in rows],
+                [r.model_answer for r in rows],
+                [r.keywords for r in rows],
+                [r.marks for r in rows],
+            )
+
+            suggestions = {pid: {} for pid in batch}
+
+            for i, r in enumerate(rows):
+                ratio = _as_float(result["ratio"][i])
+                if ratio is None:
+                    continue
+
+                suggestions[r.progress_id][str(r.question_id)] = {
+                    "score": float(result["score"][i]),
+                    "marks": r.marks,
+                    "ratio": ratio,
+                    "similarity": _as_float(result["similarity"][i]),
+                    "coverage": _as_float(result["coverage"][i]),
+                }
+
+            db.execute(
+                update(StudentProgress),
+                [{"id": pid, "score_suggestions": s} for pid, s in suggestions.items()],
+            )
+            db.commit()
+
+            updated += len(batch)
+
+        return updated
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error in precompute_suggestions: {e}")
+        raise
+
+    finally:
+        if close_db:
+            db.close()
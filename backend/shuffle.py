@@ -0,0 +1,120 @@
+# ==============================
+# backend/shuffle.py
+# Deterministic per-attempt question / option shuffling
+# ==============================
+"""
+Question order and option order are derived from (shuffle_seed,
+attempt id) with NumPy's seeded generator, so an attempt stores only its
+seed: the same permutation is rebuilt on resume and when grading.
+
+Everything persisted (exam paper, answer sheet, answer rows) stays in
+canonical paper order; only the served view is shuffled.
+"""
+import secrets
+
+import numpy as np
+
+from backend.answer_sheet import parse_options
+
+
+def new_shuffle_seed() -> int:
+    return secrets.randbits(31)
+
+
+# ==============================
+# 🎲 Permutations
+# ==============================
+def shuffle_plan(seed: int, attempt_id: int, option_counts) -> tuple[np.ndarray, list[np.ndarray]]:
+    """
+    question_order: served position → canonical question index
+    option_orders[c]: served option position → canonical option index,
+                      for canonical question c
+
+    Option orders come from one argsort over a padded key matrix
+    (padding sorts last), not a Python loop per question.
+    """
+    counts = np.asarray(option_counts, dtype=np.int64)
+    n = counts.size
+
+    rng = np.random.default_rng([int(seed), int(attempt_id)])
+
+    question_order = rng.permutation(n)
+
+    width = int(counts.max()) if n else 0
+    keys = rng.random((n, width))
+    keys[np.arange(width)[None, :] >= counts[:, None]] = np.inf
+
+    order_matrix = np.argsort(keys, axis=1, kind="stable")
+    option_orders = [order_matrix[c, :counts[c]] for c in range(n)]
+
+    return question_order, option_orders
+
+
+def _option_count(q) -> int:
+    return len(parse_options(q.get("options"))) if q.get("options") else 0
+
+
+# ==============================
+# 🔀 Served view ↔ canonical
+# ==============================
+def shuffle_questions(questions: list[dict], seed: int | None, attempt_id: int) -> list[dict]:
+    """Canonical paper questions → the order (and option order) a student sees."""
+    if seed is None:
+        return [dict(q) for q in questions]
+
+    question_order, option_orders = shuffle_plan(
+        seed, attempt_id, [_option_count(q) for q in questions]
+    )
+
+    served = []
+    for c in question_order:
+        q = dict(questions[c])
+        if q.get("options"):
+            options = parse_options(q["options"])
+            q["options"] = [options[j] for j in option_orders[c]]
+        served.append(q)
+
+    return served
+
+
+def shuffle_answers(answers: list, seed: int | None, attempt_id: int) -> list:
+    """Canonical-order answers → served order."""
+    if seed is None or not answers:
+        return list(answers)
+
+    question_order = np.random.default_rng([int(seed), int(attempt_id)]).permutation(len(answers))
+    return [answers[c] for c in question_order]
+
+
+def unshuffle_attempt(questions: list[dict], answers: list, seed: int | None, attempt_id: int):
+    """
+    Served questions + answers → canonical (paper) order, options restored
+    to their canonical order. Answers are option strings, so they need
+    no per-option mapping.
+    """
+    if seed is None:
+        return list(questions), list(answers)
+
+    n = len(questions)
+    question_order = np.random.default_rng([int(seed), int(attempt_id)]).permutation(n)
+
+    counts = np.zeros(n, dtype=np.int64)
+    counts[question_order] = [_option_count(q) for q in questions]
+
+    _, option_orders = shuffle_plan(seed, attempt_id, counts)
+
+    canonical_questions = [None] * n
+    canonical_answers = [""] * n
+
+    for pos, c in enumerate(question_order):
+        q = dict(questions[pos])
+        if q.get("options"):
+            served_options = parse_options(q["options"])
+            options = [None] * len(served_options)
+            for served_pos, j in enumerate(option_orders[c]):
+                options[j] = served_options[served_pos]
+            q["options"] = options
+        canonical_questions[c] = q
+        canonical_answers[c] = answers[pos] if pos < len(answers) else ""
+
+    return canonical_questions, canonical_answers
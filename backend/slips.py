@@ -0,0 +1,275 @@
+# ==============================
+# backend/slips.py
+# Printable access slips (multi-up PDF + QR)
+# ==============================
+"""
+Access-slip generator.
+
+Students are grouped per class (large classes split into parts); each
+chunk is rendered to its own PDF in a worker process and the PDFs are
+zipped. generate_slips_async() runs the whole job off the Streamlit
+script thread so the admin session stays responsive.
+"""
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from backend.database import get_session
+from backend.models import Class, School, Student
+
+
+# 2 x 5 slips per A4 page
+SLIP_COLUMNS = 2
+SLIP_ROWS = 5
+
+# students per PDF (one class may span several files)
+CHUNK_SIZE = 500
+
+DEFAULT_LOGO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "logo.png",
+)
+
+# background jobs (one slot is enough: each job fans out to processes)
+_job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slips")
+
+
+# ==============================
+# 🔗 Login link
+# ==============================
+def login_url(school_code: str, access_code: str) -> str:
+    """
+    QR payload: a login link when APP_BASE_URL is configured, otherwise
+    just the access code (still scannable into the code box).
+    """
+    base = os.getenv("APP_BASE_URL", "").strip()
+
+    if not base:
+        return access_code
+
+    return f"{base.rstrip('/')}/?{urlencode({'school': school_code, 'code': access_code})}"
+
+
+# ==============================
+# 🖨️ PDF rendering (runs in worker processes)
+# ==============================
+def _draw_qr(c, data: str, x: float, y: float, size: float):
+    """
+    Draw a QR code as a 1-bit inline image (one pixel per module), which
+    is far cheaper than emitting a vector path per module run.
+    """
+    import qrcode
+    from PIL import Image
+
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        border=0,
+        mask_pattern=2,  # fixed mask skips the 8-way mask search
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    matrix = qr.get_matrix()
+    n = len(matrix)
+
+    img = Image.new("1", (n, n))
+    img.putdata([0 if module else 255 for row in matrix for module in row])
+
+    c.drawInlineImage(img, x, y, size, size)
+
+
+def render_slip_pdf(job: dict) -> tuple[str, bytes]:
+    """
+    Render one chunk of slips.
+
+    job = {
+        "filename", "school_name", "school_code", "class_name",
+        "logo": bytes | None,
+        "students": [(name, access_code), ...]
+    }
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    page_w, page_h = A4
+
+    margin = 24
+    slip_w = (page_w - 2 * margin) / SLIP_COLUMNS
+    slip_h = (page_h - 2 * margin) / SLIP_ROWS
+    per_page = SLIP_COLUMNS * SLIP_ROWS
+
+    qr_size = min(slip_h - 50, 100)
+
+    # logo embedded once as a form XObject, reused on every slip
+    if job.get("logo"):
+        c.beginForm("slip_logo")
+        c.drawImage(ImageReader(io.BytesIO(job["logo"])), 0, 0, width=28, height=28,
+                    preserveAspectRatio=True, mask="auto")
+        c.endForm()
+
+    for i, (name, code) in enumerate(job["students"]):
+
+        if i and i % per_page == 0:
+            c.showPage()
+
+        slot = i % per_page
+        x = margin + (slot % SLIP_COLUMNS) * slip_w
+        y = page_h - margin - (slot // SLIP_COLUMNS + 1) * slip_h
+
+        # cut lines
+        c.setDash(3, 3)
+        c.setStrokeColorRGB(0.6, 0.6, 0.6)
+        c.rect(x, y, slip_w, slip_h, stroke=1, fill=0)
+        c.setDash()
+
+        # header
+        if job.get("logo"):
+            c.saveState()
+            c.translate(x + 10, y + slip_h - 38)
+            c.doForm("slip_logo")
+            c.restoreState()
+
+        c.setFillColorRGB(0, 0, 0)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(x + 44, y + slip_h - 22, job["school_name"][:40])
+        c.setFont("Helvetica", 8)
+        c.drawString(x + 44, y + slip_h - 34, "STUDENT ACCESS SLIP")
+
+        # student details
+        c.setFont("Helvetica", 9)
+        c.drawString(x + 12, y + slip_h - 60, f"Name: {name}"[:30])
+        c.drawString(x + 12, y + slip_h - 76, f"Class: {job['class_name']}"[:30])
+
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(x + 12, y + slip_h - 100, code)
+
+        c.setFont("Helvetica-Oblique", 7)
+        c.drawString(x + 12, y + 12, "Keep this code private.")
+
+        # QR
+        _draw_qr(
+            c,
+            login_url(job["school_code"], code),
+            x + slip_w - qr_size - 12,
+            y + 12,
+            qr_size,
+        )
+
+    c.save()
+
+    return job["filename"], buffer.getvalue()
+
+
+# ==============================
+# 📦 Batch build
+# ==============================
+def _load_logo(logo_path, size: int = 96):
+    """Logo downscaled to slip size as PNG bytes (keeps PDFs small)."""
+    from PIL import Image
+
+    try:
+        with Image.open(logo_path) as img:
+            img.thumbnail((size, size))
+            out = io.BytesIO()
+            img.save(out, format="PNG", optimize=True)
+            return out.getvalue()
+    except OSError:
+        return None
+
+
+def build_slip_jobs(school_id: int, class_ids: list[int] | None = None, db=None) -> list[dict]:
+    """Group the school's students into per-class render jobs (one query each)."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        school = db.query(School.name, School.code).filter(School.id == school_id).first()
+
+        if not school:
+            raise ValueError("School not found")
+
+        class_query = db.query(Class.id, Class.name).filter(Class.school_id == school_id)
+        if class_ids:
+            class_query = class_query.filter(Class.id.in_(class_ids))
+        class_names = {c.id: c.name for c in class_query}
+
+        students = (
+            db.query(Student.class_id, Student.name, Student.access_code)
+            .filter(
+                Student.school_id == school_id,
+                Student.class_id.in_(class_names.keys()),
+            )
+            .order_by(Student.class_id, Student.name)
+            .all()
+        )
+
+    finally:
+        if close_db:
+            db.close()
+
+    logo = _load_logo(DEFAULT_LOGO)
+
+    by_class = {}
+    for s in students:
+        by_class.setdefault(s.class_id, []).append((s.name, s.access_code))
+
+    jobs = []
+    for class_id, rows in by_class.items():
+        class_name = class_names[class_id]
+        safe_name = "".join(ch if ch.isalnum() else "_" for ch in class_name)
+
+        for part, start in enumerate(range(0, len(rows), CHUNK_SIZE), start=1):
+            suffix = f"_part{part}" if len(rows) > CHUNK_SIZE else ""
+
+            jobs.append({
+                "filename": f"{safe_name}{suffix}.pdf",
+                "school_name": school.name,
+                "school_code": school.code,
+                "class_name": class_name,
+                "logo": logo,
+                "students": rows[start:start + CHUNK_SIZE],
+            })
+
+    return jobs
+
+
+def generate_slips_zip(school_id: int, class_ids: list[int] | None = None, max_workers: int | None = None) -> bytes:
+    """
+    Render every class chunk in a process pool and return a zip of PDFs.
+    Files are written into the zip as each worker finishes.
+    """
+    jobs = build_slip_jobs(school_id, class_ids)
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+
+        if workers <= 1:
+            for job in jobs:
+                filename, pdf = render_slip_pdf(job)
+                zf.writestr(filename, pdf)
+        else:
+            # never fork the (multi-threaded) Streamlit server process
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                for filename, pdf in pool.map(render_slip_pdf, jobs):
+                    zf.writestr(filename, pdf)
+
+    return buffer.getvalue()
+
+
+def generate_slips_async(school_id: int, class_ids: list[int] | None = None):
+    """Start generate_slips_zip in the background; returns a Future."""
+    return _job_executor.submit(generate_slips_zip, school_id, class_ids)
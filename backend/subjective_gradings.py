@@ -1,68 +1,71 @@
 import streamlit as st
-import sqlite3
 
-# --- Connect to DB ---
-conn = sqlite3.connect(r"C:\Users\User\Desktop\SmartTests\smarttest.db")
-cursor = conn.cursor()
+from backend.database import startup
+from backend.db_helpers import get_all_schools
+from backend.grading import (
+    get_grading_queue,
+    load_submission,
+    load_question_grades,
+    save_grade_sheets,
+)
+
+# --- Connect to DB (same engine as the app) ---
+startup()
 
 # --- Admin Info (Example) ---
 admin_id = 1  # Replace with session-based admin ID if available
 
 # --- School Selector ---
-cursor.execute("SELECT DISTINCT school_id FROM subjective_questions")
-schools = [row[0] for row in cursor.fetchall()]
-school_id = st.selectbox("Select School", schools)
+schools = get_all_schools() or []
+school_lookup = {s.id: s.name for s in schools}
+
+if not school_lookup:
+    st.info("No schools found.")
+    st.stop()
+
+school_id = st.selectbox(
+    "Select School",
+    list(school_lookup.keys()),
+    format_func=lambda sid: school_lookup[sid]
+)
 
 st.header("📋 Subjective Grading Dashboard")
 
-# --- Fetch Students for the School ---
-cursor.execute("""
-    SELECT DISTINCT sp.student_id
-    FROM student_progress sp
-    JOIN student_answers sa ON sa.progress_id = sp.id
-    JOIN subjective_questions sq ON sa.question_id = sq.id
-    WHERE sq.school_id=?
-    ORDER BY sp.student_id
-""", (school_id,))
-students = [row[0] for row in cursor.fetchall()]
-
-if not students:
+# --- Fetch pending submissions for the School (one page) ---
+submissions = get_grading_queue(school_id, status="pending")["rows"]
+
+if not submissions:
     st.info("No students found for this school.")
 else:
-    for student_id in students:
-        with st.expander(f"Student ID: {student_id}", expanded=False):
-            # Fetch answers with question text and max marks
-            cursor.execute("""
-                SELECT sa.id, sa.question_id, sq.question_text, sa.answer, sq.marks
-                FROM student_answers sa
-                JOIN subjective_questions sq ON sa.question_id = sq.id
-                JOIN student_progress sp ON sa.progress_id = sp.id
-                WHERE sp.student_id=? AND sq.school_id=?
-            """, (student_id, school_id))
-            answers = cursor.fetchall()
+    grade_sheets = {}
+
+    for sub in submissions:
+        with st.expander(f"👤 {sub['student_name']} | 📘 {sub['subject_name']}", expanded=False):
+            # Answers with question text and max marks
+            body = load_submission(sub["id"], school_id)
+            answers = body["items"] if body else []
 
             if not answers:
                 st.info("No answers found for this student.")
                 continue
 
-            scores_dict = {}
-            for answer_id, question_id, question_text, answer_text, max_marks in answers:
-                # Check if already graded
-                cursor.execute("""
-                    SELECT score FROM subjective_grades
-                    WHERE student_id=? AND question_id=?
-                """, (student_id, question_id))
-                row = cursor.fetchone()
-                initial_score = row[0] if row else 0
+            # Existing grades for this student, in one query
+            graded = load_question_grades(sub["student_id"], sub["subject_id"])
+
+            grades = []
+            for idx, item in enumerate(answers, start=1):
+                question_id = item["question_id"]
+                max_marks = int(item["marks"] or 10)
+                initial_score = min(int(graded.get(question_id, 0)), max_marks)
 
                 col1, col2, col3 = st.columns([1, 3, 1])
                 with col1:
-                    st.markdown(f"**QID:** {question_id}")
+                    st.markdown(f"**QID:** {question_id or idx}")
                 with col2:
-                    st.markdown(f"**Question:** {question_text}")
-                    st.markdown(f"**Answer:** {answer_text}")
-                    if initial_score:
-                        st.markdown(f"✅ Already graded: {initial_score}")
+                    st.markdown(f"**Question:** {item['question']}")
+                    st.markdown(f"**Answer:** {item['answer']}")
+                    if question_id in graded:
+                        st.markdown(f"✅ Already graded: {graded[question_id]}")
                     else:
                         st.markdown("⚠️ Not graded yet")
                 with col3:
@@ -71,22 +74,31 @@ else:
                         min_value=0,
                         max_value=max_marks,
                         value=initial_score,
-                        key=f"score_{answer_id}"
+                        key=f"score_{sub['id']}_{idx}"
                     )
-                    scores_dict[answer_id] = (student_id, question_id, score)
+                    grades.append({"question_id": question_id, "score": score})
 
                 st.markdown("---")
 
-            # Submit Grades Button
-            if st.button(f"Submit Grades for Student {student_id}", key=f"submit_{student_id}"):
-                for answer_id, (stu_id, q_id, score) in scores_dict.items():
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO subjective_grades
-                        (student_id, question_id, score, graded_by, timestamp)
-                        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (stu_id, q_id, score, admin_id))
-                conn.commit()
-                st.success(f"✅ Grades submitted for Student {student_id}!")
-
-# --- Close DB ---
-conn.close()
\ No newline at end of file
+            sheet = {
+                "progress_id": sub["id"],
+                "grades": grades,
+                "max_score": sum(int(item["marks"] or 10) for item in answers),
+            }
+
+            # expander bodies always run, so bulk submit only takes
+            # sheets the grader explicitly ticked
+            if st.checkbox("Include in 💾 Submit All Grades", key=f"include_{sub['id']}"):
+                grade_sheets[sub["id"]] = sheet
+
+            # Submit Grades Button (single submission)
+            if st.button(f"Submit Grades for {sub['student_name']}", key=f"submit_{sub['id']}"):
+                save_grade_sheets([sheet], reviewed_by=str(admin_id))
+                st.success(f"✅ Grades submitted for {sub['student_name']}!")
+                st.rerun()
+
+    # Submit the ticked grade sheets in one batch
+    if grade_sheets and st.button(f"💾 Submit All Grades ({len(grade_sheets)})"):
+        result = save_grade_sheets(list(grade_sheets.values()), reviewed_by=str(admin_id))
+        st.success(f"✅ Grades submitted for {len(result['graded'])} submissions!")
+        st.rerun()
@@ -0,0 +1,148 @@
+# ==============================
+# backend/sweeper.py
+# Server-side auto-submit of expired attempts
+# ==============================
+"""
+Closes attempts whose timer ran out while nobody was on the page (tab
+closed, connection lost). A daemon thread wakes every SWEEP_INTERVAL
+seconds, finds expired attempts with one query on idx_progress_expiry
+(submitted, start_time + duration) and finalizes them in batches through
+backend.attempts, recording auto_submit_reason = "time_expired".
+A batch that fails is retried one attempt at a time; attempts that
+still fail are logged and skipped for the life of the process, so one
+bad row can't block the rest of the queue.
+"""
+import threading
+import time
+
+from sqlalchemy import and_
+
+from backend.attempts import finalize_attempts
+from backend.database import get_session
+from backend.models import StudentProgress
+
+
+SWEEP_INTERVAL = 60  # seconds between sweeps
+BATCH_SIZE = 200     # attempts finalized per transaction
+
+# leave the live page time to submit on its own first
+GRACE_SECONDS = 30
+
+EXPIRED_REASON = "time_expired"
+
+_sweeper_thread = None
+_sweeper_lock = threading.Lock()
+
+# ids whose finalize raised; not retried until the process restarts
+_failed_ids = set()
+
+
+# ==============================
+# 🔍 Find
+# ==============================
+def find_expired_attempts(
+    now: float | None = None,
+    limit: int = BATCH_SIZE,
+    exclude=None,
+    db=None
+) -> list[int]:
+    """Ids of unsubmitted attempts whose time ran out (oldest first), minus exclude."""
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    try:
+        cutoff = (now if now is not None else time.time()) - GRACE_SECONDS
+        expires_at = StudentProgress.start_time + StudentProgress.duration
+
+        query = (
+            db.query(StudentProgress.id)
+            .filter(and_(
+                StudentProgress.submitted.is_(False),
+                expires_at < cutoff,
+                StudentProgress.duration > 0,
+            ))
+        )
+
+        if exclude:
+            query = query.filter(StudentProgress.id.notin_(list(exclude)))
+
+        rows = query.order_by(expires_at).limit(limit).all()
+
+        return [r.id for r in rows]
+
+    finally:
+        if close_db:
+            db.close()
+
+
+# ==============================
+# 🧹 Sweep
+# ==============================
+def _finalize_one_by_one(ids: list[int]) -> dict:
+    """Fallback after a failed batch: finalize each id alone, skipping the bad ones."""
+    done = {}
+
+    for progress_id in ids:
+        try:
+            done.update(finalize_attempts([progress_id], reason=EXPIRED_REASON))
+        except Exception as e:
+            _failed_ids.add(progress_id)
+            print(f"❌ Skipping expired attempt {progress_id}: {e}")
+
+    return done
+
+
+def sweep_expired_attempts(now: float | None = None, batch_size: int = BATCH_SIZE) -> int:
+    """Finalize every expired attempt, batch by batch. Returns the count."""
+    swept = 0
+
+    while True:
+        ids = find_expired_attempts(now, limit=batch_size, exclude=_failed_ids)
+        if not ids:
+            break
+
+        try:
+            done = finalize_attempts(ids, reason=EXPIRED_REASON)
+        except Exception:
+            done = _finalize_one_by_one(ids)
+
+        swept += len(done)
+
+        # rows locked by a live submit are skipped; retry them next sweep
+        if len(ids) < batch_size or not done:
+            break
+
+    return swept
+
+
+def _sweep_forever(interval: int):
+    while True:
+        try:
+            swept = sweep_expired_attempts()
+            if swept:
+                print(f"⏰ Auto-submitted {swept} expired attempt(s)")
+        except Exception as e:
+            print(f"❌ Error in sweep_expired_attempts: {e}")
+
+        time.sleep(interval)
+
+
+def start_sweeper(interval: int = SWEEP_INTERVAL):
+    """Start the background sweeper once per server process."""
+    global _sweeper_thread
+
+    with _sweeper_lock:
+        if _sweeper_thread is not None and _sweeper_thread.is_alive():
+            return _sweeper_thread
+
+        _sweeper_thread = threading.Thread(
+            target=_sweep_forever,
+            args=(interval,),
+            name="attempt-sweeper",
+            daemon=True,
+        )
+        _sweeper_thread.start()
+
+        return _sweeper_thread
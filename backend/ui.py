@@ -1,34 +1,19 @@
 import streamlit as st
 import os
-import base64
 import json
-import pandas as pd
 import io
 import time
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from reportlab.platypus import Table, TableStyle
 from datetime import datetime
+from typing import TYPE_CHECKING
 from backend.models import Subject
 from backend.database import get_session
+from backend.exam_papers import get_exam_paper
+from backend.build_assets import clear_manifest_cache, get_asset_url
 
-
-# -----------------------------
-# Cached function to read & encode image
-# -----------------------------
-@st.cache_data(ttl=600)
-def get_base64_image(file_path: str) -> str:
-    """Read a local image file and return base64-encoded string."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Background file not found: {file_path}")
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode()
-
-
-
+# pandas / reportlab are imported where used, so the student login
+# path doesn't pay for them at startup
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def set_background(
@@ -39,37 +24,28 @@ def set_background(
     """
     Sets Streamlit background image for app + sidebar.
     Mobile-safe version.
+
+    The image is referenced by URL from the built static assets
+    (python -m backend.build_assets), never inlined into the page.
     """
 
-    base64_image = None
+    image_url = None
 
-    if file_path and os.path.exists(file_path):
+    if file_path:
 
         if force_reload:
-            try:
-                st.cache_data.clear()
-            except:
-                pass
-
-        try:
-            base64_image = get_base64_image(file_path)
-
-        except Exception as e:
-
-            st.warning(
-                f"⚠️ Failed loading background: {e}"
-            )
+            clear_manifest_cache()
 
-            base64_image = None
+        image_url = get_asset_url(file_path)
 
-    else:
-        base64_image = None
+        if not image_url:
+            print(f"⚠️ Background not built: {file_path} (run python -m backend.build_assets)")
 
 
     # ==================================================
     # IMAGE BACKGROUND
     # ==================================================
-    if base64_image:
+    if image_url:
 
         st.markdown(
             f"""
@@ -91,7 +67,7 @@ def set_background(
                         rgba(255,255,255,.10),
                         rgba(255,255,255,.10)
                     ),
-                    url("data:image/png;base64,{base64_image}");
+                    url("{image_url}");
 
                 background-size:cover !important;
                 background-position:center !important;
@@ -124,7 +100,7 @@ def set_background(
                         rgba(255,255,255,.88),
                         rgba(255,255,255,.92)
                     ),
-                    url("data:image/png;base64,{base64_image}");
+                    url("{image_url}");
 
                 background-size:cover !important;
                 background-position:center !important;
@@ -658,7 +634,7 @@ def generate_pdf(
 # ==============================
 # 🧩 Other Small Helpers
 # ==============================
-def df_download_button(df: pd.DataFrame, label: str, filename: str):
+def df_download_button(df: "pd.DataFrame", label: str, filename: str):
     """Download CSV button helper"""
     if df is None or df.empty:
         st.info("No data available for download.")
@@ -668,6 +644,8 @@ def df_download_button(df: pd.DataFrame, label: str, filename: str):
 
 def excel_download_buffer(dfs: dict, filename="smarttest_backup.xlsx"):
     """Return Excel file buffer from dict of dataframes."""
+    import pandas as pd
+
     buffer = io.BytesIO()
     with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
         for sheet, df in dfs.items():
@@ -764,7 +742,7 @@ def get_saved_progress(access_code: str, subject: str, school_id: int, test_type
         )
         if progress:
             return {
-                "questions": progress.questions or [],
+                "questions": (get_exam_paper(progress.paper_id) or {}).get("question_ids", []),
                 "answers": progress.answers or [],
                 "current_q": progress.current_q or 0,
                 "submitted": progress.submitted or False,
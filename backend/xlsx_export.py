@@ -0,0 +1,293 @@
+# ==============================
+# backend/xlsx_export.py
+# Streaming XLSX workbook export
+# ==============================
+"""
+Full-school XLSX export with a fixed memory ceiling.
+
+Each table is read from the database in chunks (yield_per → server-side
+cursor on Postgres) and written straight into xlsxwriter running in
+constant_memory mode, which flushes every finished row to a temp file.
+No DataFrames are built, so memory stays flat however many rows the
+school has. One sheet per table; a table larger than Excel's row limit
+continues on "<name> (2)", "<name> (3)", ...
+"""
+import os
+import tempfile
+
+import xlsxwriter
+from sqlalchemy import select
+
+from backend.answer_sheet import progress_answer_details
+from backend.database import get_session
+from backend.models import (
+    Class,
+    ObjectiveQuestion,
+    Student,
+    StudentProgress,
+    Subject,
+    SubjectiveQuestion,
+    TestResult,
+)
+
+
+CHUNK_SIZE = 5000
+
+# Excel's hard limit, header row included
+MAX_SHEET_ROWS = 1_048_576
+
+# sheet names are capped at 31 characters by Excel
+MAX_SHEET_NAME = 31
+
+
+# ==============================
+# 📋 Sheet definitions
+# ==============================
+def _students(school_id):
+    stmt = (
+        select(
+            Student.id,
+            Student.unique_id,
+            Student.name,
+            Class.name.label("class_name"),
+            Student.access_code,
+            Student.submitted,
+            Student.can_retake,
+            Student.created_at,
+        )
+        .outerjoin(Class, Class.id == Student.class_id)
+        .where(Student.school_id == school_id)
+        .order_by(Student.id)
+    )
+    headers = ["student_id", "unique_id", "name", "class", "access_code",
+               "submitted", "can_retake", "created_at"]
+    return stmt, headers, tuple
+
+
+def _objective_questions(school_id):
+    stmt = (
+        select(
+            ObjectiveQuestion.id,
+            Class.name.label("class_name"),
+            Subject.name.label("subject_name"),
+            ObjectiveQuestion.question_text,
+            ObjectiveQuestion.options,
+            ObjectiveQuestion.correct_answer,
+            ObjectiveQuestion.created_at,
+        )
+        .outerjoin(Class, Class.id == ObjectiveQuestion.class_id)
+        .outerjoin(Subject, Subject.id == ObjectiveQuestion.subject_id)
+        .where(ObjectiveQuestion.school_id == school_id)
+        .order_by(ObjectiveQuestion.id)
+    )
+    headers = ["question_id", "class", "subject", "question_text", "options",
+               "correct_answer", "created_at"]
+
+    def row(r):
+        options = r.options
+        if isinstance(options, (list, tuple)):
+            options = " | ".join(str(o) for o in options)
+        return (r.id, r.class_name, r.subject_name, r.question_text,
+                options, r.correct_answer, r.created_at)
+
+    return stmt, headers, row
+
+
+def _subjective_questions(school_id):
+    stmt = (
+        select(
+            SubjectiveQuestion.id,
+            Class.name.label("class_name"),
+            Subject.name.label("subject_name"),
+            SubjectiveQuestion.question_text,
+            SubjectiveQuestion.marks,
+            SubjectiveQuestion.created_at,
+        )
+        .outerjoin(Class, Class.id == SubjectiveQuestion.class_id)
+        .outerjoin(Subject, Subject.id == SubjectiveQuestion.subject_id)
+        .where(SubjectiveQuestion.school_id == school_id)
+        .order_by(SubjectiveQuestion.id)
+    )
+    headers = ["question_id", "class", "subject", "question_text", "marks", "created_at"]
+    return stmt, headers, tuple
+
+
+def _submissions(school_id):
+    stmt = (
+        select(
+            StudentProgress.id,
+            StudentProgress.student_id,
+            Student.name.label("student_name"),
+            Class.name.label("class_name"),
+            Subject.name.label("subject_name"),
+            StudentProgress.test_type,
+            StudentProgress.score,
+            StudentProgress.review_status,
+            StudentProgress.submitted,
+            StudentProgress.auto_submit_reason,
+            StudentProgress.created_at,
+            StudentProgress.paper_id,
+            StudentProgress.answer_sheet,
+            StudentProgress.answers,
+        )
+        .outerjoin(Student, Student.id == StudentProgress.student_id)
+        .outerjoin(Class, Class.id == StudentProgress.class_id)
+        .outerjoin(Subject, Subject.id == StudentProgress.subject_id)
+        .where(StudentProgress.school_id == school_id)
+        .order_by(StudentProgress.id)
+    )
+    headers = ["progress_id", "student_id", "student_name", "class", "subject",
+               "test_type", "score", "review_status", "submitted",
+               "auto_submit_reason", "submitted_at", "answers"]
+
+    def row(r):
+        answers = ", ".join(
+            str(d.get("selected", "")) if isinstance(d, dict) else str(d)
+            for d in progress_answer_details(r)
+        )
+        return (r.id, r.student_id, r.student_name, r.class_name, r.subject_name,
+                r.test_type, r.score, r.review_status, r.submitted,
+                r.auto_submit_reason, r.created_at, answers)
+
+    return stmt, headers, row
+
+
+def _test_results(school_id):
+    stmt = (
+        select(
+            TestResult.id,
+            TestResult.progress_id,
+            TestResult.student_id,
+            Student.name.label("student_name"),
+            Class.name.label("class_name"),
+            Subject.name.label("subject_name"),
+            TestResult.score,
+            TestResult.total,
+            TestResult.percentage,
+            TestResult.taken_at,
+        )
+        .outerjoin(Student, Student.id == TestResult.student_id)
+        .outerjoin(Class, Class.id == TestResult.class_id)
+        .outerjoin(Subject, Subject.id == TestResult.subject_id)
+        .where(TestResult.school_id == school_id)
+        .order_by(TestResult.id)
+    )
+    headers = ["result_id", "progress_id", "student_id", "student_name", "class",
+               "subject", "score", "total", "percentage", "taken_at"]
+    return stmt, headers, tuple
+
+
+# sheet name → builder(school_id) → (statement, headers, row formatter)
+SHEETS = {
+    "Students": _students,
+    "Objective Questions": _objective_questions,
+    "Subjective Questions": _subjective_questions,
+    "Submissions": _submissions,
+    "Test Results": _test_results,
+}
+
+
+# ==============================
+# ✍️ Writer
+# ==============================
+def _cell(value):
+    """Values xlsxwriter can't write natively become text."""
+    if isinstance(value, (dict, list, tuple, bytes)):
+        return str(value)
+    return value
+
+
+def _write_table(workbook, name, rows, headers, row_fn, header_format) -> int:
+    """Stream rows into one or more sheets; returns the number of data rows."""
+    sheet = None
+    part = 0
+    row_index = MAX_SHEET_ROWS
+    written = 0
+
+    def new_sheet():
+        nonlocal part
+        part += 1
+        title = name if part == 1 else f"{name[:MAX_SHEET_NAME - 5]} ({part})"
+        ws = workbook.add_worksheet(title[:MAX_SHEET_NAME])
+        ws.write_row(0, 0, headers, header_format)
+        ws.freeze_panes(1, 0)
+        return ws
+
+    for chunk in rows:
+        for r in chunk:
+            if row_index >= MAX_SHEET_ROWS:
+                sheet = new_sheet()
+                row_index = 1
+
+            sheet.write_row(row_index, 0, [_cell(v) for v in row_fn(r)])
+            row_index += 1
+            written += 1
+
+    if sheet is None:
+        new_sheet()
+
+    return written
+
+
+def write_school_workbook(school_id: int, path: str, sheets=None, db=None) -> dict:
+    """
+    Write the school's tables to an XLSX file at path.
+
+    sheets: subset of SHEETS names (default: all, in SHEETS order).
+    Returns {sheet name: rows written}.
+    """
+    close_db = False
+    if db is None:
+        db = get_session()
+        close_db = True
+
+    names = [n for n in SHEETS if sheets is None or n in sheets]
+
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "remove_timezone": True,
+        "default_date_format": "yyyy-mm-dd hh:mm",
+        "strings_to_numbers": False,
+        "strings_to_formulas": False,
+        "strings_to_urls": False,
+    })
+
+    try:
+        header_format = workbook.add_format({"bold": True})
+        counts = {}
+
+        for name in names:
+            stmt, headers, row_fn = SHEETS[name](school_id)
+            result = db.execute(stmt.execution_options(yield_per=CHUNK_SIZE))
+
+            counts[name] = _write_table(
+                workbook, name, result.partitions(), headers, row_fn, header_format
+            )
+
+        return counts
+
+    except Exception as e:
+        print(f"❌ Error in write_school_workbook: {e}")
+        raise
+
+    finally:
+        workbook.close()
+        if close_db:
+            db.close()
+
+
+def export_school_workbook(school_id: int, sheets=None) -> str:
+    """
+    Export to a new temp file and return its path.
+    The caller serves it to the user and deletes it when done.
+    """
+    fd, path = tempfile.mkstemp(prefix=f"smarttest_{school_id}_", suffix=".xlsx")
+    os.close(fd)
+
+    try:
+        write_school_workbook(school_id, path, sheets=sheets)
+    except Exception:
+        os.remove(path)
+        raise
+
+    return path
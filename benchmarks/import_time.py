@@ -0,0 +1,102 @@
+# ==============================
+# benchmarks/import_time.py
+# Cold-start import benchmark
+# ==============================
+"""
+Measure cold import time of the app's entry modules.
+
+Each module is imported in a fresh interpreter (no warm sys.modules),
+REPEATS times; the median is reported along with which heavy
+third-party packages the import dragged in. Run it on every release
+and keep the --json output to track cold-start over time:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --json > import_time_v1.4.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what each entry point costs before any user interaction
+MODULES = [
+    "backend.database",
+    "backend.ui",
+    "backend.db_helpers",
+    "selections.student",
+    "selections.admin",
+]
+
+# packages that should only load on first use
+HEAVY = ["pandas", "numpy", "reportlab", "qrcode", "xlsxwriter", "PIL", "plotly", "matplotlib"]
+
+REPEATS = 5
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, repeats: int = REPEATS) -> dict:
+    """Median cold import time (ms) of one module + heavy packages loaded."""
+    env = dict(os.environ, ENV=os.getenv("ENV", "local"), PYTHONDONTWRITEBYTECODE="1")
+    samples = []
+    heavy = []
+
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # last line: other output (e.g. Streamlit warnings) may precede it
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"] * 1000)
+        heavy = result["heavy"]
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "heavy": heavy,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    results = [measure(m, args.repeats) for m in args.modules]
+
+    if args.json:
+        print(json.dumps({"python": sys.version.split()[0], "results": results}, indent=2))
+        return
+
+    width = max(len(r["module"]) for r in results)
+    print(f"{'module':<{width}}  {'median':>9}  {'min':>9}  heavy imports")
+    for r in results:
+        print(
+            f"{r['module']:<{width}}  {r['median_ms']:>7.1f}ms  {r['min_ms']:>7.1f}ms  "
+            f"{', '.join(r['heavy']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
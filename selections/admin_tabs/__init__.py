@@ -0,0 +1,74 @@
+# ==============================
+# selections/admin_tabs/__init__.py
+# Admin tab registry
+# ==============================
+"""
+One module per admin tab, each exposing render(ctx).
+
+Only the selected tab's module is imported, and only the data it
+declares in "needs" is prepared, so a rerun runs that tab's queries
+and nothing else. ctx is a dict:
+
+    admin_role    role stored at login
+    current_role  role from the admins table (drives ROLE_TABS)
+    current_user  admin username
+    school_id     school being managed
+    db            open session, only when the tab needs "db"
+"""
+import importlib
+
+from backend.database import get_session
+
+
+# label → {"module": module name in this package, "needs": data dependencies}
+TABS = {
+    "🏫 Manage Schools": {"module": "manage_schools", "needs": ()},
+    "➕ Add Student": {"module": "add_student", "needs": ("db",)},
+    "📥 Students In Bulk": {"module": "bulk_students", "needs": ("db",)},
+    "👥 Manage Students": {"module": "manage_students", "needs": ("db",)},
+    "🛡️ Manage Admins": {"module": "manage_admins", "needs": ("db",)},
+    "📚 Manage Subjects": {"module": "manage_subjects", "needs": ()},
+    "🔑 Change Password": {"module": "change_password", "needs": ()},
+    "📤 Upload Questions": {"module": "upload_questions", "needs": ("db",)},
+    "✍️ Add Subjective Questions": {"module": "add_subjective", "needs": ()},
+    "✍️ Review Subj Questions": {"module": "review_subjective", "needs": ()},
+    "🗑️ Delete Questions": {"module": "delete_questions", "needs": ()},
+    "🗂️ Archive / Restore Questions": {"module": "archive_questions", "needs": ()},
+    "🔑 Fix Answer Key": {"module": "fix_answer_key", "needs": ()},
+    "📈 Item Analysis": {"module": "item_analysis", "needs": ()},
+    "📊 Performance History": {"module": "performance_history", "needs": ()},
+    "📉 Analytics": {"module": "analytics", "needs": ()},
+    "⏱ Set Duration": {"module": "set_duration", "needs": ()},
+    "🏆 View Leaderboard": {"module": "leaderboard", "needs": ()},
+    "🔄 Allow Retake": {"module": "allow_retake", "needs": ()},
+    "🖨️ Generate Slips": {"module": "generate_slips", "needs": ()},
+    "♻️ Reset Tests": {"module": "reset_tests", "needs": ()},
+    "📦 Data Export": {"module": "data_export", "needs": ()},
+    "🚪 Logout": {"module": "logout", "needs": ()},
+}
+
+
+def load_tab(label: str):
+    """Import (first use) and return the tab's module, or None for unknown labels."""
+    tab = TABS.get(label)
+    if tab is None:
+        return None
+    return importlib.import_module(f"{__name__}.{tab['module']}")
+
+
+def render_tab(label: str, ctx: dict) -> bool:
+    """Render one tab with its declared dependencies. False if the label is unknown."""
+    module = load_tab(label)
+    if module is None:
+        return False
+
+    needs = TABS[label]["needs"]
+    db = get_session() if "db" in needs else None
+
+    try:
+        module.render({**ctx, "db": db})
+    finally:
+        if db is not None:
+            db.close()
+
+    return True
@@ -0,0 +1,85 @@
+# ==============================
+# selections/admin_tabs/add_student.py
+# Admin tab: ➕ Add Student
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import add_student_db
+from backend.models import Class, School
+
+
+def render(ctx):
+    db = ctx["db"]
+
+    st.session_state["mode"] = "admin"
+    st.subheader("➕ Add Student")
+
+    # --------------------------------------------------
+    # 🏫 SCHOOL (Single Source of Truth)
+    # --------------------------------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    school_obj = db.query(School).filter_by(id=school_id).first()
+
+    if not school_obj:
+        st.error("🚫 Selected school not found in database.")
+        st.stop()
+
+    selected_school_name = school_obj.name
+
+    # Optional: show current school context
+    st.info(f"🏫 Current School: {selected_school_name}")
+
+    # --------------------------------------------------
+    # 👤 STUDENT NAME
+    # --------------------------------------------------
+    name = st.text_input("Student Name", key="add_name")
+
+    # --------------------------------------------------
+    # 📚 CLASS (Filtered by Selected School)
+    # --------------------------------------------------
+    classes_orm = db.query(Class).filter_by(school_id=school_id).all()
+
+    if not classes_orm:
+        st.warning("⚠️ No classes found for this school.")
+        st.stop()
+
+    class_lookup = {c.id: c.name for c in classes_orm}
+
+    selected_class_id = st.selectbox(
+        "Class",
+        list(class_lookup.keys()),
+        format_func=lambda cid: class_lookup[cid],
+        key="add_class"
+    )
+
+    # --------------------------------------------------
+    # 🚀 SUBMIT
+    # --------------------------------------------------
+    if st.button("Add Student", key="add_student_btn"):
+
+        if not name.strip():
+            st.info("🚫 Please enter a valid student name.")
+            st.stop()
+
+        try:
+            student = add_student_db(
+                name=name.strip(),
+                class_id=selected_class_id,
+                school_id=school_id
+            )
+
+            st.success(
+                f"✅ {student['name']} added successfully!\n\n"
+                f"School: {selected_school_name}\n"
+                f"Class: {class_lookup[selected_class_id]}\n"
+                f"Unique ID: {student['unique_id']}\n"
+                f"Access Code: {student['access_code']}"
+            )
+
+        except Exception as e:
+            st.error(f"🚫 Error adding student: {e}")
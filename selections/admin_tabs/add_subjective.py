@@ -0,0 +1,342 @@
+# ==============================
+# selections/admin_tabs/add_subjective.py
+# Admin tab: ✍️ Add Subjective Questions
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.database import get_session
+from backend.helpers import get_subjective_questions
+from backend.models import Class, School, Subject, SubjectiveQuestion
+
+
+def render(ctx):
+    st.subheader("✍️ Add Subjective Questions")
+
+    # =====================================================
+    # 🏫 GLOBAL SCHOOL (NO SECOND SELECTOR)
+    # =====================================================
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.error("🚫 No school selected.")
+        st.stop()
+
+    db = get_session()
+    try:
+        school = db.query(School).filter_by(id=school_id).first()
+    finally:
+        db.close()
+
+    if not school:
+        st.error("🚫 Selected school not found.")
+        st.stop()
+
+    st.info(f"🏫 Current School: {school.name}")
+
+    # =====================================================
+    # 📚 LOAD CLASSES (SAFE SYNC)
+    # =====================================================
+    db = get_session()
+    try:
+        classes = (
+            db.query(Class)
+            .filter(Class.school_id == school_id)
+            .order_by(Class.name.asc())
+            .all()
+        )
+    finally:
+        db.close()
+
+    if not classes:
+        st.warning("No classes found.")
+        st.stop()
+
+    class_ids = [c.id for c in classes]
+    class_lookup = {c.id: c.name for c in classes}
+
+    # ✅ Ensure valid class state
+    if (
+            "subjective_class" not in st.session_state
+            or st.session_state["subjective_class"] not in class_ids
+    ):
+        st.session_state["subjective_class"] = class_ids[0]
+
+    selected_class_id = st.selectbox(
+        "Select Class",
+        class_ids,
+        format_func=lambda cid: class_lookup[cid],
+        key="subjective_class"
+    )
+
+    class_id = selected_class_id
+
+    # =====================================================
+    # 📘 LOAD SUBJECTS (SAFE SYNC)
+    # =====================================================
+    db = get_session()
+    try:
+        subjects = (
+            db.query(Subject)
+            .filter(
+                Subject.school_id == school_id,
+                Subject.class_id == class_id
+            )
+            .order_by(Subject.name.asc())
+            .all()
+        )
+    finally:
+        db.close()
+
+    if not subjects:
+        st.warning("No subjects found.")
+        st.stop()
+
+    subject_ids = [s.id for s in subjects]
+    subject_lookup = {s.id: s.name for s in subjects}
+
+    # ✅ Ensure valid subject state
+    if (
+            "subjective_subject" not in st.session_state
+            or st.session_state["subjective_subject"] not in subject_ids
+    ):
+        st.session_state["subjective_subject"] = subject_ids[0]
+
+    selected_subject_id = st.selectbox(
+        "Select Subject",
+        subject_ids,
+        format_func=lambda sid: subject_lookup[sid],
+        key="subjective_subject"
+    )
+
+    subject_id = selected_subject_id
+
+    st.divider()
+
+    # =====================================================
+    # ➕ ADD SINGLE QUESTION
+    # =====================================================
+    st.markdown("### ➕ Add Single Question")
+
+    question_text = st.text_area(
+        "Question",
+        key="subjective_single_text"
+    )
+
+    marks = st.number_input(
+        "Marks",
+        1,
+        100,
+        10,
+        key="subjective_single_marks"
+    )
+
+    model_answer = st.text_area(
+        "Model Answer (optional, used for score suggestions)",
+        key="subjective_single_model"
+    )
+
+    keywords_text = st.text_input(
+        "Keywords (optional, comma-separated)",
+        key="subjective_single_keywords"
+    )
+
+    if st.button("Save Question", key="subjective_save"):
+
+        if not question_text.strip():
+            st.error("Question required.")
+            st.stop()
+
+        db = get_session()
+
+        try:
+            db.add(
+                SubjectiveQuestion(
+                    school_id=school_id,
+                    class_id=class_id,
+                    subject_id=subject_id,
+                    question_text=question_text.strip(),
+                    marks=int(marks),
+                    model_answer=model_answer.strip() or None,
+                    keywords=[k.strip() for k in keywords_text.split(",") if k.strip()] or None
+                )
+            )
+
+            db.commit()
+
+            st.success("Question saved.")
+            st.rerun()
+
+        except Exception as e:
+            db.rollback()
+            st.error(f"Failed: {e}")
+
+        finally:
+            db.close()
+
+    # =====================================================
+    # ✍️ Bulk Upload Subjective Questions (CSV/Text)
+    # =====================================================
+    st.markdown("### 📤 Bulk Upload")
+
+    uploaded_file = st.file_uploader(
+        "Upload CSV (column 'question_text'; optional 'marks', 'model_answer', 'keywords')",
+        type=["csv"],
+        key="subjective_csv"
+    )
+
+    bulk_text = st.text_area(
+        "Or paste numbered questions",
+        height=200,
+        key="subjective_text"
+    )
+
+    if st.button("Upload Questions", key="subjective_upload"):
+
+        cleaned_subjective = []
+
+        # -------------------------
+        # CSV MODE
+        # -------------------------
+        if uploaded_file:
+            try:
+                df = pd.read_csv(uploaded_file, on_bad_lines='skip')
+                st.info(f"CSV rows read: {len(df)}")
+
+                if df.empty:
+                    st.error("CSV is empty.")
+                    st.stop()
+
+                if "question_text" not in df.columns:
+                    first_col = df.columns[0]
+                    st.warning(f"'question_text' column not found, using: '{first_col}'")
+                    df.rename(columns={first_col: "question_text"}, inplace=True)
+
+                for idx, row in df.iterrows():
+                    q_text = str(row["question_text"]).strip()
+
+                    if not q_text:
+                        continue
+
+                    try:
+                        marks_val = int(row.get("marks", 10))
+                    except Exception:
+                        marks_val = 10
+
+                    model_val = row.get("model_answer")
+                    model_val = (
+                        str(model_val).strip()
+                        if isinstance(model_val, str) and model_val.strip()
+                        else None
+                    )
+
+                    keywords_val = row.get("keywords")
+                    keywords_val = (
+                        [k.strip() for k in keywords_val.split(",") if k.strip()]
+                        if isinstance(keywords_val, str)
+                        else []
+                    )
+
+                    cleaned_subjective.append({
+                        "question": q_text,
+                        "marks": marks_val,
+                        "model_answer": model_val,
+                        "keywords": keywords_val or None
+                    })
+
+            except Exception as e:
+                st.error(f"CSV error: {e}")
+                st.stop()
+
+        # -------------------------
+        # TEXT MODE
+        # -------------------------
+        elif bulk_text.strip():
+            import re
+            parts = re.split(r"\n?\s*\d+\.\s*", bulk_text.strip())
+
+            for p in parts:
+                q_text = p.strip()
+                if not q_text:
+                    continue
+
+                cleaned_subjective.append({
+                    "question": q_text,
+                    "marks": 10
+                })
+
+        else:
+            st.warning("Provide CSV or paste questions.")
+            st.stop()
+
+        # -------------------------
+        # 🔍 DUPLICATE CHECK
+        # -------------------------
+        existing_subj_text = {
+            q.question_text.lower()
+            for q in get_subjective_questions(
+                class_id=class_id,
+                subject_id=subject_id,
+                school_id=school_id
+            )
+        }
+
+        duplicates = [
+            q["question"]
+            for q in cleaned_subjective
+            if q["question"].lower() in existing_subj_text
+        ]
+
+        if duplicates:
+            st.warning(f"⚠️ {len(duplicates)} duplicate(s) skipped.")
+            for dq in duplicates[:10]:  # limit spam
+                st.text(f"• {dq}")
+
+        cleaned_subjective = [
+            q for q in cleaned_subjective
+            if q["question"].lower() not in existing_subj_text
+        ]
+
+        # -------------------------
+        # 💾 SAVE TO DB
+        # -------------------------
+        if cleaned_subjective:
+
+            db = get_session()
+
+            try:
+                count = 0
+
+                for q in cleaned_subjective:
+                    db.add(
+                        SubjectiveQuestion(
+                            school_id=school_id,
+                            class_id=class_id,
+                            subject_id=subject_id,
+                            question_text=q["question"],
+                            marks=int(q.get("marks", 10)),
+                            model_answer=q.get("model_answer"),
+                            keywords=q.get("keywords")
+                        )
+                    )
+                    count += 1
+
+                db.commit()
+
+                # ✅ SAFE DISPLAY (no stale names)
+                st.success(
+                    f"🎯 Uploaded {count} new subjective question(s) "
+                    f"for {class_lookup[class_id]} - {subject_lookup[subject_id]}."
+                )
+
+                st.rerun()
+
+            except Exception as e:
+                db.rollback()
+                st.error(f"Upload failed: {e}")
+
+            finally:
+                db.close()
+
+        else:
+            st.info("⚠️ No new questions to upload.")
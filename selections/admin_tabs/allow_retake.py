@@ -0,0 +1,257 @@
+# ==============================
+# selections/admin_tabs/allow_retake.py
+# Admin tab: 🔄 Allow Retake
+# ==============================
+import streamlit as st
+
+from backend.database import get_session
+from backend.db_helpers import (
+    bulk_set_retakes,
+    get_all_schools,
+    get_current_school_id,
+    get_student_by_access_code,
+    invalidate_retake_cache,
+    load_subjects,
+)
+from backend.models import Class, Retake, Subject
+from backend.ui import load_classes
+
+
+def render(ctx):
+    st.subheader("🔄 Allow Retake Permission")
+
+    # ------------------------------------------------
+    # 🏫 RESOLVE SCHOOL FIRST (CRITICAL FIX)
+    # ------------------------------------------------
+    admin_role = st.session_state.get("admin_role", "")
+
+    if admin_role == "super_admin":
+
+        schools = [s for s in (get_all_schools() or []) if s.id != 1]
+
+        if not schools:
+            st.warning("No schools found.")
+            st.stop()
+
+        school_lookup = {s.id: s.name for s in schools}
+
+        school_id = st.selectbox(
+            "🏫 Select School",
+            list(school_lookup.keys()),
+            format_func=lambda sid: school_lookup[sid],
+            key="retake_school"
+        )
+
+    else:
+        school_id = get_current_school_id()
+
+    if not school_id:
+        st.error("🚫 No school selected.")
+        st.stop()
+
+    # ------------------------------------------------
+    # 👥 BULK RETAKE BY CLASS
+    # ------------------------------------------------
+    with st.expander("👥 Bulk Retake by Class"):
+
+        bulk_classes = load_classes(school_id)
+
+        if not bulk_classes:
+            st.info("No classes found for this school.")
+        else:
+            bulk_class_lookup = {c.id: c.name for c in bulk_classes}
+
+            bulk_class_id = st.selectbox(
+                "📚 Class",
+                list(bulk_class_lookup.keys()),
+                format_func=lambda cid: bulk_class_lookup[cid],
+                key="bulk_retake_class"
+            )
+
+            bulk_subjects = load_subjects(school_id=school_id, class_id=bulk_class_id)
+            bulk_subject_lookup = {s.id: s.name for s in bulk_subjects}
+
+            bulk_subject_id = st.selectbox(
+                "📘 Subject",
+                ["All"] + list(bulk_subject_lookup.keys()),
+                format_func=lambda sid: "All Subjects" if sid == "All" else bulk_subject_lookup[sid],
+                key="bulk_retake_subject"
+            )
+
+            bulk_test_type = st.radio(
+                "Test Type",
+                ["Both", "Objective", "Subjective"],
+                horizontal=True,
+                key="bulk_retake_type"
+            )
+
+            bulk_allow = st.radio(
+                "Permission",
+                ["Allow", "Revoke"],
+                horizontal=True,
+                key="bulk_retake_allow"
+            ) == "Allow"
+
+            if st.button("💾 Apply to Class", key="bulk_retake_apply"):
+                try:
+                    written = bulk_set_retakes(
+                        school_id=school_id,
+                        class_id=bulk_class_id,
+                        subject_id=None if bulk_subject_id == "All" else bulk_subject_id,
+                        test_type=None if bulk_test_type == "Both" else bulk_test_type.lower(),
+                        can_retake=bulk_allow,
+                    )
+                    st.success(f"✅ Retake permissions updated ({written} records).")
+                except Exception as e:
+                    st.error(f"❌ Bulk retake failed: {e}")
+
+    # ------------------------------------------------
+    # 🔑 ACCESS CODE INPUT
+    # ------------------------------------------------
+    code_input = st.text_input(
+        "Student Access Code",
+        key="retake_code"
+    ).strip().upper()
+
+    if not code_input:
+        st.stop()
+
+    # ✅ FIXED: PASS school_id
+    student = get_student_by_access_code(code_input, school_id)
+
+    if not student:
+        st.info("🚫 Invalid student code for this school.")
+        st.stop()
+
+    db = get_session()
+
+    try:
+        # ------------------------------------------------
+        # 📚 LOAD CLASS (STRICT)
+        # ------------------------------------------------
+        class_obj = (
+            db.query(Class)
+            .filter(
+                Class.id == student.class_id,
+                Class.school_id == student.school_id
+            )
+            .first()
+        )
+
+        class_display = class_obj.name if class_obj else f"Class ID {student.class_id}"
+
+        st.info(f"👤 {student.name} | 📚 {class_display}")
+
+        st.markdown("### Manage Retake Permissions")
+
+        # ------------------------------------------------
+        # 📘 LOAD SUBJECTS (SYNCED TO CLASS + SCHOOL)
+        # ------------------------------------------------
+        subjects = (
+            db.query(Subject)
+            .filter(
+                Subject.school_id == student.school_id,
+                Subject.class_id == student.class_id
+            )
+            .order_by(Subject.name.asc())
+            .all()
+        )
+
+        if not subjects:
+            st.warning("No subjects found for this student's class.")
+            st.stop()
+
+        # One query for every existing permission of this student
+        existing_retakes = {
+            (r.subject_id, r.test_type): r
+            for r in db.query(Retake).filter_by(
+                student_id=student.id,
+                school_id=student.school_id
+            ).all()
+        }
+
+        # ==================================================
+        # 🎯 OBJECTIVE SECTION
+        # ==================================================
+        st.markdown("## Objective")
+
+        objective_master = st.checkbox("Allow ALL Objective", key="objective_master")
+
+        objective_permissions = {}
+
+        for subj in subjects:
+            existing = existing_retakes.get((subj.id, "objective"))
+
+            default_value = existing.can_retake if existing else False
+
+            allow = st.checkbox(
+                subj.name,
+                value=True if objective_master else default_value,
+                key=f"objective_{subj.id}"
+            )
+
+            objective_permissions[subj.id] = allow
+
+        # ==================================================
+        # ✍️ SUBJECTIVE SECTION
+        # ==================================================
+        st.markdown("---")
+        st.markdown("## Subjective")
+
+        subjective_master = st.checkbox("Allow ALL Subjective", key="subjective_master")
+
+        subjective_permissions = {}
+
+        for subj in subjects:
+            existing = existing_retakes.get((subj.id, "subjective"))
+
+            default_value = existing.can_retake if existing else False
+
+            allow = st.checkbox(
+                subj.name,
+                value=True if subjective_master else default_value,
+                key=f"subjective_{subj.id}"
+            )
+
+            subjective_permissions[subj.id] = allow
+
+        # ==================================================
+        # 💾 SAVE LOGIC
+        # ==================================================
+        if st.button("💾 Save Changes"):
+
+            def save_permissions(permission_dict, test_type):
+
+                for subject_id, allow in permission_dict.items():
+
+                    record = existing_retakes.get((subject_id, test_type))
+
+                    if record:
+                        record.can_retake = allow
+                    else:
+                        db.add(
+                            Retake(
+                                student_id=student.id,
+                                subject_id=subject_id,
+                                school_id=student.school_id,
+                                class_id=student.class_id,
+                                test_type=test_type,
+                                can_retake=allow
+                            )
+                        )
+
+            save_permissions(objective_permissions, "objective")
+            save_permissions(subjective_permissions, "subjective")
+
+            db.commit()
+
+            invalidate_retake_cache(
+                school_id=student.school_id,
+                student_ids=[student.id]
+            )
+
+            st.success("✅ Retake permissions updated successfully.")
+            st.rerun()
+
+    finally:
+        db.close()
@@ -0,0 +1,113 @@
+# ==============================
+# selections/admin_tabs/analytics.py
+# Admin tab: 📉 Analytics
+# ==============================
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from backend.analytics import BUCKETS, load_rollups, summarize_rollups
+from backend.db_helpers import load_subjects
+from backend.ui import load_classes
+
+
+def render(ctx):
+    st.subheader("📉 Score Analytics")
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    classes = load_classes(school_id) or []
+    class_lookup = {c.id: c.name for c in classes}
+
+    col1, col2 = st.columns(2)
+
+    class_id = col1.selectbox(
+        "Class",
+        ["All"] + list(class_lookup),
+        format_func=lambda cid: "All Classes" if cid == "All" else class_lookup[cid],
+        key="analytics_class"
+    )
+
+    subjects = load_subjects(
+        school_id=school_id,
+        class_id=None if class_id == "All" else class_id
+    ) or []
+    subject_lookup = {s.id: s.name for s in subjects}
+
+    subject_id = col2.selectbox(
+        "Subject",
+        ["All"] + list(subject_lookup),
+        format_func=lambda sid: "All Subjects" if sid == "All" else subject_lookup[sid],
+        key="analytics_subject"
+    )
+
+    col3, col4 = st.columns(2)
+
+    test_type = col3.selectbox(
+        "Test Type",
+        ["All", "objective", "subjective"],
+        key="analytics_test_type"
+    )
+
+    window = col4.selectbox(
+        "Period",
+        [30, 90, 365],
+        format_func=lambda d: f"Last {d} days",
+        key="analytics_window"
+    )
+
+    rollups = load_rollups(
+        school_id,
+        class_id=None if class_id == "All" else class_id,
+        subject_id=None if subject_id == "All" else subject_id,
+        test_type=None if test_type == "All" else test_type,
+        since=date.today() - timedelta(days=window)
+    )
+
+    summary = summarize_rollups(rollups)
+
+    if not summary["count"]:
+        st.info("No submissions in this period.")
+        st.stop()
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Submissions", summary["count"])
+    m2.metric("Average", f"{summary['mean']:.1f}%")
+    m3.metric("Std dev", f"{summary['sd']:.1f}")
+    m4.metric("Range", f"{summary['min']:.0f}–{summary['max']:.0f}%")
+
+    # -------------------------
+    # Trend (one row per day)
+    # -------------------------
+    daily = (
+        pd.DataFrame(
+            [{"day": r.day, "count": r.count, "sum": r.sum_percentage} for r in rollups]
+        )
+        .groupby("day", as_index=True)
+        .sum()
+    )
+    daily["Average %"] = daily["sum"] / daily["count"]
+
+    st.markdown("#### 📈 Average score per day")
+    st.line_chart(daily["Average %"])
+
+    st.markdown("#### 🗓️ Submissions per day")
+    st.bar_chart(daily["count"].rename("Submissions"))
+
+    # -------------------------
+    # Distribution
+    # -------------------------
+    width = 100 // BUCKETS
+    histogram = pd.Series(
+        summary["histogram"],
+        index=[f"{i * width}–{i * width + width}%" for i in range(BUCKETS)],
+        name="Submissions"
+    )
+
+    st.markdown("#### 📊 Score distribution")
+    st.bar_chart(histogram)
@@ -0,0 +1,228 @@
+# ==============================
+# selections/admin_tabs/archive_questions.py
+# Admin tab: 🗂️ Archive / Restore Questions
+# ==============================
+import streamlit as st
+
+from backend.database import get_session
+from backend.db_helpers import (
+    bulk_archive_questions,
+    bulk_restore_questions,
+    get_questions_in_active_use,
+    require_permission,
+)
+from backend.models import ArchivedQuestion, Class, ObjectiveQuestion, Subject
+
+
+def render(ctx):
+    require_permission("archive_questions")  # 🔐 ADD THIS
+
+    st.subheader("🗂️ Archive or Restore Questions")
+    # -------------------------
+    # 🏫 GLOBAL SCHOOL (STRICT)
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    db = get_session()
+
+    try:
+        st.info(f"🏫 Current School ID: {school_id}")
+
+        # -------------------------
+        # 📚 LOAD CLASSES (SAFE)
+        # -------------------------
+        classes = (
+            db.query(Class)
+            .filter(Class.school_id == school_id)
+            .order_by(Class.name.asc())
+            .all()
+        )
+
+        if not classes:
+            st.warning("⚠️ No classes found.")
+            st.stop()
+
+        class_ids = [c.id for c in classes]
+        class_lookup = {c.id: c.name for c in classes}
+
+        if (
+                "archive_class" not in st.session_state
+                or st.session_state["archive_class"] not in class_ids
+        ):
+            st.session_state["archive_class"] = class_ids[0]
+
+        selected_class_id = st.selectbox(
+            "Select Class",
+            class_ids,
+            format_func=lambda cid: class_lookup[cid],
+            key="archive_class"
+        )
+
+        class_id = selected_class_id
+
+        # -------------------------
+        # 📘 LOAD SUBJECTS (SAFE)
+        # -------------------------
+        subjects = (
+            db.query(Subject)
+            .filter(
+                Subject.school_id == school_id,
+                Subject.class_id == class_id
+            )
+            .order_by(Subject.name.asc())
+            .all()
+        )
+
+        if not subjects:
+            st.warning("⚠️ No subjects found.")
+            st.stop()
+
+        subject_ids = [s.id for s in subjects]
+        subject_lookup = {s.id: s.name for s in subjects}
+
+        if (
+                "archive_subject" not in st.session_state
+                or st.session_state["archive_subject"] not in subject_ids
+        ):
+            st.session_state["archive_subject"] = subject_ids[0]
+
+        selected_subject_id = st.selectbox(
+            "Select Subject",
+            subject_ids,
+            format_func=lambda sid: subject_lookup[sid],
+            key="archive_subject"
+        )
+
+        subject_id = selected_subject_id
+
+        # -------------------------
+        # 🔁 VIEW MODE
+        # -------------------------
+        show_archived = st.checkbox("👁️ Show Archived Questions", value=False)
+
+        # -------------------------
+        # 📘 ACTIVE QUESTIONS
+        # -------------------------
+        if not show_archived:
+
+            questions = (
+                db.query(ObjectiveQuestion)
+                .filter(
+                    ObjectiveQuestion.school_id == school_id,
+                    ObjectiveQuestion.class_id == class_id,
+                    ObjectiveQuestion.subject_id == subject_id
+                )
+                .order_by(ObjectiveQuestion.id.asc())
+                .all()
+            )
+
+            st.info("Showing ACTIVE questions")
+
+            if not questions:
+                st.warning("No active questions found.")
+
+            else:
+                # one index lookup for every question tied to an unfinished attempt
+                in_use = get_questions_in_active_use(school_id, [q.id for q in questions], db=db)
+
+                question_lookup = {q.id: q for q in questions}
+
+                selected_ids = st.multiselect(
+                    "Select questions to archive",
+                    list(question_lookup.keys()),
+                    format_func=lambda qid: (
+                        f"{'🔒 ' if qid in in_use else ''}Q{qid}: "
+                        f"{question_lookup[qid].question_text[:60]}"
+                    ),
+                    key=f"archive_sel_{class_id}_{subject_id}"
+                )
+
+                archive_all = st.checkbox(
+                    f"Archive the entire {subject_lookup[subject_id]} bank ({len(questions)} questions)",
+                    key="archive_whole_bank"
+                )
+
+                if st.button("🗃️ Archive", disabled=not (selected_ids or archive_all)):
+                    result = bulk_archive_questions(
+                        school_id,
+                        question_ids=None if archive_all else selected_ids,
+                        class_id=class_id,
+                        subject_id=subject_id,
+                        db=db
+                    )
+
+                    st.success(f"✅ Archived {result['archived']} question(s)")
+                    if result["in_use"]:
+                        st.warning(
+                            f"⚠️ {len(result['in_use'])} question(s) skipped — "
+                            "in use by an unfinished test."
+                        )
+                    st.rerun()
+
+                for q in questions:
+                    with st.expander(f"Q{q.id}: {q.question_text[:70]}..."):
+
+                        st.write(f"**Answer:** {q.correct_answer}")
+
+                        if q.id in in_use:
+                            st.warning("⚠️ Cannot archive — in use by an unfinished test.")
+
+        # -------------------------
+        # 🗂️ ARCHIVED QUESTIONS
+        # -------------------------
+        else:
+
+            archived_questions = (
+                db.query(ArchivedQuestion)
+                .filter(
+                    ArchivedQuestion.school_id == school_id,
+                    ArchivedQuestion.class_id == class_id,
+                    ArchivedQuestion.subject_id == subject_id
+                )
+                .order_by(ArchivedQuestion.archived_at.desc())
+                .all()
+            )
+
+            st.info("Showing ARCHIVED questions")
+
+            if not archived_questions:
+                st.warning("No archived questions found.")
+
+            else:
+                archived_lookup = {aq.id: aq for aq in archived_questions}
+
+                selected_ids = st.multiselect(
+                    "Select questions to restore",
+                    list(archived_lookup.keys()),
+                    format_func=lambda aid: f"Q{aid}: {archived_lookup[aid].question_text[:60]}",
+                    key=f"restore_sel_{class_id}_{subject_id}"
+                )
+
+                restore_all = st.checkbox(
+                    f"Restore every archived {subject_lookup[subject_id]} question "
+                    f"({len(archived_questions)})",
+                    key="restore_whole_bank"
+                )
+
+                if st.button("♻️ Restore", disabled=not (selected_ids or restore_all)):
+                    restored = bulk_restore_questions(
+                        school_id,
+                        archived_ids=None if restore_all else selected_ids,
+                        class_id=class_id,
+                        subject_id=subject_id,
+                        db=db
+                    )
+
+                    st.success(f"✅ Restored {restored} question(s)")
+                    st.rerun()
+
+                for aq in archived_questions:
+                    with st.expander(f"Q{aq.id}: {aq.question_text[:70]}..."):
+                        st.write(f"**Answer:** {aq.answer}")
+
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+# ==============================
+# selections/admin_tabs/bulk_students.py
+# Admin tab: 📥 Students In Bulk
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.db_helpers import bulk_add_students_db
+from backend.models import Class, School
+
+
+def render(ctx):
+    db = ctx["db"]
+
+    st.subheader("📥 Bulk Upload Students (CSV)")
+
+    # --------------------------------------------------
+    # 🏫 SCHOOL (Single Source of Truth)
+    # --------------------------------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    school_obj = db.query(School).filter_by(id=school_id).first()
+
+    if not school_obj:
+        st.error("🚫 Selected school not found in database.")
+        st.stop()
+
+
+    st.info(f"🏫 Current School: {school_obj.name}")
+
+    # --------------------------------------------------
+    # 📚 CLASS (Filtered by Selected School)
+    # --------------------------------------------------
+
+    classes = db.query(Class).filter_by(school_id=school_id).all()
+
+    if not classes:
+        st.warning("⚠️ No classes found for this school.")
+        st.stop()
+
+    # Keep IDs as integers
+    class_lookup = {c.id: c.name for c in classes}
+
+    # Reset stale selection if school changed
+    if "bulk_class_select" in st.session_state:
+        if st.session_state.bulk_class_select not in class_lookup:
+            del st.session_state.bulk_class_select
+
+
+    selected_class_id = st.selectbox(
+        "🏫 Select Class",
+        options=list(class_lookup.keys()),
+        format_func=lambda cid: class_lookup[cid],
+        key="bulk_class_select"
+    )
+
+    # --------------------------------------------------
+    # 📄 CSV Upload
+    # --------------------------------------------------
+    st.info("Upload CSV with column 'name' only. All students will be added to the selected class.")
+
+    uploaded = st.file_uploader(
+        "Choose CSV File",
+        type=["csv"],
+        key="bulk_students_csv"
+    )
+
+    if uploaded:
+        try:
+            df = pd.read_csv(uploaded)
+
+            if "name" not in df.columns:
+                st.error("🚫 CSV must contain a 'name' column.")
+                st.stop()
+
+            students_list = []
+
+            for _, r in df.iterrows():
+                raw_name = r.get("name")
+
+                if isinstance(raw_name, str):
+                    clean_name = raw_name.strip()
+                    if clean_name:
+                        students_list.append((clean_name, selected_class_id))
+
+            if not students_list:
+                st.warning("⚠️ No valid student names found in file.")
+                st.stop()
+
+            result = bulk_add_students_db(
+                students_list,
+                school_id
+            )
+
+            summary = result["summary"]
+
+            st.success(
+                f"✅ {summary['new']} new students added to "
+                f"{class_lookup[selected_class_id]}"
+            )
+
+        except Exception as e:
+            st.error(f"⚠️ Error processing CSV: {e}")
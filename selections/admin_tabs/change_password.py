@@ -0,0 +1,43 @@
+# ==============================
+# selections/admin_tabs/change_password.py
+# Admin tab: 🔑 Change Password
+# ==============================
+import time
+
+import streamlit as st
+
+from backend.db_helpers import update_admin_password, verify_admin
+
+
+def render(ctx):
+    st.subheader("Change Admin Password")
+
+    current_user = st.session_state.get("admin_username")
+    current_school_id = st.session_state.get("admin_school_id")
+
+    old_pw = st.text_input("Current Password", type="password", key="old_pw")
+    new_pw = st.text_input("New Password", type="password", key="new_pw")
+    confirm_pw = st.text_input("Confirm New Password", type="password", key="confirm_pw")
+
+    if st.button("Update Password", key="update_password_btn"):
+        if not old_pw or not new_pw or not confirm_pw:
+            st.error("🚫 Please fill in all fields.")
+        elif new_pw != confirm_pw:
+            st.error("🚫 New passwords do not match.")
+        else:
+            admin = verify_admin(current_user, old_pw, school_id=current_school_id)
+            if admin:
+                success = update_admin_password(current_user, new_pw, school_id=current_school_id)
+                if success:
+                    st.success("✅ Password updated successfully.")
+                    for i in range(3, 0, -1):
+                        st.info(f"⏳ Logging out in {i}...")
+                        time.sleep(1)
+                    st.session_state["admin_logged_in"] = False
+                    st.session_state["admin_username"] = None
+                    st.session_state["admin_role"] = None
+                    st.rerun()
+                else:
+                    st.error("🚫 Failed to update password. Try again.")
+            else:
+                st.error("🚫 Current password is incorrect.")
@@ -0,0 +1,360 @@
+# ==============================
+# selections/admin_tabs/data_export.py
+# Admin tab: 📦 Data Export
+# ==============================
+import os
+
+import pandas as pd
+import streamlit as st
+
+from backend.answer_sheet import progress_answer_details
+from backend.database import get_session
+from backend.db_helpers import (
+    add_question_db,
+    add_student_db,
+    add_submission_db,
+    clear_questions_db,
+    clear_students_db,
+    clear_submissions_db,
+    get_users,
+)
+from backend.models import ObjectiveQuestion, StudentProgress
+from backend.xlsx_export import export_school_workbook
+
+
+def _discard_workbook(export):
+    """Delete a previously built workbook and forget it."""
+    st.session_state.pop("xlsx_export", None)
+
+    if export and os.path.exists(export["path"]):
+        os.remove(export["path"])
+
+
+def render(ctx):
+    st.subheader("📦 Backup & Restore Database")
+
+    current_role = st.session_state.get("admin_role", "")
+
+    # ====================================================
+    # 🏫 SINGLE SOURCE OF TRUTH FOR SCHOOL
+    # ====================================================
+    current_school_id = st.session_state.get("school_id")
+
+    if current_role not in ("super_admin", "school_admin"):
+        st.error("🚫 Access denied.")
+        st.stop()
+
+    if not current_school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    st.markdown("### 🔽 Export Current Data")
+
+    db = get_session()
+
+    try:
+
+        # ====================================================
+        # 👥 STUDENTS (SCOPED)
+        # ====================================================
+        students = get_users(school_id=current_school_id)
+
+        students_df = pd.DataFrame(students.values()) if students else pd.DataFrame()
+        st.write(f"👥 Students: {len(students_df)} records")
+
+        # ====================================================
+        # ❓ QUESTIONS (SCOPED)
+        # ====================================================
+        q_query = db.query(ObjectiveQuestion).filter(
+            ObjectiveQuestion.school_id == current_school_id
+        )
+
+        questions = q_query.all()
+
+        questions_df = pd.DataFrame([
+            {
+                "question_id": q.id,
+                "class_id": q.class_id,
+                "subject_id": q.subject_id,
+                "question_text": q.question_text,
+                "options": q.options,
+                "correct_answer": q.correct_answer,
+                "school_id": q.school_id,
+            }
+            for q in questions
+        ]) if questions else pd.DataFrame()
+
+        st.write(f"❓ Questions: {len(questions_df)} records")
+
+        # ====================================================
+        # 📝 SUBMISSIONS (SCOPED)
+        # ====================================================
+        subs = (
+            db.query(StudentProgress)
+            .filter(StudentProgress.school_id == current_school_id)
+            .all()
+        )
+
+        submissions_df = pd.DataFrame([
+            {
+                "student_id": s.student_id,
+                "class_id": s.class_id,
+                "subject_id": s.subject_id,
+                "test_type": s.test_type,
+                "score": s.score,
+                "answers": ", ".join(
+                    str(d.get("selected", "")) if isinstance(d, dict) else str(d)
+                    for d in progress_answer_details(s)
+                ),
+                "review_status": s.review_status,
+                "submitted_at": s.created_at,
+                "school_id": s.school_id,
+            }
+            for s in subs
+        ]) if subs else pd.DataFrame()
+
+        st.write(f"📝 Submissions: {len(submissions_df)} records")
+
+        # ====================================================
+        # 📊 RESULT TABLE (SAFE)
+        # ====================================================
+        results_csv = None
+
+        if subs:
+
+            rows = []
+
+            for s in subs:
+                student_name = getattr(s.student, "name", f"Student {s.student_id}")
+                subject_name = getattr(s.subject, "name", f"Subject {s.subject_id}")
+
+                rows.append({
+                    "student_id": s.student_id,
+                    "student_name": student_name,
+                    "subject": subject_name,
+                    "score": s.score or 0
+                })
+
+            results_df = pd.DataFrame(rows)
+
+            result_table = results_df.pivot_table(
+                index=["student_id", "student_name"],
+                columns="subject",
+                values="score",
+                aggfunc="sum",
+                fill_value=0
+            ).reset_index()
+
+            subject_cols = [
+                c for c in result_table.columns
+                if c not in ["student_id", "student_name"]
+            ]
+
+            result_table["Total"] = result_table[subject_cols].sum(axis=1)
+
+            result_table["Rank"] = result_table["Total"].rank(
+                ascending=False,
+                method="dense"
+            ).astype(int)
+
+            result_table = result_table.sort_values("Rank")
+
+            st.markdown("### 📊 Student Result Table")
+            st.dataframe(result_table, use_container_width=True)
+
+            results_csv = result_table.to_csv(index=False).encode("utf-8")
+
+    finally:
+        db.close()
+
+    # ====================================================
+    # ⬇️ DOWNLOADS
+    # ====================================================
+    if not students_df.empty:
+        st.download_button(
+            "⬇️ Download Students CSV",
+            students_df.to_csv(index=False).encode("utf-8"),
+            file_name="students_export.csv",
+            mime="text/csv",
+        )
+
+    if not questions_df.empty:
+        st.download_button(
+            "⬇️ Download Questions CSV",
+            questions_df.to_csv(index=False).encode("utf-8"),
+            file_name="questions_export.csv",
+            mime="text/csv",
+        )
+
+    if not submissions_df.empty:
+        st.download_button(
+            "⬇️ Download Submissions CSV",
+            submissions_df.to_csv(index=False).encode("utf-8"),
+            file_name="submissions_export.csv",
+            mime="text/csv",
+        )
+
+    if results_csv:
+        st.download_button(
+            "⬇️ Download Result Table CSV",
+            results_csv,
+            file_name="student_results.csv",
+            mime="text/csv",
+        )
+
+    # ====================================================
+    # 📗 FULL XLSX WORKBOOK (STREAMED)
+    # ====================================================
+    # xlsx_export: {"school_id", "path"} of the last workbook built, so the
+    # download survives reruns until a new one replaces it
+    export = st.session_state.get("xlsx_export")
+
+    if export and (export["school_id"] != current_school_id or not os.path.exists(export["path"])):
+        _discard_workbook(export)
+        export = None
+
+    if st.button("📗 Build Full Excel Workbook"):
+        with st.spinner("Writing workbook..."):
+            xlsx_path = export_school_workbook(current_school_id)
+
+        _discard_workbook(export)
+        export = st.session_state["xlsx_export"] = {
+            "school_id": current_school_id,
+            "path": xlsx_path,
+        }
+
+    if export:
+        # Building is streamed, but serving is not: the pinned Streamlit
+        # keeps download data in its in-memory media store, so the
+        # compressed xlsx is held in memory while the button is shown.
+        # That file size is the remaining memory ceiling of the export.
+        with open(export["path"], "rb") as f:
+            xlsx_bytes = f.read()
+
+        st.download_button(
+            "⬇️ Download Full Workbook (XLSX)",
+            xlsx_bytes,
+            file_name=f"smarttest_export_{current_school_id}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+
+    # ====================================================
+    # 📦 FULL JSON BACKUP
+    # ====================================================
+    full_backup = {
+        "students": students_df.to_dict(orient="records") if not students_df.empty else [],
+        "questions": questions_df.to_dict(orient="records") if not questions_df.empty else [],
+        "submissions": submissions_df.to_dict(orient="records") if not submissions_df.empty else [],
+    }
+
+    import json
+
+    json_bytes = json.dumps(full_backup, indent=2, default=str).encode("utf-8")
+
+    st.download_button(
+        "⬇️ Full JSON Backup",
+        json_bytes,
+        file_name=f"smarttest_backup_{current_school_id}.json",
+        mime="application/json"
+    )
+
+    # ------------------------------------------------
+    # 🔄 RESTORE BACKUP (SAFE + ID-STRICT)
+    # ------------------------------------------------
+    st.markdown("---")
+    st.markdown("### 🔄 Restore From Backup")
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    uploaded_backup = st.file_uploader(
+        "Upload Backup JSON",
+        type=["json"],
+        key="restore_backup"
+    )
+
+    if uploaded_backup:
+
+        import json
+
+        try:
+            backup_data = json.load(uploaded_backup)
+
+            st.info(
+                f"Backup contains "
+                f"{len(backup_data.get('students', []))} students, "
+                f"{len(backup_data.get('questions', []))} questions, "
+                f"{len(backup_data.get('submissions', []))} submissions."
+            )
+
+            confirm = st.checkbox("⚠️ I understand this will overwrite current data")
+
+            if confirm and st.button("🔄 Confirm & Restore"):
+
+                # ====================================================
+                # 🧹 SAFE DELETE ORDER (PARENTS LAST)
+                # ====================================================
+                clear_submissions_db(school_id=school_id)
+                clear_questions_db(school_id=school_id)
+                clear_students_db(school_id=school_id)
+
+                # ====================================================
+                # 👥 RESTORE STUDENTS
+                # ====================================================
+                for s in backup_data.get("students", []):
+                    add_student_db(
+                        name=s["name"],
+                        class_id=s["class_id"],
+                        school_id=school_id,  # FORCE CURRENT SCHOOL
+                    )
+
+                # ====================================================
+                # ❓ RESTORE QUESTIONS
+                # ====================================================
+                for q in backup_data.get("questions", []):
+
+                    options = q.get("options", [])
+
+                    if isinstance(options, str):
+                        try:
+                            options = json.loads(options)
+                        except Exception:
+                            options = []
+
+                    add_question_db(
+                        class_id=q["class_id"],
+                        subject_id=q["subject_id"],
+                        question_text=q["question_text"],  # FIXED FIELD NAME
+                        options=options,
+                        correct_answer=q.get("correct_answer", q.get("answer", "")),
+                        school_id=school_id,
+                    )
+
+                # ====================================================
+                # 📝 RESTORE SUBMISSIONS (OPTIONAL SAFETY)
+                # ====================================================
+                for s in backup_data.get("submissions", []):
+
+                    try:
+                        add_submission_db(
+                            student_id=s["student_id"],
+                            class_id=s["class_id"],
+                            subject_id=s["subject_id"],
+                            test_type=s.get("test_type", "objective"),
+                            score=s.get("score", 0),
+                            answers=s.get("answers", ""),
+                            review_status=s.get("review_status", "pending"),
+                            school_id=school_id,
+                        )
+                    except Exception:
+                        continue
+
+                st.success("✅ Database restored successfully.")
+                st.balloons()
+                st.rerun()
+
+        except Exception as e:
+            st.error(f"🚫 Restore failed: {e}")
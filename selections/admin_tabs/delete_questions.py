@@ -0,0 +1,191 @@
+# ==============================
+# selections/admin_tabs/delete_questions.py
+# Admin tab: 🗑️ Delete Questions
+# ==============================
+import streamlit as st
+
+from backend.database import get_session
+from backend.db_helpers import get_questions_in_active_use, require_permission
+from backend.models import Class, ObjectiveQuestion, Subject, SubjectiveQuestion
+
+
+def render(ctx):
+    require_permission("delete_questions")  # 🔐 ADD THIS
+
+    import json
+
+    st.subheader("🗑️ Question Deletion Dashboard")
+
+    # -------------------------
+    # 🏫 GLOBAL SCHOOL (SYNCED)
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    db = get_session()
+
+    try:
+        # -------------------------
+        # 1️⃣ Question Type
+        # -------------------------
+        question_type = st.selectbox(
+            "Select Question Type",
+            ["Objective", "Subjective"],
+            key="delete_q_type"
+        )
+
+        # -------------------------
+        # 2️⃣ LOAD CLASSES (SAFE)
+        # -------------------------
+        classes = db.query(Class).filter_by(school_id=school_id).all()
+
+        if not classes:
+            st.warning("⚠️ No classes found for this school.")
+            st.stop()
+
+        class_ids = [c.id for c in classes]
+        class_lookup = {c.id: c.name for c in classes}
+
+        if (
+                "delete_class" not in st.session_state
+                or st.session_state["delete_class"] not in class_ids
+        ):
+            st.session_state["delete_class"] = class_ids[0]
+
+        selected_class_id = st.selectbox(
+            "Select Class",
+            class_ids,
+            format_func=lambda cid: class_lookup[cid],
+            key="delete_class"
+        )
+
+        class_id = selected_class_id
+
+        # -------------------------
+        # 3️⃣ LOAD SUBJECTS (SAFE)
+        # -------------------------
+        subjects = db.query(Subject).filter_by(
+            school_id=school_id,
+            class_id=class_id
+        ).all()
+
+        if not subjects:
+            st.warning("⚠️ No subjects found for this class.")
+            st.stop()
+
+        subject_ids = [s.id for s in subjects]
+        subject_lookup = {s.id: s.name for s in subjects}
+
+        if (
+                "delete_subject" not in st.session_state
+                or st.session_state["delete_subject"] not in subject_ids
+        ):
+            st.session_state["delete_subject"] = subject_ids[0]
+
+        selected_subject_id = st.selectbox(
+            "Select Subject",
+            subject_ids,
+            format_func=lambda sid: subject_lookup[sid],
+            key="delete_subject"
+        )
+
+        subject_id = selected_subject_id
+
+        # -------------------------
+        # 4️⃣ LOAD QUESTIONS
+        # -------------------------
+        if question_type == "Objective":
+
+            questions = (
+                db.query(ObjectiveQuestion)
+                .filter_by(
+                    school_id=school_id,
+                    class_id=class_id,
+                    subject_id=subject_id
+                )
+                .order_by(ObjectiveQuestion.id.desc())
+                .all()
+            )
+
+        else:
+            questions = (
+                db.query(SubjectiveQuestion)
+                .filter_by(
+                    school_id=school_id,
+                    class_id=class_id,
+                    subject_id=subject_id
+                )
+                .order_by(SubjectiveQuestion.id.desc())
+                .all()
+            )
+
+        st.write("Questions Found:", len(questions))
+
+        if not questions:
+            st.info("No questions found for this selection.")
+            st.stop()
+
+        st.markdown(f"### 📚 Loaded {len(questions)} Questions")
+
+        in_use = get_questions_in_active_use(
+            school_id,
+            [q.id for q in questions],
+            test_type=question_type.lower(),
+            db=db
+        )
+
+        # -------------------------
+        # 5️⃣ RENDER QUESTIONS
+        # -------------------------
+        for q in questions:
+
+            question_text = getattr(q, "question_text", "")
+
+            with st.expander(f"❓ {question_text[:120]}"):
+
+                st.markdown(f"**Question:** {question_text}")
+
+                if question_type == "Objective":
+
+                    options = getattr(q, "options", [])
+
+                    if isinstance(options, str):
+                        try:
+                            options = json.loads(options)
+                        except Exception:
+                            options = []
+
+                    if options:
+                        st.markdown("**Options:**")
+                        for opt in options:
+                            st.write(f"- {opt}")
+
+                    correct_answer = getattr(q, "correct_answer", "")
+                    st.success(f"Correct Answer: {correct_answer}")
+
+                else:
+                    marks = getattr(q, "marks", 10)
+                    st.info(f"Marks: {marks}")
+
+                # -------------------------
+                # 🗑️ DELETE BUTTON
+                # -------------------------
+                if q.id in in_use:
+                    st.warning("⚠️ Cannot delete — in use by an unfinished test.")
+
+                if st.button(
+                        "🗑️ Delete Question",
+                        key=f"delete_{question_type}_{q.id}",
+                        disabled=q.id in in_use
+                ):
+                    db.delete(q)
+                    db.commit()
+
+                    st.success("Question deleted successfully.")
+                    st.rerun()
+
+    finally:
+        db.close()
@@ -0,0 +1,147 @@
+# ==============================
+# selections/admin_tabs/fix_answer_key.py
+# Admin tab: 🔑 Fix Answer Key
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.answer_sheet import parse_options
+from backend.database import get_session
+from backend.db_helpers import require_permission
+from backend.models import Class, ObjectiveQuestion, Subject
+from backend.regrade import regrade_questions
+
+
+def render(ctx):
+    require_permission("upload_questions")
+
+    st.subheader("🔑 Fix Answer Key")
+    st.caption("Correct a question's answer and rescore every submitted test that used it.")
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    db = get_session()
+
+    try:
+        classes = db.query(Class).filter_by(school_id=school_id).all()
+
+        if not classes:
+            st.warning("⚠️ No classes found for this school.")
+            st.stop()
+
+        class_lookup = {c.id: c.name for c in classes}
+
+        class_id = st.selectbox(
+            "Select Class",
+            list(class_lookup),
+            format_func=lambda cid: class_lookup[cid],
+            key="key_fix_class"
+        )
+
+        subjects = db.query(Subject).filter_by(
+            school_id=school_id,
+            class_id=class_id
+        ).all()
+
+        if not subjects:
+            st.warning("⚠️ No subjects found for this class.")
+            st.stop()
+
+        subject_lookup = {s.id: s.name for s in subjects}
+
+        subject_id = st.selectbox(
+            "Select Subject",
+            list(subject_lookup),
+            format_func=lambda sid: subject_lookup[sid],
+            key="key_fix_subject"
+        )
+
+        questions = (
+            db.query(ObjectiveQuestion)
+            .filter_by(
+                school_id=school_id,
+                class_id=class_id,
+                subject_id=subject_id
+            )
+            .order_by(ObjectiveQuestion.id)
+            .all()
+        )
+
+        if not questions:
+            st.info("No objective questions found for this selection.")
+            st.stop()
+
+        question_lookup = {q.id: q for q in questions}
+
+        question_id = st.selectbox(
+            "Select Question",
+            list(question_lookup),
+            format_func=lambda qid: f"Q{qid}: {question_lookup[qid].question_text[:80]}",
+            key="key_fix_question"
+        )
+
+        question = question_lookup[question_id]
+        options = parse_options(question.options)
+
+        if not options:
+            st.warning("⚠️ This question has no options.")
+            st.stop()
+
+        st.markdown(f"**Question:** {question.question_text}")
+        st.info(f"Current answer: {question.correct_answer or '—'}")
+
+        current = next(
+            (i for i, opt in enumerate(options)
+             if opt.strip().lower() == str(question.correct_answer or "").strip().lower()),
+            0
+        )
+
+        new_answer = st.radio(
+            "Correct answer",
+            options,
+            index=current,
+            key=f"key_fix_answer_{question_id}"
+        )
+
+        col1, col2 = st.columns(2)
+        preview = col1.button("👀 Preview regrade", key="key_fix_preview")
+        apply = col2.button(
+            "✅ Save & regrade",
+            key="key_fix_apply",
+            disabled=new_answer == question.correct_answer
+        )
+
+        if preview or apply:
+            report = regrade_questions(
+                [question_id],
+                school_id,
+                new_keys={question_id: new_answer},
+                dry_run=not apply,
+                db=db
+            )
+
+            if apply:
+                st.success(
+                    f"✅ Answer key saved. {report['changed']} of "
+                    f"{report['attempts']} submitted test(s) rescored."
+                )
+            else:
+                st.info(
+                    f"{report['changed']} of {report['attempts']} submitted "
+                    f"test(s) would change."
+                )
+
+            if report["diff"]:
+                diff_df = pd.DataFrame(report["diff"])
+                diff_df["subject"] = diff_df["subject_id"].map(subject_lookup)
+                st.dataframe(
+                    diff_df[["student_name", "subject", "before", "after", "total", "percentage"]],
+                    use_container_width=True
+                )
+
+    finally:
+        db.close()
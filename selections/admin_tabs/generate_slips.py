@@ -0,0 +1,126 @@
+# ==============================
+# selections/admin_tabs/generate_slips.py
+# Admin tab: 🖨️ Generate Slips
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.db_helpers import count_students, get_users
+from backend.slips import generate_slips_async
+from backend.ui import load_classes
+
+
+def render(ctx):
+    st.subheader("🖨️ Generate Student Access Slips")
+
+    # -------------------------
+    # 🏫 GLOBAL SCHOOL
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.error("🚫 No school selected.")
+        st.stop()
+
+    total_students = count_students(school_id)
+
+    if not total_students:
+        st.info("No students found for this school.")
+        st.stop()
+
+    # -------------------------
+    # 📚 CLASS SELECTION (SCOPED)
+    # -------------------------
+    classes = load_classes(school_id)
+    class_map = {c.id: c.name for c in classes}
+
+    selected_class_ids = st.multiselect(
+        "Classes (leave empty for all)",
+        list(class_map.keys()),
+        format_func=lambda cid: class_map[cid],
+        key="slip_classes"
+    )
+
+    st.caption(f"👥 {total_students} students in this school")
+
+    # -------------------------
+    # 🖨️ PDF SLIPS (BACKGROUND JOB)
+    # -------------------------
+    # slip_job: {"school_id", "future"} while rendering,
+    # then {"school_id", "zip"} or {"school_id", "error"}
+    job = st.session_state.get("slip_job")
+    running = job is not None and "future" in job
+
+    if st.button("🖨️ Generate PDF Slips", disabled=running):
+        st.session_state.slip_job = {
+            "school_id": school_id,
+            "future": generate_slips_async(school_id, selected_class_ids or None),
+        }
+        st.rerun()
+
+    @st.fragment(run_every="2s")
+    def slip_job_status():
+        job = st.session_state.get("slip_job")
+
+        if not job or "future" not in job:
+            return
+
+        future = job["future"]
+
+        if not future.done():
+            st.info("⏳ Rendering slips in the background — you can keep working.")
+            return
+
+        # finished: keep the outcome and rerun once; the poller is no
+        # longer rendered, so it stops
+        try:
+            job["zip"] = future.result()
+        except Exception as e:
+            job["error"] = str(e)
+
+        del job["future"]
+        st.rerun()
+
+    if job and job["school_id"] == school_id:
+
+        if "future" in job:
+            slip_job_status()
+
+        elif "error" in job:
+            st.error(f"🚫 Slip generation failed: {job['error']}")
+
+        else:
+            st.download_button(
+                "⬇️ Download Access Slips (ZIP of PDFs)",
+                job["zip"],
+                file_name=f"access_slips_{school_id}.zip",
+                mime="application/zip"
+            )
+
+    # -------------------------
+    # 📄 CSV EXPORT
+    # -------------------------
+    st.markdown("---")
+
+    users = get_users(school_id=school_id)
+
+    df = pd.DataFrame(list(users.values()))
+
+    if selected_class_ids:
+        df = df[df["class_id"].isin(selected_class_ids)]
+
+    df["Class"] = df["class_id"].map(
+        lambda cid: class_map.get(cid, f"Class ID {cid}")
+    )
+
+    df_display = df[["name", "Class", "access_code"]].rename(columns={
+        "name": "Student Name",
+        "access_code": "Access Code"
+    })
+
+    st.download_button(
+        "⬇️ Download Access Slips (CSV)",
+        df_display.to_csv(index=False).encode("utf-8"),
+        file_name=f"access_slips_{school_id}.csv",
+        mime="text/csv"
+    )
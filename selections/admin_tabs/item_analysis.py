@@ -0,0 +1,135 @@
+# ==============================
+# selections/admin_tabs/item_analysis.py
+# Admin tab: 📈 Item Analysis
+# ==============================
+import pandas as pd
+import streamlit as st
+from sqlalchemy import func
+
+from backend.database import get_session
+from backend.db_helpers import require_permission
+from backend.item_analysis import analyze_paper
+from backend.models import Class, ExamPaper, StudentProgress, Subject
+
+
+def render(ctx):
+    require_permission("upload_questions")
+
+    st.subheader("📈 Item Analysis")
+    st.caption(
+        "Difficulty (p-value), discrimination (point-biserial), distractor "
+        "choices and KR-20 reliability for each objective exam paper."
+    )
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    db = get_session()
+
+    try:
+        classes = db.query(Class).filter_by(school_id=school_id).all()
+
+        if not classes:
+            st.warning("⚠️ No classes found for this school.")
+            st.stop()
+
+        class_lookup = {c.id: c.name for c in classes}
+
+        class_id = st.selectbox(
+            "Select Class",
+            list(class_lookup),
+            format_func=lambda cid: class_lookup[cid],
+            key="item_class"
+        )
+
+        subjects = db.query(Subject).filter_by(
+            school_id=school_id,
+            class_id=class_id
+        ).all()
+
+        if not subjects:
+            st.warning("⚠️ No subjects found for this class.")
+            st.stop()
+
+        subject_lookup = {s.id: s.name for s in subjects}
+
+        subject_id = st.selectbox(
+            "Select Subject",
+            list(subject_lookup),
+            format_func=lambda sid: subject_lookup[sid],
+            key="item_subject"
+        )
+
+        papers = (
+            db.query(ExamPaper.id, func.count(StudentProgress.id))
+            .join(StudentProgress, StudentProgress.paper_id == ExamPaper.id)
+            .filter(
+                ExamPaper.school_id == school_id,
+                ExamPaper.class_id == class_id,
+                ExamPaper.subject_id == subject_id,
+                ExamPaper.test_type == "objective",
+                StudentProgress.submitted.is_(True),
+            )
+            .group_by(ExamPaper.id)
+            .order_by(ExamPaper.id.desc())
+            .all()
+        )
+
+    finally:
+        db.close()
+
+    if not papers:
+        st.info("No submitted objective tests for this subject yet.")
+        st.stop()
+
+    paper_counts = dict(papers)
+
+    paper_id = st.selectbox(
+        "Exam Paper",
+        list(paper_counts),
+        format_func=lambda pid: f"Paper #{pid} — {paper_counts[pid]} submission(s)",
+        key="item_paper"
+    )
+
+    report = analyze_paper(paper_id)
+
+    if not report or not report["attempts"]:
+        st.info("No graded submissions on this paper yet.")
+        st.stop()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Submissions", report["attempts"])
+    col2.metric("Questions", report["questions"])
+    col3.metric("Mean score", f"{report['mean']:.1f}")
+    col4.metric("KR-20", "—" if report["kr20"] is None else f"{report['kr20']:.2f}")
+
+    def item_flag(item):
+        if item["point_biserial"] is not None and item["point_biserial"] < 0:
+            return "🚩 Check key"
+        if item["p_value"] > 0.9:
+            return "Too easy"
+        if item["p_value"] < 0.2:
+            return "Too hard"
+        if item["point_biserial"] is not None and item["point_biserial"] < 0.2:
+            return "Weak discrimination"
+        return ""
+
+    rows = []
+    for item in report["items"]:
+        choices = ", ".join(
+            f"{'✅' if opt == item['correct_answer'] else ''}{opt}: {share:.0%}"
+            for opt, share in item["options"].items()
+        )
+        rows.append({
+            "Question": item["text"][:80],
+            "p-value": round(item["p_value"], 2),
+            "Point-biserial": None if item["point_biserial"] is None else round(item["point_biserial"], 2),
+            "Choices": choices,
+            "Omitted": f"{item['omitted']:.0%}",
+            "Flag": item_flag(item),
+        })
+
+    st.dataframe(pd.DataFrame(rows), use_container_width=True)
@@ -0,0 +1,159 @@
+# ==============================
+# selections/admin_tabs/leaderboard.py
+# Admin tab: 🏆 View Leaderboard
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.database import get_session
+from backend.models import Class, Leaderboard, Student, StudentProgress, Subject
+from backend.ui import load_classes
+
+
+def render(ctx):
+    st.subheader("🏆 Leaderboard")
+
+    # -------------------------
+    # 🏫 SCHOOL CONTEXT
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.error("🚫 No school selected.")
+        st.stop()
+
+    # -------------------------
+    # 📚 CLASS FILTER (OPTIONAL)
+    # -------------------------
+    classes = load_classes(school_id)
+
+    if not classes:
+        st.warning("⚠️ No classes found.")
+        st.stop()
+
+    class_lookup = {c.id: c.name for c in classes}
+    class_ids = [c.id for c in classes]
+
+    selected_class = st.selectbox(
+        "Filter by Class (optional)",
+        ["All"] + class_ids,
+        format_func=lambda cid: "All Classes" if cid == "All" else class_lookup[cid],
+        key="lb_class_filter"
+    )
+
+    # -------------------------
+    # 🔍 SEARCH + LIMIT
+    # -------------------------
+    filter_input = st.text_input(
+        "🔍 Search by Name, Access Code, or Class ID",
+        key="lb_filter"
+    )
+
+    top_n = st.selectbox(
+        "Show Top N Students",
+        options=[5, 10, 20, 50, 100, "All"],
+        index=1
+    )
+
+    db = get_session()
+
+    try:
+        # -------------------------
+        # 📊 QUERY (FIXED: NO Leaderboard.subject_id)
+        # -------------------------
+        query = (
+            db.query(Leaderboard, Student, Class, Subject)
+            .join(Student, Leaderboard.student_id == Student.id)
+            .join(Class, Student.class_id == Class.id)
+            .outerjoin(StudentProgress, StudentProgress.student_id == Student.id)
+            .outerjoin(Subject, StudentProgress.subject_id == Subject.id)
+            .filter(Student.school_id == school_id)
+        )
+
+        if selected_class != "All":
+            query = query.filter(Student.class_id == selected_class)
+
+        results = query.order_by(Leaderboard.score.desc()).all()
+
+    finally:
+        db.close()
+
+    if not results:
+        st.info("No leaderboard data available.")
+        st.stop()
+
+    # -------------------------
+    # 🧱 BUILD DATAFRAME
+    # -------------------------
+    df = pd.DataFrame([
+        {
+            "Student Name": student.name,
+            "Access Code": student.access_code,
+            "Class ID": student.class_id,
+            "Class Name": class_.name,
+            "Subject ID": subject.id if subject else None,
+            "Subject Name": subject.name if subject else "General",
+            "Score": round(lb.score or 0, 2),
+            "Submitted At": getattr(lb, "submitted_at", None),
+        }
+        for lb, student, class_, subject in results
+    ])
+
+    # format datetime safely
+    if "Submitted At" in df.columns:
+        df["Submitted At"] = pd.to_datetime(df["Submitted At"], errors="coerce")
+
+    # -------------------------
+    # 🔎 FILTERING
+    # -------------------------
+    if filter_input.strip():
+        search = filter_input.strip()
+
+        df = df[
+            df["Student Name"].str.contains(search, case=False, na=False)
+            | df["Access Code"].str.contains(search, case=False, na=False)
+            | df["Class ID"].astype(str).str.contains(search)
+            ]
+
+        if df.empty:
+            st.warning("No matching records found.")
+            st.stop()
+
+    # -------------------------
+    # 📚 SUBJECT TABS
+    # -------------------------
+    subjects_present = (
+        df[["Subject ID", "Subject Name"]]
+        .drop_duplicates()
+        .sort_values("Subject Name")
+    )
+
+    tabs = st.tabs(subjects_present["Subject Name"].tolist())
+
+    for i, (_, row) in enumerate(subjects_present.iterrows()):
+
+        subject_id = row["Subject ID"]
+        subject_name = row["Subject Name"]
+
+        with tabs[i]:
+
+            df_sub = df[df["Subject ID"] == subject_id].copy()
+
+            df_sub = df_sub.sort_values(by="Score", ascending=False)
+
+            if top_n != "All":
+                df_sub = df_sub.head(int(top_n))
+
+            st.write(f"### 🧠 {subject_name} Leaderboard")
+
+            st.dataframe(
+                df_sub.drop(columns=["Subject ID"]),
+                use_container_width=True
+            )
+
+            st.download_button(
+                f"📥 Download {subject_name} CSV",
+                df_sub.to_csv(index=False).encode("utf-8"),
+                file_name=f"leaderboard_subject_{subject_id}_school_{school_id}.csv",
+                mime="text/csv"
+            )
@@ -0,0 +1,12 @@
+# ==============================
+# selections/admin_tabs/logout.py
+# Admin tab: 🚪 Logout
+# ==============================
+import streamlit as st
+
+
+def render(ctx):
+    st.session_state["admin_logged_in"] = False
+    st.session_state.pop("admin_current_role", None)
+    st.success("Logged out.")
+    st.rerun()
@@ -0,0 +1,284 @@
+# ==============================
+# selections/admin_tabs/manage_admins.py
+# Admin tab: 🛡️ Manage Admins
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import get_all_admins, set_admin
+from backend.models import Admin, School
+from backend.security import hash_password
+
+
+def render(ctx):
+    current_role = ctx["current_role"]
+
+    if current_role not in ["super_admin", "admin"]:
+        return
+
+    db = ctx["db"]
+
+    st.header("🛡️ Manage Admins")
+
+    # --------------------------------------------------
+    # 🏫 SCHOOL (Single Source of Truth)
+    # --------------------------------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    school_obj = db.query(School).filter_by(id=school_id).first()
+
+    if not school_obj:
+        st.error("🚫 Selected school not found.")
+        st.stop()
+
+    st.info(f"🏫 Managing admins for: {school_obj.name}")
+
+    # --------------------------------------------------
+    # 📋 Existing Admins
+    # --------------------------------------------------
+    st.subheader(f"📋 Admins for {school_obj.name}")
+
+    admins = get_all_admins()
+
+    school_admins = [
+        a for a in admins
+        if getattr(a, "school_id", None) == school_id
+    ]
+
+    if school_admins:
+
+        for a in school_admins:
+
+            with st.container(border=True):
+
+                st.markdown(f"### 👤 {a.username}")
+                st.write(f"🆔 ID: {a.id}")
+                st.write(f"🎭 Role: {a.role}")
+
+                col1, col2, col3 = st.columns(3)
+
+                # -------------------------
+                # 🔑 RESET PASSWORD
+                # -------------------------
+                with col1:
+                    if st.button("🔑 Reset Password", key=f"reset_{a.id}"):
+                        import secrets
+                        temp_password = secrets.token_hex(4)
+
+                        a.password_hash = hash_password(temp_password)
+                        db.commit()
+
+                        st.success(f"New password: {temp_password}")
+
+
+                # -------------------------
+                # ✏️ CHANGE ROLE
+                # -------------------------
+                with col2:
+                    new_role = st.selectbox(
+                        "Role",
+                        ["admin", "teacher", "moderator"],
+                        index=["admin", "teacher", "moderator"].index(a.role)
+                        if a.role in ["admin", "teacher", "moderator"] else 0,
+                        key=f"role_{a.id}"
+                    )
+
+                    if st.button("💾 Update Role", key=f"role_update_{a.id}"):
+                        a.role = new_role
+                        db.commit()
+                        st.success("Role updated")
+                        st.rerun()
+
+
+
+                # -------------------------
+                # 🗑️ DELETE
+                # -------------------------
+                with col3:
+                    if st.button("🗑️ Delete", key=f"del_{a.id}"):
+
+                        current_username = st.session_state.get("admin_username")
+                        current_role = st.session_state.get("admin_role")
+
+                        # 🚫 Prevent self deletion
+                        if a.username == current_username:
+                            st.toast("🚫 You cannot delete your own account.")
+                            st.stop()
+
+                        # 🚫 Prevent deleting super admin
+                        if a.role == "super_admin":
+                            st.toast("🚫 Super Admin cannot be deleted.")
+                            st.stop()
+
+                        # 🚫 Admin cannot delete other admins
+                        if current_role == "admin" and a.role == "admin":
+                            st.toast("🚫 You cannot delete another admin.")
+                            st.stop()
+
+                        # 🚫 Prevent deleting last admin in school
+                        admin_count = db.query(Admin).filter(
+                            Admin.school_id == school_id,
+                            Admin.role == "admin"
+                        ).count()
+
+
+                        if a.role == "admin" and admin_count <= 1:
+                            st.toast("🚫 Cannot delete the last admin in this school.", icon="🚫")
+                            st.stop()
+
+                        # ✅ Safe to delete
+                        db.delete(a)
+                        db.commit()
+
+                        st.success("✅ User deleted successfully")
+                        st.rerun()
+
+
+        # ----------------------------
+        # 🗑️ Delete Admin
+        # ----------------------------
+        st.subheader("🗑️ Delete Admin")
+
+        delete_id = st.number_input(
+            "Enter Admin ID to delete",
+            min_value=1,
+            step=1,
+            key="delete_admin_id"
+        )
+        if st.button("Delete Admin", key="delete_admin_btn"):
+
+            target = db.query(Admin).filter_by(id=delete_id).first()
+
+            if not target:
+                st.error("🚫 Admin not found.")
+                st.stop()
+
+            if target.school_id != school_id:
+                st.error("🚫 This admin does not belong to this school.")
+                st.stop()
+
+            current_username = st.session_state.get("admin_username")
+            current_role = st.session_state.get("admin_role")
+
+            # 🚫 Self delete
+            if target.username == current_username:
+                st.error("🚫 You cannot delete your own account.")
+                st.stop()
+
+            # 🚫 Super admin protection
+            if target.role == "super_admin":
+                st.error("🚫 Super Admin cannot be deleted.")
+                st.stop()
+
+            # 🚫 Admin restriction
+            if current_role == "admin" and target.role == "admin":
+                st.toast("🚫 Cannot delete the last admin in this school.", icon="🚫")
+                st.stop()
+            # 🚫 Last admin protection
+            admin_count = db.query(Admin).filter(
+                Admin.school_id == school_id,
+                Admin.role == "admin"
+            ).count()
+
+            if target.role == "admin" and admin_count <= 1:
+                st.error("🚫 Cannot delete the last admin in this school.")
+                st.stop()
+
+            # ✅ Delete
+            db.delete(target)
+            db.commit()
+
+            st.success(f"✅ Admin '{target.username}' deleted successfully.")
+            st.rerun()
+    # --------------------------------------------------
+    # ➕ Add / Update Admin
+    # --------------------------------------------------
+    st.subheader("➕ Add / Update Admin")
+
+    new_user = st.text_input("👤 Username", key="admin_new_user")
+    new_pass = st.text_input("🔑 Password", type="password", key="admin_new_pass")
+    confirm_pass = st.text_input("🔑 Confirm Password", type="password", key="admin_confirm_pass")
+
+    # 🎯 Role assignment based on who is logged in
+    if current_role == "super_admin":
+        available_roles = ["admin", "teacher", "moderator"]
+    else:  # admin
+        available_roles = ["teacher", "moderator"]
+
+    new_role = st.selectbox(
+        "🎭 Role",
+        available_roles,
+        key="admin_new_role"
+    )
+
+
+    if st.button("Add / Update Admin", key="add_update_admin_btn"):
+
+        if not new_user.strip() or not new_pass:
+            st.error("🚫 Username & password required.")
+            st.stop()
+
+        if new_pass != confirm_pass:
+            st.error("🚫 Passwords do not match.")
+            st.stop()
+
+        try:
+
+            # ==========================================
+            # 🔐 ROLE AUTHORIZATION (FINAL SAFETY LAYER)
+            # ==========================================
+            if current_role == "admin":
+                allowed_roles = ["teacher", "moderator"]
+
+            elif current_role == "super_admin":
+                allowed_roles = ["admin", "teacher", "moderator"]
+
+            else:
+                st.error("🚫 Not authorized to create users.")
+                st.stop()
+
+            # 🚫 Prevent invalid role assignment
+            if new_role not in allowed_roles:
+                st.error(f"🚫 You are not allowed to create '{new_role}'")
+                st.stop()
+
+            # 🚫 Hard block super_admin creation
+            if new_role == "super_admin":
+                st.error("🚫 Super Admin cannot be created from this panel.")
+                st.stop()
+
+            # ==========================================
+            # 👤 CREATE / UPDATE USER
+            # ==========================================
+            ok = set_admin(
+                new_user.strip(),
+                new_pass.strip(),
+                new_role,
+                school_id if new_role != "super_admin" else None
+            )
+
+            if not ok:
+                st.error("❌ Admin creation failed. Username may already exist.")
+                st.stop()
+
+            # ==========================================
+            # ✅ SUCCESS MESSAGE
+            # ==========================================
+            st.success(
+                f"✅ User '{new_user}' added/updated successfully."
+                + (f" Linked to {school_obj.name}." if new_role != "super_admin" else "")
+            )
+
+            st.rerun()
+
+        except Exception as e:
+            st.error(f"⚠️ Admin operation failed: {e}")
+
+
+
+# --------------------------------------------
+ # Manage Subjects
+# --------------------------------------------
@@ -0,0 +1,96 @@
+# ==============================
+# selections/admin_tabs/manage_schools.py
+# Admin tab: 🏫 Manage Schools
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.db_helpers import add_school, delete_school, get_all_schools
+
+
+def render(ctx):
+    if ctx["admin_role"] != "super_admin":
+        return
+
+    st.subheader("🏫 Manage Schools")
+
+    schools = [s for s in get_all_schools() if not s.is_system]
+
+    if schools:
+        df_schools = pd.DataFrame([
+            {"ID": s.id, "Name": s.name, "Code": s.code}
+            for s in schools
+        ])
+        st.dataframe(df_schools, use_container_width=True)
+    else:
+        st.info("No schools found yet.")
+
+    # ➕ Add School
+    st.markdown("### ➕ Add New School")
+
+    with st.form("add_school_form", clear_on_submit=True):
+        new_school_name = st.text_input("School Name")
+        new_school_code = st.text_input("School Code (optional)")
+        submitted = st.form_submit_button("Add School")
+
+    if submitted:
+        if not new_school_name.strip():
+            st.error("Please enter a valid school name.")
+        else:
+            try:
+                school = add_school(
+                    new_school_name.strip(),
+                    code=(new_school_code or "").strip()
+                )
+                st.success(f"✅ Added School: {school.name} — ID {school.id}")
+                st.rerun()
+            except Exception as e:
+                st.error(f"🚫 Failed to add school: {e}")
+
+    # 🗑️ Delete School
+    st.markdown("---")
+    st.markdown("### 🗑️ Delete School")
+
+    if not schools:
+        st.info("No schools available to delete.")
+        st.stop()
+
+    search_q = st.text_input("Search School", key="search_school").strip().lower()
+
+    filtered = [
+        s for s in schools
+        if not search_q
+           or (s.name and search_q in s.name.lower())
+           or (s.code and search_q in s.code.lower())
+           or (search_q.isdigit() and int(search_q) == s.id)
+    ]
+
+    if filtered:
+        selected_school = st.selectbox(
+            "Select School to Delete",
+            filtered,
+            format_func=lambda s: f"{s.name} (Code: {s.code}) — ID {s.id}"
+        )
+
+        if st.button("Delete Selected School"):
+            try:
+                # 🚨 SAFETY: prevent deleting currently active school
+                active_school_id = st.session_state.get("school_id")
+
+                if selected_school.id == active_school_id:
+                    st.error("🚫 Cannot delete the currently active school.")
+                    st.stop()
+
+                ok = delete_school(selected_school.id)
+
+                if ok:
+                    st.success(f"✅ '{selected_school.name}' deleted.")
+                    st.rerun()
+                else:
+                    st.error("🚫 Failed to delete school.")
+
+            except Exception as e:
+                st.error(f"🚫 Error deleting school: {e}")
+
+        else:
+            st.warning("No schools match your search.")
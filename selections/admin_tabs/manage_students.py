@@ -0,0 +1,226 @@
+# ==============================
+# selections/admin_tabs/manage_students.py
+# Admin tab: 👥 Manage Students
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.db_helpers import (
+    count_students,
+    delete_student_db,
+    search_students,
+    update_student_db,
+)
+from backend.models import Class, School
+
+
+def render(ctx):
+    db = ctx["db"]
+
+    st.subheader("👥 Manage Students")
+
+    # --------------------------------------------------
+    # 🏫 SCHOOL (Single Source of Truth)
+    # --------------------------------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected.")
+        st.stop()
+
+    school_obj = db.query(School).filter_by(id=school_id).first()
+
+    if not school_obj:
+        st.error("🚫 Selected school not found.")
+        st.stop()
+
+    st.info(f"🏫 Current School: {school_obj.name}")
+
+    # --------------------------------------------------
+    # 🔎 Search & Filter
+    # --------------------------------------------------
+    st.markdown("### 🔎 Search & Filter Students")
+
+    classes = db.query(Class).filter_by(school_id=school_id).all()
+    class_map = {c.id: c.name for c in classes}
+
+    search_col, class_col = st.columns([2, 1])
+
+    with search_col:
+        search_q = st.text_input(
+            "Search by name or access code (leave empty to list all)",
+            key="manage_students_search"
+        ).strip()
+
+    with class_col:
+        filter_class_id = st.selectbox(
+            "Class",
+            ["All"] + list(class_map.keys()),
+            format_func=lambda cid: "All Classes" if cid == "All" else class_map[cid],
+            key="manage_students_class"
+        )
+
+    filter_class_id = None if filter_class_id == "All" else filter_class_id
+
+    # Keyset pagination state (reset when the filters change)
+    search_signature = (school_id, search_q.lower(), filter_class_id)
+
+    if st.session_state.get("student_search_filters") != search_signature:
+        st.session_state.student_search_filters = search_signature
+        st.session_state.student_search_cursors = [None]
+
+    cursors = st.session_state.student_search_cursors
+
+    try:
+        total_students = count_students(school_id)
+        page = search_students(
+            school_id,
+            query=search_q,
+            class_id=filter_class_id,
+            after=cursors[-1],
+        )
+    except Exception as e:
+        st.error(f"🚫 Failed to load students: {e}")
+        st.stop()
+
+    if total_students == 0:
+        st.info("🚫 No students found for this school.")
+        st.stop()
+
+    df_filtered = pd.DataFrame(
+        page["rows"],
+        columns=["id", "name", "access_code", "class_id", "can_retake", "submitted"]
+    )
+
+    st.write(
+        f"Showing {len(df_filtered)} students "
+        f"(page {len(cursors)}) — {total_students} in school"
+    )
+    st.dataframe(df_filtered, use_container_width=True)
+
+    nav_prev, nav_next = st.columns(2)
+
+    with nav_prev:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1, key="students_prev"):
+            cursors.pop()
+            st.rerun()
+
+    with nav_next:
+        if st.button("Next ➡️", disabled=page["next_after"] is None, key="students_next"):
+            cursors.append(page["next_after"])
+            st.rerun()
+
+    # --------------------------------------------------
+    # ✏️ Edit Student
+    # --------------------------------------------------
+    st.markdown("### ✏️ Edit Selected Student")
+
+    if not df_filtered.empty:
+
+        selected_idx = st.selectbox(
+            "Pick a student to edit",
+            df_filtered.index.tolist(),
+            format_func=lambda i: (
+                f"{df_filtered.loc[i, 'name']} — "
+                f"{df_filtered.loc[i, 'access_code']} "
+                f"(Class ID: {df_filtered.loc[i, 'class_id']})"
+            ),
+            key="manage_student_select_idx"
+        )
+
+        student_row = df_filtered.loc[selected_idx]
+        selected_id = int(student_row["id"])
+
+        st.write(f"Editing **{student_row['name']}** (Access: `{student_row['access_code']}`)")
+
+        # Name
+        new_name = st.text_input(
+            "Update Name",
+            value=str(student_row.get("name", "")).strip(),
+            key="upd_name"
+        )
+
+        # --------------------------------------------------
+        # 📚 Class (Synced to School)
+        # --------------------------------------------------
+        if not classes:
+            st.warning("⚠️ No classes found for this school.")
+            st.stop()
+
+        current_class_id = int(student_row.get("class_id") or 0)
+
+        new_class_id = st.selectbox(
+            "Update Class",
+            options=list(class_map.keys()),
+            index=list(class_map.keys()).index(current_class_id)
+            if current_class_id in class_map else 0,
+            format_func=lambda cid: f"ID {cid} — {class_map[cid]}",
+            key="upd_class"
+        )
+
+        # --------------------------------------------------
+        # Actions
+        # --------------------------------------------------
+        col1, col2 = st.columns(2)
+
+        # Save
+        with col1:
+            if st.button("💾 Save Changes", key="save_student_changes"):
+                try:
+                    update_student_db(
+                        selected_id,
+                        new_name.strip(),
+                        new_class_id,
+                        school_id
+                    )
+                    st.success("✅ Student updated successfully!")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"🚫 Failed to update student: {e}")
+
+        # Delete
+        with col2:
+            if "delete_confirm_for" not in st.session_state:
+                st.session_state.delete_confirm_for = None
+
+            if st.session_state.delete_confirm_for != selected_id:
+                if st.button("🗑️ Delete Student", key=f"delete_student_btn_{selected_id}"):
+                    st.session_state.delete_confirm_for = selected_id
+                    st.rerun()
+            else:
+                st.warning("⚠️ This action cannot be undone.")
+
+                confirm_col1, confirm_col2 = st.columns(2)
+
+                with confirm_col1:
+                    if st.button("✅ Confirm Delete", key=f"confirm_delete_yes_{selected_id}"):
+                        try:
+                            success = delete_student_db(selected_id, school_id)
+                            if success:
+                                st.success("✅ Student deleted.")
+                            else:
+                                st.error("🚫 Student could not be deleted.")
+                            st.session_state.delete_confirm_for = None
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"🚫 Could not delete student: {e}")
+                            st.session_state.delete_confirm_for = None
+
+                with confirm_col2:
+                    if st.button("🚫 Cancel", key=f"confirm_delete_no_{selected_id}"):
+                        st.session_state.delete_confirm_for = None
+                        st.rerun()
+
+    # --------------------------------------------------
+    # Export
+    # --------------------------------------------------
+    st.markdown("---")
+
+    if not df_filtered.empty:
+        csv = df_filtered.to_csv(index=False).encode("utf-8")
+        st.download_button(
+            "⬇️ Download Shown Students (CSV)",
+            csv,
+            f"students_school_{school_id}.csv",
+            "text/csv"
+        )
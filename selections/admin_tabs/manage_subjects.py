@@ -0,0 +1,143 @@
+# ==============================
+# selections/admin_tabs/manage_subjects.py
+# Admin tab: 📚 Manage Subjects
+# ==============================
+import streamlit as st
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import get_session
+from backend.db_helpers import delete_subject, get_current_school_id, require_permission
+from backend.models import Class, Subject
+
+
+def render(ctx):
+    require_permission("manage_subjects")
+    st.subheader("📚 Manage Subjects")
+
+    # Choose class
+    db = get_session()
+
+    school_id = st.session_state.get("school_id")
+
+    try:
+        class_rows = (
+            db.query(Class.id, Class.name)
+            .filter(Class.school_id == school_id)
+            .order_by(Class.name.asc())
+            .all()
+        )
+    finally:
+        db.close()
+
+
+    if not class_rows:
+        st.warning("No classes found for this school.")
+        st.stop()
+
+    # Map name → id
+    class_map = {name: cid for cid, name in class_rows}
+
+    # -------- SELECTBOX --------
+    selected_class_name = st.selectbox(
+        "Select Class",
+        list(class_map.keys()),
+        key="subject_class_select"
+    )
+
+
+
+    # Resolve ID safely
+
+    if "selected_class_id" not in st.session_state:
+        st.session_state.selected_class_id = class_map[selected_class_name]
+
+    class_id = st.session_state.selected_class_id
+
+    # 🔍 DEBUG
+
+
+    # -------- LOAD SUBJECTS --------
+    db = get_session()
+
+    school_id = st.session_state.get("school_id")
+    subjects = (
+        db.query(Subject.id, Subject.name)
+        .filter(
+            Subject.school_id == school_id,
+            Subject.class_id == class_id
+        )
+        .order_by(Subject.name.asc())
+        .all()
+    )
+
+    db.close()
+
+
+    if subjects:
+        for i, (subject_id, subject_name) in enumerate(subjects):
+            c1, c2 = st.columns([8, 1])
+            c1.write(f"{i + 1}. {subject_name}")
+
+            if c2.button("🗑️", key=f"del_subject_{subject_id}"):
+                deleted = delete_subject(
+                    subject_id=subject_id,
+                    class_id=class_id,  # ✅ correct
+                    school_id=school_id,
+                )
+
+                if deleted:
+                    st.success("✅ Subject deleted.")
+                    st.rerun()
+                else:
+                    st.warning("⚠️ Subject could not be deleted.")
+
+    st.markdown("---")
+    new_subject = st.text_input("➕ Add New Subject", key="new_subject_input")
+    if st.button("Add Subject", key="add_subject_btn"):
+        name = (new_subject or "").strip()
+        if not name:
+            st.warning("Enter a valid subject name.")
+        elif any(name.lower() == s[1].lower() for s in subjects):
+            st.info("Subject already exists.")
+        else:
+            db = get_session()
+            school_id = get_current_school_id()
+
+            try:
+                # ✅ use the resolved ID from earlier — DO NOT use selected_class.id
+                # (class_id must already exist from the lookup step)
+
+                new_subject = Subject(
+                    name=name,
+                    class_id=class_id,  # <-- ID only
+                    school_id=school_id  # <-- ID only
+                )
+
+                db.add(new_subject)
+                db.commit()
+
+                st.success(f"✅ Subject '{name}' added successfully.")
+                st.rerun()
+
+
+
+            except IntegrityError:
+                db.rollback()
+                st.warning(f"⚠️ Subject '{name}' already exists for this class.")
+
+            except Exception as e:
+                db.rollback()
+                st.error(f"🚫 Failed to add subject: {e}")
+
+            finally:
+                db.close()
+
+    # 🔔 Persistent message (stays until next action)
+    if "subject_msg" in st.session_state:
+        msg_type, msg_text = st.session_state["subject_msg"]
+        if msg_type == "error":
+            st.error(msg_text)
+        elif msg_type == "success":
+            st.success(msg_text)
+
+    st.caption("📚 Manage all subjects per class. Changes are saved to the central database.")
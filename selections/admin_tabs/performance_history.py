@@ -0,0 +1,50 @@
+# ==============================
+# selections/admin_tabs/performance_history.py
+# Admin tab: 📊 Performance History
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import load_subjects
+from backend.ui import load_classes
+from selections.performance_history import render_cohort_performance
+
+
+def render(ctx):
+    st.subheader("📊 Performance History")
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    classes = load_classes(school_id)
+
+    if not classes:
+        st.warning("⚠️ No classes found.")
+        st.stop()
+
+    class_lookup = {c.id: c.name for c in classes}
+
+    class_id = st.selectbox(
+        "Select Class",
+        list(class_lookup),
+        format_func=lambda cid: class_lookup[cid],
+        key="perf_class"
+    )
+
+    subjects = load_subjects(class_id=class_id, school_id=school_id) or []
+    subject_lookup = {s.id: s.name for s in subjects}
+
+    subject_id = st.selectbox(
+        "Select Subject",
+        ["All"] + list(subject_lookup),
+        format_func=lambda sid: "All Subjects" if sid == "All" else subject_lookup[sid],
+        key="perf_subject"
+    )
+
+    render_cohort_performance(
+        school_id,
+        class_id=class_id,
+        subject_id=None if subject_id == "All" else subject_id
+    )
@@ -0,0 +1,131 @@
+# ==============================
+# selections/admin_tabs/reset_tests.py
+# Admin tab: ♻️ Reset Tests
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import (
+    bulk_reset_tests,
+    get_users,
+    load_subjects,
+    require_permission,
+)
+from backend.ui import load_classes
+
+
+def render(ctx):
+    require_permission("reset_tests")
+
+    st.subheader("♻️ Reset Student Test Status")
+
+    # -------------------------
+    # 🏫 GLOBAL SCHOOL (STRICT)
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("⚠️ No school selected or assigned.")
+        st.stop()
+
+    # -------------------------
+    # 📚 SCOPE: CLASS / SUBJECT / TEST TYPE
+    # -------------------------
+    classes = load_classes(school_id)
+    class_lookup = {c.id: c.name for c in classes}
+
+    reset_class_id = st.selectbox(
+        "Class",
+        ["All"] + list(class_lookup.keys()),
+        format_func=lambda cid: "🌍 All Classes" if cid == "All" else class_lookup[cid],
+        key="reset_class"
+    )
+    reset_class_id = None if reset_class_id == "All" else reset_class_id
+
+    subjects = load_subjects(school_id=school_id, class_id=reset_class_id)
+    subject_lookup = {s.id: s.name for s in subjects}
+
+    reset_subject_id = st.selectbox(
+        "Subject",
+        ["All"] + list(subject_lookup.keys()),
+        format_func=lambda sid: "📚 All Subjects" if sid == "All" else subject_lookup[sid],
+        key="reset_subject"
+    )
+    reset_subject_id = None if reset_subject_id == "All" else reset_subject_id
+
+    reset_test_type = st.radio(
+        "Test Type",
+        ["Both", "Objective", "Subjective"],
+        horizontal=True,
+        key="reset_test_type"
+    )
+    reset_test_type = None if reset_test_type == "Both" else reset_test_type.lower()
+
+    # -------------------------
+    # 👥 LOAD STUDENTS
+    # -------------------------
+    users = get_users(school_id=school_id)
+
+    student_rows = [
+        u for u in users.values()
+        if reset_class_id is None or u.get("class_id") == reset_class_id
+    ]
+
+    if not student_rows:
+        st.info("No students found for this selection.")
+        st.stop()
+
+    student_lookup = {u["id"]: u for u in student_rows}
+
+    selected_student_id = st.selectbox(
+        "Select Student to Reset",
+        ["All"] + list(student_lookup.keys()),
+        format_func=lambda sid: (
+            "🌍 All Students" if sid == "All"
+            else f"{student_lookup[sid]['name']} (Class ID {student_lookup[sid].get('class_id', 'N/A')})"
+        ),
+        key="reset_select"
+    )
+
+    reset_student_ids = None if selected_student_id == "All" else [selected_student_id]
+
+    # -------------------------
+    # ⚠️ CONFIRMATION
+    # -------------------------
+    st.markdown("### ⚠️ Action")
+
+    confirm_reset = st.checkbox(
+        "I understand this will reset test attempts",
+        key="confirm_reset"
+    )
+
+    if reset_student_ids is None and reset_class_id is None:
+        st.warning("🔄 You are about to reset ALL students in this school!")
+
+    # -------------------------
+    # 🚀 EXECUTION (ONE TRANSACTION)
+    # -------------------------
+    if confirm_reset and st.button("♻️ Reset Test Attempt", key="reset_attempt_btn"):
+
+        try:
+            counts = bulk_reset_tests(
+                school_id=school_id,
+                class_id=reset_class_id,
+                subject_id=reset_subject_id,
+                student_ids=reset_student_ids,
+                test_type=reset_test_type
+            )
+        except Exception as e:
+            st.error(f"🚫 Reset failed: {e}")
+            st.stop()
+
+        get_users.clear()
+
+        if reset_student_ids:
+            st.success(f"🔄 Reset completed for {student_lookup[selected_student_id]['name']}")
+        else:
+            st.success(
+                f"🔄 Reset completed: {counts['progress']} attempts, "
+                f"{counts['retakes']} retake records, {counts['students']} student records"
+            )
+
+        st.rerun()
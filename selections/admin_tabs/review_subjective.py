@@ -0,0 +1,366 @@
+# ==============================
+# selections/admin_tabs/review_subjective.py
+# Admin tab: ✍️ Review Subj Questions
+# ==============================
+import pandas as pd
+import streamlit as st
+
+from backend.grading import (
+    CLAIM_BATCH,
+    claim_submissions,
+    get_grading_queue,
+    get_grading_stats,
+    get_grading_subjects,
+    load_submission,
+    release_submissions,
+    save_grade_sheet,
+)
+from backend.scoring_assist import precompute_suggestions
+
+
+def render(ctx):
+    st.subheader("📋 Subjective Grading Dashboard")
+
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.error("🚫 No school selected")
+        st.stop()
+
+    grader = st.session_state.get("admin_username") or "admin"
+
+    # ---------------------------------
+    # 📊 QUEUE DEPTH + GRADER RATE
+    # ---------------------------------
+    with st.expander("📊 Grading Progress (last 24h)"):
+        stats = get_grading_stats(school_id)
+
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Unclaimed", stats["unclaimed"])
+        m2.metric("Being Graded", stats["leased"])
+        m3.metric("Reviewed", stats["reviewed"])
+
+        if stats["graders"]:
+            st.dataframe(
+                pd.DataFrame(stats["graders"]).rename(columns={
+                    "grader": "Grader",
+                    "leased": "Holding",
+                    "reviewed": "Reviewed",
+                    "per_hour": "Per Hour",
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+
+    status_options = {
+        "My Queue": "pending",
+        "Pending Review": "pending",
+        "Reviewed": "reviewed",
+        "All": "all",
+    }
+
+    status_filter = st.selectbox(
+        "Show submissions",
+        list(status_options.keys())
+    )
+
+    # ---------------------------------
+    # 🔍 SEARCH + FILTER UI (server-side)
+    # ---------------------------------
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        student_search = st.text_input(
+            "🔍 Search Student"
+        ).strip()
+
+    with col2:
+        grading_subjects = get_grading_subjects(school_id)
+        subject_lookup = {s["id"]: s["name"] for s in grading_subjects}
+
+        subject_filter = st.selectbox(
+            "Subject",
+            ["All"] + list(subject_lookup.keys()),
+            format_func=lambda sid: "All" if sid == "All" else subject_lookup[sid]
+        )
+
+    if st.button("💡 Compute Score Suggestions", key="grading_suggest"):
+        with st.spinner("Scoring pending submissions..."):
+            suggested = precompute_suggestions(school_id)
+        st.success(f"💡 Suggestions ready for {suggested} submission(s).")
+
+    # ---------------------------------
+    # 📥 LEASES (one grader per submission)
+    # ---------------------------------
+    my_queue = status_filter == "My Queue"
+
+    if my_queue:
+        claim_col, release_col = st.columns(2)
+
+        with claim_col:
+            if st.button(f"📥 Claim Next {CLAIM_BATCH}", key="grading_claim"):
+                claim_submissions(
+                    school_id=school_id,
+                    grader=grader,
+                    subject_id=None if subject_filter == "All" else subject_filter,
+                )
+                st.rerun()
+
+        with release_col:
+            if st.button("↩️ Release My Submissions", key="grading_release"):
+                release_submissions(grader)
+                st.rerun()
+
+    # ---------------------------------
+    # 📄 KEYSET PAGINATION STATE
+    # ---------------------------------
+    filter_signature = (school_id, status_filter, student_search, subject_filter)
+
+    if st.session_state.get("grading_filters") != filter_signature:
+        st.session_state.grading_filters = filter_signature
+        st.session_state.grading_cursors = [None]
+
+    cursors = st.session_state.grading_cursors
+
+    page = get_grading_queue(
+        school_id=school_id,
+        status=status_options[status_filter],
+        subject_id=None if subject_filter == "All" else subject_filter,
+        student_search=student_search or None,
+        after_id=cursors[-1],
+        leased_to=grader if my_queue else None,
+    )
+
+    submissions = page["rows"]
+
+    if not submissions:
+        st.info(
+            "Claim submissions to start grading"
+            if my_queue
+            else "No submissions found"
+        )
+        st.stop()
+
+    # =================================================
+    # RENDER PAGE ROWS
+    # =================================================
+    for sub in submissions:
+
+        is_reviewed = sub["review_status"] == "reviewed"
+
+        leased_elsewhere = (
+            sub["lease_owner"] is not None
+            and sub["lease_owner"] != grader
+        )
+
+        icon = (
+            "✅ Reviewed"
+            if is_reviewed
+            else f"🔒 {sub['lease_owner']}"
+            if leased_elsewhere
+            else "🟡 Pending"
+        )
+
+        opened = st.toggle(
+            f"{icon} | 👤 {sub['student_name']} | 📘 {sub['subject_name']}",
+            key=f"open_{sub['id']}"
+        )
+
+        if not opened:
+            continue
+
+        # Answer bodies are loaded only for opened submissions
+        body = load_submission(sub["id"], school_id)
+
+        if body is None:
+            st.warning("Submission no longer exists")
+            continue
+
+        answers = body["items"]
+        attachments = body["attachments"]
+
+        with st.container(border=True):
+
+            st.markdown(
+                "### 📄 Student Answers"
+            )
+
+            scores = {}
+
+            if not answers:
+
+                st.write(
+                    "_No answers submitted_"
+                )
+
+            else:
+
+                for idx, item in enumerate(
+                        answers,
+                        start=1
+                ):
+
+                    question = item["question"]
+                    answer = item["answer"]
+                    suggestion = item.get("suggestion")
+
+                    col1, col2, col3 = st.columns(
+                        [3, 5, 2]
+                    )
+
+                    with col1:
+
+                        st.markdown(
+                            f"**Q{idx}:** {question}"
+                        )
+
+                    with col2:
+
+                        st.markdown(
+                            answer
+                            or "_No answer_"
+                        )
+
+                        if suggestion:
+                            st.caption(
+                                f"💡 Suggested: {suggestion['score']:g}/{suggestion['marks']} "
+                                f"({int(suggestion['ratio'] * 100)}%)"
+                            )
+
+                    with col3:
+
+                        slider_key = f"score_{sub['id']}_{idx}"
+
+                        existing_score = 0
+
+                        if (
+                                is_reviewed
+                                and sub["score"]
+                        ):
+                            existing_score = (
+                                int(
+                                    sub["score"] /
+                                    len(answers)
+                                )
+                            )
+
+                        elif suggestion:
+                            existing_score = int(round(suggestion["ratio"] * 100))
+
+                        score = st.slider(
+                            f"Score Q{idx}",
+                            0,
+                            100,
+                            value=existing_score,
+                            key=slider_key,
+                            disabled=is_reviewed
+                        )
+
+                        scores[idx] = {
+                            "question_id": item["question_id"],
+                            "score": score,
+                        }
+
+                    st.markdown("---")
+
+            # -------------------------
+            # ATTACHMENTS
+            # -------------------------
+
+            if attachments:
+
+                st.markdown(
+                    "### 📎 Attachments"
+                )
+
+                for file in attachments:
+
+                    if isinstance(
+                            file,
+                            dict
+                    ):
+
+                        st.write(
+                            file.get(
+                                "name",
+                                str(file)
+                            )
+                        )
+
+                    else:
+
+                        st.write(
+                            str(file)
+                        )
+
+            # -------------------------
+            # REVIEWED VIEW
+            # -------------------------
+
+            if is_reviewed:
+                st.success(
+                    f"""
+    Final Score:
+    {sub['score']}
+
+    Reviewed:
+    {sub['reviewed_at']}
+    """
+                )
+
+            # -------------------------
+            # SUBMIT
+            # -------------------------
+
+            submit_clicked = st.button(
+                f"✅ Submit Review for {sub['student_name']}",
+                key=f"submit_{sub['id']}",
+                disabled=is_reviewed or leased_elsewhere or not answers
+            )
+
+            if submit_clicked:
+
+                saved = save_grade_sheet(
+                    progress_id=sub["id"],
+                    grades=list(scores.values()),
+                    max_score=len(answers) * 100,
+                    reviewed_by=grader,
+                    lease_token=(
+                        sub["lease_token"]
+                        if sub["lease_owner"] == grader
+                        else None
+                    ),
+                )
+
+                if not saved:
+
+                    # 🔒 NO UPDATE
+                    st.warning(
+                        "Already finalized or being graded by someone else"
+                    )
+
+                else:
+
+                    st.success(
+                        "Review submitted"
+                    )
+
+                    st.rerun()
+
+    # ---------------------------------
+    # ⏮️ ⏭️ PAGE NAVIGATION
+    # ---------------------------------
+    nav_prev, nav_info, nav_next = st.columns([1, 2, 1])
+
+    with nav_prev:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1, key="grading_prev"):
+            cursors.pop()
+            st.rerun()
+
+    with nav_info:
+        st.caption(f"Page {len(cursors)}")
+
+    with nav_next:
+        if st.button("Next ➡️", disabled=page["next_after_id"] is None, key="grading_next"):
+            cursors.append(page["next_after_id"])
+            st.rerun()
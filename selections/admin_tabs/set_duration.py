@@ -0,0 +1,183 @@
+# ==============================
+# selections/admin_tabs/set_duration.py
+# Admin tab: ⏱ Set Duration
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import (
+    get_test_draw_count,
+    get_test_duration,
+    load_subjects,
+    set_test_draw_count,
+    set_test_duration,
+)
+from backend.ui import load_classes
+
+
+def render(ctx):
+    st.subheader("⏱ Set Test Duration Per Class & Subject")
+
+    # ------------------------------
+    # 🏫 GLOBAL SCHOOL (STRICT)
+    # ------------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.error("🚫 No school selected.")
+        st.stop()
+
+    # ------------------------------
+    # 📚 LOAD CLASSES (SAFE)
+    # ------------------------------
+    classes = load_classes(school_id)
+
+    if not classes:
+        st.warning("⚠️ No classes found for this school.")
+        st.stop()
+
+    class_ids = [c.id for c in classes]
+    class_lookup = {c.id: c.name for c in classes}
+
+    if (
+            "dur_class" not in st.session_state
+            or st.session_state["dur_class"] not in class_ids
+    ):
+        st.session_state["dur_class"] = class_ids[0]
+
+    selected_class_id = st.selectbox(
+        "Select Class",
+        class_ids,
+        format_func=lambda cid: class_lookup[cid],
+        key="dur_class"
+    )
+
+    class_id = selected_class_id
+
+    # ------------------------------
+    # 📘 LOAD SUBJECTS (SAFE)
+    # ------------------------------
+    subjects = load_subjects(
+        class_id=class_id,
+        school_id=school_id
+    )
+
+    if not subjects:
+        st.warning("⚠️ No subjects found for this class.")
+        st.stop()
+
+    subject_ids = [s.id for s in subjects]
+    subject_lookup = {s.id: s.name for s in subjects}
+
+    if (
+            "dur_subject" not in st.session_state
+            or st.session_state["dur_subject"] not in subject_ids
+    ):
+        st.session_state["dur_subject"] = subject_ids[0]
+
+    selected_subject_id = st.selectbox(
+        "Select Subject",
+        subject_ids,
+        format_func=lambda sid: subject_lookup[sid],
+        key="dur_subject"
+    )
+
+    subject_id = selected_subject_id
+
+    # ------------------------------
+    # ⏱ LOAD CURRENT DURATION
+    # ------------------------------
+    current_duration_secs = get_test_duration(
+        school_id=school_id,
+        class_id=class_id,
+        subject_id=subject_id
+    ) or 0
+
+    current_duration_mins = current_duration_secs // 60 if current_duration_secs else 0
+
+    if current_duration_mins > 0:
+        st.info(f"🕒 Current Duration: **{current_duration_mins} minutes**")
+    else:
+        st.info("No duration set yet — please enter one below.")
+
+    # ------------------------------
+    # ✏️ INPUT NEW DURATION
+    # ------------------------------
+    new_duration_mins = st.number_input(
+        "Enter New Duration (minutes):",
+        min_value=5,
+        max_value=180,
+        step=5,
+        value=current_duration_mins or 30,
+        key="new_duration_input"
+    )
+
+    # ------------------------------
+    # 💾 SAVE
+    # ------------------------------
+    if st.button("💾 Save Duration", key="save_duration_btn"):
+        try:
+            set_test_duration(
+                school_id=school_id,
+                class_id=class_id,
+                subject_id=subject_id,
+                duration_minutes=new_duration_mins
+            )
+
+            # readable format
+            hours = new_duration_mins // 60
+            minutes = new_duration_mins % 60
+
+            if hours and minutes:
+                readable = f"{hours} hour{'s' if hours > 1 else ''} {minutes} minute{'s' if minutes > 1 else ''}"
+            elif hours:
+                readable = f"{hours} hour{'s' if hours > 1 else ''}"
+            else:
+                readable = f"{minutes} minute{'s' if minutes > 1 else ''}"
+
+            st.success(
+                f"✅ Duration updated to **{readable}** for "
+                f"{class_lookup[class_id]} — {subject_lookup[subject_id]}"
+            )
+
+        except Exception as e:
+            st.error(f"🚫 Failed to save duration: {e}")
+
+    # ------------------------------
+    # 🎲 QUESTIONS PER TEST
+    # ------------------------------
+    current_draw = get_test_draw_count(
+        class_id=class_id,
+        subject_id=subject_id,
+        school_id=school_id
+    ) or 0
+
+    if current_draw:
+        st.info(f"🎲 Each test draws **{current_draw}** random questions from the bank")
+    else:
+        st.info("Each test uses the whole question bank.")
+
+    new_draw_count = st.number_input(
+        "Questions per test (0 = whole bank):",
+        min_value=0,
+        max_value=500,
+        step=5,
+        value=current_draw,
+        key="draw_count_input"
+    )
+
+    if st.button("💾 Save Question Count", key="save_draw_count_btn"):
+        try:
+            set_test_draw_count(
+                school_id=school_id,
+                class_id=class_id,
+                subject_id=subject_id,
+                draw_count=new_draw_count
+            )
+
+            st.success(
+                f"✅ {class_lookup[class_id]} — {subject_lookup[subject_id]}: "
+                + (f"{new_draw_count} questions per test" if new_draw_count else "whole bank per test")
+            )
+
+        except Exception as e:
+            st.error(f"🚫 Failed to save question count: {e}")
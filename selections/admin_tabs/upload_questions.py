@@ -0,0 +1,186 @@
+# ==============================
+# selections/admin_tabs/upload_questions.py
+# Admin tab: 📤 Upload Questions
+# ==============================
+import streamlit as st
+
+from backend.db_helpers import handle_uploaded_questions, load_subjects
+from backend.helpers import get_objective_questions
+from backend.models import School
+from backend.ui import load_classes
+
+
+def render(ctx):
+    db = ctx["db"]
+
+    st.subheader("📤 Upload Questions to Database")
+
+    # -------------------------
+    # 🏫 GLOBAL SCHOOL (SINGLE SOURCE)
+    # -------------------------
+    school_id = st.session_state.get("school_id")
+
+    if not school_id:
+        st.warning("🚫 No school selected.")
+        st.stop()
+
+    school = db.query(School).filter_by(id=school_id).first()
+
+    if not school:
+        st.error("🚫 Selected school not found.")
+        st.stop()
+
+    st.info(f"🏫 Current School: {school.name} (ID: {school_id})")
+
+    # -------------------------
+    # 📚 LOAD CLASSES (SAFE SYNC)
+    # -------------------------
+    classes = load_classes(school_id)
+
+    if not classes:
+        st.warning("🚫 No classes found for this school.")
+        st.stop()
+
+    class_ids = [c.id for c in classes]
+    class_lookup = {c.id: c for c in classes}
+
+    # ✅ Ensure valid class selection
+    if (
+            "upload_class" not in st.session_state
+            or st.session_state["upload_class"] not in class_ids
+    ):
+        st.session_state["upload_class"] = class_ids[0]
+
+    selected_class_id = st.selectbox(
+        "Select Class",
+        class_ids,
+        format_func=lambda cid: class_lookup[cid].name,
+        key="upload_class"
+    )
+
+    class_id = selected_class_id
+
+    # -------------------------
+    # 📘 LOAD SUBJECTS (SAFE SYNC)
+    # -------------------------
+    subjects = load_subjects(class_id=class_id, school_id=school_id)
+
+    if not subjects:
+        st.warning("⚠️ No subjects available for this class.")
+        st.info("👉 Please add subjects in Manage Subjects first.")
+        st.stop()
+
+    subject_ids = [s.id for s in subjects]
+    subject_lookup = {s.id: s for s in subjects}
+
+    # ✅ Ensure valid subject selection
+    if (
+            "upload_subject" not in st.session_state
+            or st.session_state["upload_subject"] not in subject_ids
+    ):
+        st.session_state["upload_subject"] = subject_ids[0]
+
+    selected_subject_id = st.selectbox(
+        "Select Subject",
+        subject_ids,
+        format_func=lambda sid: subject_lookup[sid].name,
+        key="upload_subject"
+    )
+
+    sub = subject_lookup[selected_subject_id]
+
+    # -------------------------
+    # 📂 FILE UPLOAD
+    # -------------------------
+    uploaded_file = st.file_uploader(
+        "Upload JSON file (Objective Questions)",
+        type=["json"],
+        key="objective_file"
+    )
+
+    # -------------------------
+    # 🚀 UPLOAD BUTTON
+    # -------------------------
+    if st.button("✅ Upload Questions", key="confirm_upload_btn"):
+
+        if not uploaded_file:
+            st.warning("Please upload a JSON file.")
+            st.stop()
+
+        try:
+            import json
+            data = json.load(uploaded_file)
+
+            if not isinstance(data, list):
+                st.error("Invalid format — file must contain a list of questions.")
+                st.stop()
+
+            cleaned = []
+
+            for idx, q in enumerate(data, start=1):
+
+                if not all(k in q for k in ["question", "options", "answer"]):
+                    st.error(f"⚠️ Question {idx} missing required fields.")
+                    st.stop()
+
+                cleaned.append({
+                    "question": q["question"].strip(),
+                    "options": [opt.strip() for opt in q["options"]],
+                    "answer": q["answer"].strip()
+                })
+
+            # ----------------------
+            # 🔍 CHECK DUPLICATES
+            # ----------------------
+            existing_questions_text = {
+                q.question_text.lower()
+                for q in get_objective_questions(
+                    class_id=class_id,
+                    subject_id=sub.id,
+                    school_id=school_id
+                )
+            }
+
+            duplicates = [
+                q["question"]
+                for q in cleaned
+                if q["question"].lower() in existing_questions_text
+            ]
+
+            if duplicates:
+                st.warning(
+                    f"⚠️ {len(duplicates)} duplicate question(s) detected. "
+                    "They will be skipped."
+                )
+
+            cleaned = [
+                q for q in cleaned
+                if q["question"].lower() not in existing_questions_text
+            ]
+
+            if not cleaned:
+                st.info("No new questions to upload.")
+                st.stop()
+
+            # ----------------------
+             # 💾 SAVE TO DATABASE
+            # ----------------------
+            result = handle_uploaded_questions(
+                class_id=class_id,
+                subject_id=sub.id,
+                valid_questions=cleaned,
+                school_id=school_id
+            )
+
+            if result.get("success"):
+                st.success(
+                    f"🎯 Uploaded {result['inserted']} new questions "
+                    f"for {class_lookup[class_id].name} - {sub.name}."
+                )
+                st.cache_data.clear()
+                st.rerun()
+            else:
+                st.warning(f"🚫 Upload failed: {result.get('error', 'Unknown error')}")
+
+        except Exception as e:
+            st.error(f"🚫 Upload error: {e}")
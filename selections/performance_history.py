@@ -0,0 +1,125 @@
+# ==============================
+# selections/performance_history.py
+# Performance history views (student + admin cohort)
+# ==============================
+"""
+Both views read only the rolling PerformanceAggregate rows maintained
+by backend.performance, never the full TestResult history.
+"""
+import streamlit as st
+
+from backend.database import get_session
+from backend.models import Student, Subject
+from backend.performance import (
+    average_percentage,
+    get_cohort_performance,
+    get_student_performance,
+    trend_slope,
+)
+
+
+# slope (points per attempt) below this is shown as steady
+TREND_DEADBAND = 1.0
+
+
+def trend_label(slope) -> str:
+    if slope is None:
+        return "—"
+    if slope > TREND_DEADBAND:
+        return f"📈 +{slope:.1f}"
+    if slope < -TREND_DEADBAND:
+        return f"📉 {slope:.1f}"
+    return f"➖ {slope:+.1f}"
+
+
+def _subject_names(subject_ids) -> dict:
+    if not subject_ids:
+        return {}
+
+    db = get_session()
+    try:
+        return dict(
+            db.query(Subject.id, Subject.name)
+            .filter(Subject.id.in_(set(subject_ids)))
+            .all()
+        )
+    finally:
+        db.close()
+
+
+# ==============================
+# 🎓 Student view
+# ==============================
+def render_student_performance(student_id: int, school_id: int):
+    """Per-subject summary for the logged-in student."""
+    rows = get_student_performance(student_id, school_id)
+
+    if not rows:
+        st.caption("No results yet.")
+        return
+
+    names = _subject_names([r.subject_id for r in rows])
+
+    for r in sorted(rows, key=lambda r: names.get(r.subject_id, "")):
+        with st.expander(f"{names.get(r.subject_id, 'Unknown')} — {r.latest_percentage:.0f}%"):
+            st.write(f"Tests taken: {r.attempts}")
+            st.write(f"Best: {r.best_percentage:.1f}%")
+            st.write(f"Latest: {r.latest_percentage:.1f}%")
+            st.write(f"Average: {average_percentage(r):.1f}%")
+            st.write(f"Moving average: {r.moving_average:.1f}%")
+            st.write(f"Trend: {trend_label(trend_slope(r))} per test")
+
+
+# ==============================
+# 🏫 Admin cohort view
+# ==============================
+def render_cohort_performance(school_id: int, class_id: int | None = None, subject_id: int | None = None):
+    """Cohort table + summary for a class / subject."""
+    import pandas as pd
+
+    rows = get_cohort_performance(school_id, class_id=class_id, subject_id=subject_id)
+
+    if not rows:
+        st.info("No performance data for this selection yet.")
+        return
+
+    names = _subject_names([r.subject_id for r in rows])
+
+    db = get_session()
+    try:
+        students = dict(
+            db.query(Student.id, Student.name)
+            .filter(Student.id.in_({r.student_id for r in rows}))
+            .all()
+        )
+    finally:
+        db.close()
+
+    df = pd.DataFrame([
+        {
+            "Student": students.get(r.student_id, "Unknown"),
+            "Subject": names.get(r.subject_id, "Unknown"),
+            "Tests": r.attempts,
+            "Best %": round(r.best_percentage, 1),
+            "Latest %": round(r.latest_percentage, 1),
+            "Average %": round(average_percentage(r), 1),
+            "Moving avg %": round(r.moving_average, 1),
+            "Slope": trend_slope(r),
+        }
+        for r in rows
+    ])
+
+    slopes = df["Slope"].dropna()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Students", df["Student"].nunique())
+    col2.metric("Cohort moving avg", f"{df['Moving avg %'].mean():.1f}%")
+    col3.metric("Improving", int((slopes > TREND_DEADBAND).sum()))
+    col4.metric("Declining", int((slopes < -TREND_DEADBAND).sum()))
+
+    df["Trend"] = df["Slope"].map(lambda s: trend_label(None if pd.isna(s) else s))
+
+    st.dataframe(
+        df.drop(columns=["Slope"]).sort_values(["Subject", "Moving avg %"], ascending=[True, False]),
+        use_container_width=True
+    )
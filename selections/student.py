@@ -1,5 +1,3 @@
-import qrcode, io
-import pandas as pd
 from datetime import datetime, timedelta
 import streamlit as st
 
@@ -8,11 +6,11 @@ from backend.models import Student
 from backend.database import get_session
 from backend.ui import render_test, generate_pdf, get_test_type, get_subject_id_by_name
 from backend.helpers import (
-    get_subjective_questions,
-    get_objective_questions,
     save_answer,
     handle_violation,
-    handle_subjective_submission
+    handle_subjective_submission,
+    current_answer_payload,
+    finalize_current_attempt
 )
 from backend.db_helpers import (
     show_question_tracker,
@@ -20,16 +18,37 @@ from backend.db_helpers import (
     get_users,
     load_subjects,
     get_test_duration,
+    get_test_draw_count,
     load_student_results,
     get_student_by_access_code,
     load_progress,
     save_progress,
+    record_attempt_questions,
     clear_progress,
     decrement_retake,
     load_classes_for_school,add_submission_db
 )
-from backend.models import (SubjectiveQuestion,AntiCheatLog,TestResult,School,
-StudentProgress,Class,StudentAnswer)
+from backend.answer_sheet import (
+    encode_answer_sheet,
+    parse_options,
+    progress_answer_details
+)
+from backend.attempts import reset_attempt
+from backend.question_sampler import draw_questions
+from selections.performance_history import render_student_performance
+from backend.shuffle import (
+    new_shuffle_seed,
+    shuffle_questions,
+    shuffle_answers,
+    unshuffle_attempt
+)
+from backend.exam_papers import (
+    get_or_create_exam_paper,
+    get_exam_paper,
+    hydrate_answer_details
+)
+from backend.models import (SubjectiveQuestion,AntiCheatLog,School,
+StudentProgress,Class)
 
 
 @st.cache_data(ttl=300)
@@ -215,6 +234,20 @@ def run_student_mode():
 
         school_map = {s.name: s.id for s in schools}
 
+        # -------------------------
+        # Prefill from an access-slip QR link (?school=<code>&code=<access code>)
+        # -------------------------
+        qr_school_code = st.query_params.get("school")
+        qr_access_code = st.query_params.get("code")
+
+        qr_school_name = next(
+            (s.name for s in schools if qr_school_code and s.code == qr_school_code),
+            None
+        )
+
+        if qr_access_code and "access_code_input" not in st.session_state:
+            st.session_state.access_code_input = qr_access_code.strip().upper()
+
 
         # -------------------------
         # School selector (NO default)
@@ -222,7 +255,10 @@ def run_student_mode():
         selected_school_name = st.selectbox(
             "Select School",
             options=list(school_map.keys()),
-            index=None,  # ✅ nothing selected initially
+            index=(
+                list(school_map.keys()).index(qr_school_name)
+                if qr_school_name else None
+            ),  # ✅ nothing selected unless opened from a slip
             placeholder="-- Select School --",
             key="school_select"
         )
@@ -401,6 +437,13 @@ def run_student_mode():
                 objective_records = [r for r in records if r.test_type == "objective"]
                 subjective_records = [r for r in records if r.test_type == "subjective"]
         # =====================================================
+        # 📈 MY PROGRESS (rolling aggregates)
+        # =====================================================
+        if school_id and student_id:
+            st.markdown("### 📈 My Progress")
+            render_student_performance(student_id, school_id)
+
+        # =====================================================
         # 📘 OBJECTIVE TESTS
         # =====================================================
         st.markdown("### 📘 Objective Tests")
@@ -413,7 +456,7 @@ def run_student_mode():
 
                 subject_name = r.subject.name if r.subject else "Unknown"
 
-                raw = parse_json_field(r.answers)
+                raw = progress_answer_details(r)
 
                 # -------------------------
                 # 🔁 NORMALIZE ONCE
@@ -436,7 +479,7 @@ def run_student_mode():
 
                     # NEW format (dict)
                     elif isinstance(raw[0], dict):
-                        details = raw
+                        details = hydrate_answer_details(raw, get_exam_paper(r.paper_id))
                         for d in details:
                             if "correct_answer" in d and "correct" not in d:
                                 d["correct"] = d.pop("correct_answer")
@@ -667,31 +710,9 @@ def run_student_mode():
         st.stop()
 
     # -------------------------
-    # ❓ LOAD QUESTIONS (CACHED)
+    # ❓ QUESTIONS are drawn when a test starts (see draw_questions);
+    #    the bank is never held in the session.
     # -------------------------
-    key_obj = f"objective_{selected_subject_id}_{class_id_int}_{school_id_int}"
-    key_subj = f"subjective_{selected_subject_id}_{class_id_int}_{school_id_int}"
-
-    if key_obj not in st.session_state:
-        st.session_state[key_obj] = get_objective_questions(
-            class_id=class_id,
-            subject_id=selected_subject_id,
-            school_id=school_id_int
-        ) or []
-
-    if key_subj not in st.session_state:
-        st.session_state[key_subj] = get_subjective_questions(
-            class_id=class_id,
-            subject_id=selected_subject_id,
-            school_id=school_id_int
-        ) or []
-
-    objective_questions = st.session_state[key_obj]
-    subjective_questions = st.session_state[key_subj]
-    # -------------------------
-    # AUTO-FIX EMPTY OBJECTIVE
-    # -------------------------
-
 
     # -------------------------
     # 🧩 TEST TYPE SELECTION
@@ -778,6 +799,7 @@ def run_student_mode():
         # -------------------------
         is_locked = record.locked
         is_submitted = record.submitted
+        progress_id = record.id
 
     finally:
         db.close()
@@ -906,10 +928,17 @@ def run_student_mode():
         # -------------------------
         if action == "start":
 
-            question_bank = (
-                objective_questions
-                if st.session_state.test_type == "objective"
-                else subjective_questions
+            # only the drawn questions are fetched (whole bank if no count is set)
+            question_bank = draw_questions(
+                st.session_state.test_type,
+                class_id=class_id_int,
+                subject_id=selected_subject_id,
+                school_id=school_id_int,
+                n=get_test_draw_count(
+                    class_id=class_id_int,
+                    subject_id=selected_subject_id,
+                    school_id=school_id_int
+                )
             )
 
             # ✅ SAFE NORMALIZATION (FIXED)
@@ -931,6 +960,25 @@ def run_student_mode():
 
                 st.session_state.questions.append(question_dict)
 
+            # 📄 one immutable paper per distinct question set
+            st.session_state.paper_id = get_or_create_exam_paper(
+                st.session_state.questions,
+                school_id=school_id_int,
+                class_id=class_id_int,
+                subject_id=selected_subject_id,
+                test_type=st.session_state.test_type
+            )
+
+            # 🔀 per-attempt order (only the seed is stored)
+            paper_questions = st.session_state.questions
+            st.session_state.attempt_id = progress_id
+            st.session_state.shuffle_seed = new_shuffle_seed()
+            st.session_state.questions = shuffle_questions(
+                paper_questions,
+                st.session_state.shuffle_seed,
+                progress_id
+            )
+
             # reset answers
             st.session_state.answers = [""] * len(st.session_state.questions)
             st.session_state.current_q = 0
@@ -951,33 +999,51 @@ def run_student_mode():
 
 
 
-            # 🔥 SAVE INITIAL STATE
-            save_progress(
-                access_code=access_code,
-                subject_id=selected_subject_id,
-                class_id=class_id_int,
-                school_id=school_id_int,
-                test_type=st.session_state.test_type,
+            # 🔁 reopen the progress row (a retake follows a submitted attempt)
+            reset_attempt(progress_id)
 
-                # ✅ FIXED HERE
-                answers=json.dumps([
+            # 🔥 SAVE INITIAL STATE
+            if st.session_state.test_type == "objective":
+                initial_answers = []
+                initial_sheet = encode_answer_sheet([], paper_questions)
+            else:
+                initial_answers = json.dumps([
                     {
                         "question_id": q["id"],
                         "selected": "",
                         "correct": "",
                         "is_correct": False
                     }
-                    for q in st.session_state.questions
-                ]),
+                    for q in paper_questions
+                ])
+                initial_sheet = None
+
+            save_progress(
+                access_code=access_code,
+                subject_id=selected_subject_id,
+                class_id=class_id_int,
+                school_id=school_id_int,
+                test_type=st.session_state.test_type,
+                answers=initial_answers,
+                answer_sheet=initial_sheet,
+                shuffle_seed=st.session_state.shuffle_seed,
 
                 current_q=st.session_state.current_q,
                 start_time=st.session_state.start_time,
                 duration=st.session_state.duration,
-                questions=[q["id"] for q in st.session_state.questions],
+                paper_id=st.session_state.get("paper_id"),
                 student_id=student_id,
                 submitted=False
             )
 
+            # 📌 question-usage index (blocks deleting/archiving these mid-test)
+            record_attempt_questions(
+                progress_id,
+                [q["id"] for q in st.session_state.questions],
+                test_type=st.session_state.test_type,
+                school_id=school_id_int
+            )
+
             st.session_state.test_action = None
             st.rerun()
 
@@ -1025,49 +1091,70 @@ def run_student_mode():
             # -------------------------
             # ✅ SAFE RESTORE
             # -------------------------
+            paper = get_exam_paper(saved_progress.get("paper_id"))
+
+            st.session_state.attempt_id = saved_progress.get("progress_id")
+            st.session_state.shuffle_seed = None
+
+            if paper:
+                # exactly the questions served at start, even if the bank changed,
+                # in this attempt's order
+                st.session_state.paper_id = paper["id"]
+                st.session_state.shuffle_seed = saved_progress.get("shuffle_seed")
+                st.session_state.questions = shuffle_questions(
+                    paper["questions"],
+                    st.session_state.shuffle_seed,
+                    st.session_state.attempt_id
+                )
 
-            question_bank = (
-                objective_questions
-                if st.session_state.test_type == "objective"
-                else subjective_questions
-            )
+            else:
+                st.session_state.paper_id = None
 
-            saved_questions = saved_progress.get("questions", [])
+                # legacy attempt without a paper: rebuild from the bank
+                question_bank = draw_questions(
+                    st.session_state.test_type,
+                    class_id=class_id_int,
+                    subject_id=selected_subject_id,
+                    school_id=school_id_int
+                )
 
-            if isinstance(saved_questions, str):
-                import json
-                try:
-                    saved_questions = json.loads(saved_questions)
-                except:
-                    saved_questions = []
+                saved_questions = saved_progress.get("questions", [])
 
-            # ✅ normalize questions
-            normalized_questions = [
-                {
-                    "id": q.id,
-                    "text": q.question_text,
-                    "options": getattr(q, "options", None),
-                    "correct_answer": getattr(q, "correct_answer", "")
-                }
-                for q in question_bank
-            ]
+                if isinstance(saved_questions, str):
+                    import json
+                    try:
+                        saved_questions = json.loads(saved_questions)
+                    except:
+                        saved_questions = []
 
-            if saved_questions:
+                # ✅ normalize questions
+                normalized_questions = [
+                    {
+                        "id": q.id,
+                        "text": q.question_text,
+                        "options": getattr(q, "options", None),
+                        "correct_answer": getattr(q, "correct_answer", "")
+                    }
+                    for q in question_bank
+                ]
 
-                qmap = {q["id"]: q for q in normalized_questions}
+                if saved_questions:
 
-                rebuilt = [
-                    qmap[qid]
-                    for qid in saved_questions
-                    if qid in qmap
-                ]
+                    qmap = {q["id"]: q for q in normalized_questions}
 
-                st.session_state.questions = (
-                    rebuilt if rebuilt else normalized_questions
-                )
+                    rebuilt = [
+                        qmap[qid]
+                        for qid in saved_questions
+                        if qid in qmap
+                    ]
+
+                    st.session_state.questions = (
+                        rebuilt if rebuilt else normalized_questions
+                    )
+
+                else:
+                    st.session_state.questions = normalized_questions
 
-            else:
-                st.session_state.questions = normalized_questions
             saved_answers = saved_progress.get(
                 "answers",
                 [""] * len(st.session_state.questions)
@@ -1087,7 +1174,12 @@ def run_student_mode():
             if not isinstance(saved_answers, list):
                 saved_answers = [""] * len(st.session_state.questions)
 
-            st.session_state.answers = saved_answers
+            # saved in paper order → served order
+            st.session_state.answers = shuffle_answers(
+                saved_answers,
+                st.session_state.shuffle_seed,
+                st.session_state.attempt_id
+            )
 
             st.session_state.current_q = min(
                 max(saved_progress.get("current_q", 0), 0),
@@ -1130,43 +1222,9 @@ def run_student_mode():
                 st.warning("⏰ Time is up! Submitting your test automatically...")
 
                 # -------------------------
-                # Build structured answers (IMPORTANT FIX)
-                # -------------------------
-                details = []
-
-                for q, ans in zip(st.session_state.questions, st.session_state.answers):
-                    correct_answer = q.get("correct_answer", "")
-
-                    is_correct = (
-                            str(ans).strip().lower()
-                            == str(correct_answer).strip().lower()
-                    )
-
-                    details.append({
-                        "question_id": q.get("id"),
-                        "question_text": q.get("text", ""),
-                        "selected": ans or "—",
-                        "correct": correct_answer or "—",
-                        "is_correct": is_correct
-                    })
-
-                # -------------------------
-                # Save to DB (FIXED FORMAT)
+                # Grade + finalize what the student answered
                 # -------------------------
-                save_progress(
-                    access_code=access_code,
-                    subject_id=selected_subject_id,
-                    class_id=class_id_int,
-                    school_id=school_id_int,
-                    test_type=st.session_state.test_type,
-                    answers=json.dumps(details),
-                    current_q=st.session_state.current_q,
-                    start_time=st.session_state.start_time,
-                    duration=st.session_state.duration,
-                    questions=[q["id"] for q in st.session_state.questions],
-                    student_id=student_id,
-                    submitted=True
-                )
+                finalize_current_attempt(reason="time_expired")
 
                 st.success("✅ Test submitted automatically.")
 
@@ -1179,23 +1237,7 @@ def run_student_mode():
         if not is_submitted:
 
             # IMPORTANT: keep DB format consistent
-            details = []
-
-            for q, ans in zip(st.session_state.questions, st.session_state.answers):
-                correct_answer = q.get("correct_answer", "")
-
-                is_correct = (
-                        str(ans).strip().lower()
-                        == str(correct_answer).strip().lower()
-                )
-
-                details.append({
-                    "question_id": q.get("id"),
-                    "question_text": q.get("text", ""),
-                    "selected": ans or "—",
-                    "correct": correct_answer or "—",
-                    "is_correct": is_correct
-                })
+            answers_payload, answer_sheet = current_answer_payload()
 
             save_progress(
                 access_code=access_code,
@@ -1203,42 +1245,16 @@ def run_student_mode():
                 class_id=class_id_int,
                 school_id=school_id_int,
                 test_type=st.session_state.test_type,
-                answers=json.dumps(details),
+                answers=answers_payload,
+                answer_sheet=answer_sheet,
                 current_q=st.session_state.current_q,
                 start_time=st.session_state.start_time,
                 duration=st.session_state.duration,
-                questions=[q["id"] for q in st.session_state.questions],
+                paper_id=st.session_state.get("paper_id"),
                 student_id=student_id,
                 submitted=False
             )
 
-        # -------------------------
-        # Safe options parser + cleaner
-        # -------------------------
-        def parse_options(raw_options):
-            if isinstance(raw_options, list):
-                opts = raw_options
-            elif isinstance(raw_options, str):
-                cleaned = raw_options.strip()
-                try:
-                    parsed = json.loads(cleaned)
-                    opts = parsed if isinstance(parsed, list) else [str(parsed)]
-                except Exception:
-                    opts = [o.strip() for o in cleaned.replace(";", ",").split(",") if o.strip()]
-            else:
-                opts = []
-
-            def clean_option(opt):
-                text = str(opt).strip()
-                text = text.strip('"').strip("'")
-                for bad in ["(", ")", "[", "]", "{", "}"]:
-                    text = text.replace(bad, "")
-                text = text.replace("\n", " ").strip()
-                text = " ".join(text.split())
-                return text
-
-            return [clean_option(o) for o in opts]
-
         # -------------------------
         # Safe field getter
         # -------------------------
@@ -1256,10 +1272,16 @@ def run_student_mode():
                 school_id=school_id_int
             ) or 30
 
-            st.session_state.questions = (
-                objective_questions
-                if st.session_state.test_type == "objective"
-                else subjective_questions
+            st.session_state.questions = draw_questions(
+                st.session_state.test_type,
+                class_id=class_id_int,
+                subject_id=selected_subject_id,
+                school_id=school_id_int,
+                n=get_test_draw_count(
+                    class_id=class_id_int,
+                    subject_id=selected_subject_id,
+                    school_id=school_id_int
+                )
             )
 
             # IMPORTANT: initialize in STRUCTURED format (not strings)
@@ -1369,64 +1391,7 @@ def run_student_mode():
 
             st.warning("⏰ Time is up! Submitting your test automatically...")
 
-            start_time_ts = (
-                st.session_state.start_time.timestamp()
-                if isinstance(st.session_state.start_time, datetime)
-                else st.session_state.start_time
-            )
-
-            subject_id = selected_subject.id
-
-            # 1️⃣ Save final progress (submitted=True)
-            save_progress(
-                access_code=access_code,
-                student_id=student_id,
-                subject_id=subject_id,
-                class_id=class_id_int,
-                school_id=school_id_int,
-                test_type=st.session_state.test_type,
-                answers=st.session_state.answers,
-                current_q=st.session_state.current_q,
-                start_time=start_time_ts,
-                duration=st.session_state.duration,
-                questions=[q.id for q in st.session_state.questions],
-                submitted=True
-            )
-
-            # 2️⃣ Persist answers safely
-            db = get_session()
-            try:
-                progress = db.query(StudentProgress).filter_by(
-                    student_id=student_id,
-                    subject_id=subject_id,
-                    class_id=class_id_int,
-                    school_id=school_id_int,
-                    test_type=st.session_state.test_type
-                ).first()
-
-                if progress:
-                    for i, q in enumerate(st.session_state.questions):
-
-                        ans = st.session_state.answers[i] if i < len(st.session_state.answers) else ""
-
-                        existing = db.query(StudentAnswer).filter_by(
-                            progress_id=progress.id,
-                            question_id=q["id"]
-                        ).first()
-
-                        if existing:
-                            existing.answer = ans
-                        else:
-                            db.add(StudentAnswer(
-                                progress_id=progress.id,
-                                question_id=q["id"],
-                                answer=ans
-                            ))
-
-                    db.commit()
-
-            finally:
-                db.close()
+            finalize_current_attempt(reason="time_expired")
 
             st.success("✅ Test submitted automatically.")
             st.session_state.test_started = False
@@ -1672,15 +1637,6 @@ def run_student_mode():
                     f"You answered {answered_count}/{len(questions)} questions."
                 )
 
-                # -------------------------
-                # Safe start time conversion
-                # -------------------------
-                start_time_ts = (
-                    st.session_state.start_time.timestamp()
-                    if isinstance(st.session_state.start_time, datetime)
-                    else st.session_state.start_time
-                )
-
                 subject_id = selected_subject.id
                 test_type = st.session_state.test_type
 
@@ -1694,12 +1650,19 @@ def run_student_mode():
                         # -------------------------
                         # Save subjective submission
                         # -------------------------
+                        paper_questions, paper_answers = unshuffle_attempt(
+                            st.session_state.questions,
+                            st.session_state.answers,
+                            st.session_state.get("shuffle_seed"),
+                            st.session_state.get("attempt_id")
+                        )
+
                         result = handle_subjective_submission(
                             student_id=student_id,
                             school_id=school_id_int,
                             subject_id=subject_id,
-                            answers=st.session_state.answers,
-                            questions=st.session_state.questions
+                            answers=paper_answers,
+                            questions=paper_questions
                         )
 
                         if result == "already_submitted":
@@ -1785,203 +1748,42 @@ def run_student_mode():
                 # =====================================================
                 elif test_type == "objective":
 
-                    import json
-
-                    db = get_session()
-
                     try:
 
                         # -------------------------
-                        # Grade answers
+                        # Grade + finalize (canonical paper order)
                         # -------------------------
-                        correct_count = 0
-                        details = []
-
-                        for q, ans in zip(
-                                st.session_state.questions,
-                                st.session_state.answers
-                        ):
-
-                            # FIX: extract answer if dict
-                            if isinstance(ans, dict):
-                                selected_answer = (
-                                        ans.get("selected")
-                                        or ans.get("answer")
-                                        or ""
-                                )
-                            else:
-                                selected_answer = str(ans)
+                        result = finalize_current_attempt()
 
-                            correct_answer = q.get(
-                                "correct_answer",
-                                ""
-                            )
+                        if result is None:
+                            st.warning("⚠️ This test has already been submitted.")
 
-                            is_correct = (
-                                    selected_answer.strip().lower()
-                                    ==
-                                    str(correct_answer).strip().lower()
-                            )
-
-                            if is_correct:
-                                correct_count += 1
-
-                            details.append({
-                                "question_id": q.get("id"),
-                                "question_text": q.get(
-                                    "text",
-                                    "No question text"
-                                ),
-                                "selected": selected_answer or "—",
-                                "correct": correct_answer or "—",
-                                "is_correct": is_correct
-                            })
-
-                        total_questions = len(details)
-
-                        percent = (
-                            (correct_count / total_questions) * 100
-                            if total_questions
-                            else 0
-                        )
-
-                        # -------------------------
-                        # Progress
-                        # -------------------------
-                        progress = db.query(
-                            StudentProgress
-                        ).filter_by(
-                            student_id=student_id,
-                            subject_id=subject_id,
-                            class_id=class_id,
-                            school_id=school_id_int,
-                            test_type="objective"
-                        ).order_by(
-                            StudentProgress.created_at.desc()
-                        ).first()
-
-                        if progress:
-                            progress.answers = json.dumps(
-                                details
-                            )
-
-                            progress.current_q = (
-                                st.session_state.current_q
-                            )
-
-                            progress.start_time = (
-                                start_time_ts
-                            )
-
-                            progress.duration = (
-                                st.session_state.duration
-                            )
-
-                            progress.questions = json.dumps(
-                                [
-                                    q["id"]
-                                    for q in st.session_state.questions
-                                ]
-                            )
-
-                            progress.score = correct_count
-                            progress.submitted = True
-                            progress.locked = True
-                            progress.review_status = "reviewed"
-                            progress.reviewed_at = datetime.utcnow()
-
-                        # -------------------------
-                        # Save Student Answers
-                        # -------------------------
-                        if progress:
-
-                            for q, ans in zip(
-                                    st.session_state.questions,
-                                    st.session_state.answers
-                            ):
-
-                                # FIX HERE
-                                if isinstance(ans, dict):
-
-                                    clean_answer = (
-                                            ans.get("selected")
-                                            or ans.get("answer")
-                                            or ""
-                                    )
-
-                                else:
-
-                                    clean_answer = str(ans)
-
-                                existing = db.query(
-                                    StudentAnswer
-                                ).filter_by(
-                                    progress_id=progress.id,
-                                    question_id=q["id"]
-                                ).first()
-
-                                if existing:
+                        else:
+                            # Save PDF state
+                            st.session_state.pdf_ready = True
 
-                                    existing.answer = clean_answer
+                            st.session_state.pdf_data = {
 
-                                else:
+                                "correct": result["score"],
+                                "total": result["total"],
+                                "percent": result["percent"],
+                                "details": result["details"]
 
-                                    db.add(
-                                        StudentAnswer(
-                                            progress_id=progress.id,
-                                            question_id=q["id"],
-                                            answer=clean_answer
-                                        )
-                                    )
+                            }
 
-                        # -------------------------
-                        # Save Result
-                        # -------------------------
-                        db.add(
-                            TestResult(
-                                student_id=student_id,
-                                class_id=class_id,
-                                subject_id=subject_id,
-                                score=correct_count,
-                                total=total_questions,
-                                percentage=percent,
-                                school_id=school_id_int
+                            st.success(
+                                "✅ Objective test submitted successfully."
                             )
-                        )
-
-                        db.commit()
-
-                        # Save PDF state
-                        st.session_state.pdf_ready = True
-
-                        st.session_state.pdf_data = {
-
-                            "correct": correct_count,
-                            "total": total_questions,
-                            "percent": percent,
-                            "details": details
-
-                        }
 
                         st.session_state.submitted = True
                         st.session_state.test_started = False
 
-                        st.success(
-                            "✅ Objective test submitted successfully."
-                        )
-
                     except Exception as e:
 
-                        db.rollback()
-
                         st.error(
                             f"❌ Objective submission failed: {e}"
                         )
 
-                    finally:
-
-                        db.close()
-
                 # =====================================================
                 # PERSISTENT PDF
                 # =====================================================
@@ -1,3 +1,4 @@
 #!/bin/bash
 pip install -r requirements.txt
+python -m backend.build_assets
 streamlit run app.py --server.port $PORT --server.headless true